@@ -99,5 +99,44 @@ def dev(
     )
 
 
+@app.command()
+def backfill_chat_search(
+    batch_size: int = 500,
+):
+    """Index existing chat titles and current branches for full-text chat search."""
+    import open_webui.config  # runs the database migrations
+    from open_webui.models.chat_search import ChatSearch
+
+    counts = ChatSearch.backfill(
+        batch_size=batch_size,
+        progress=lambda kind, count: typer.echo(f"Indexed {count} {kind}"),
+    )
+    typer.echo(f"Done: indexed {counts['chats']} chats")
+
+
+@app.command()
+def backfill_chat_messages(
+    batch_size: Optional[int] = None,
+):
+    """Rebuild the chat_message table from the history stored in each chat."""
+    import open_webui.config  # runs the database migrations
+    from open_webui.env import DATABASE_CHAT_IMPORT_BATCH_SIZE
+    from open_webui.models.chats import Chats
+
+    progress = None
+    for progress in Chats.backfill_chat_messages(
+        batch_size=batch_size or DATABASE_CHAT_IMPORT_BATCH_SIZE
+    ):
+        typer.echo(
+            f"{progress['chats']}/{progress['total']} chats, "
+            f"{progress['messages']} messages"
+        )
+    typer.echo(
+        f"Done: {progress['messages']} messages from {progress['chats']} chats"
+        if progress
+        else "No chats to backfill"
+    )
+
+
 if __name__ == "__main__":
     app()
@@ -4,6 +4,8 @@ import os
 import shutil
 import socket
 import base64
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 import redis
 
@@ -25,6 +27,7 @@ from open_webui.env import (
     ENV,
     REDIS_URL,
     REDIS_KEY_PREFIX,
+    REDIS_CONFIG_SYNC_INTERVAL,
     REDIS_SENTINEL_HOSTS,
     REDIS_SENTINEL_PORT,
     FRONTEND_BUILD_DIR,
@@ -226,6 +229,16 @@ class PersistentConfig(Generic[T]):
 
 
 class AppConfig:
+    """
+    Application config backed by PersistentConfig entries.
+
+    With Redis, values are served from the in-process snapshot and only
+    re-read from Redis once they have been invalidated: every write bumps a
+    config version counter and publishes the changed key on a pub/sub channel,
+    which a listener thread turns into per-key invalidations. While the
+    listener is not connected, every read goes to Redis as before.
+    """
+
     _redis: Union[redis.Redis, redis.cluster.RedisCluster] = None
     _redis_key_prefix: str
 
@@ -238,6 +251,11 @@ class AppConfig:
         redis_cluster: Optional[bool] = False,
         redis_key_prefix: str = "open-webui",
     ):
+        super().__setattr__("_state", {})
+        super().__setattr__("_stale_keys", set())
+        super().__setattr__("_version", None)
+        super().__setattr__("_listening", False)
+
         if redis_url:
             super().__setattr__("_redis_key_prefix", redis_key_prefix)
             super().__setattr__(
@@ -250,11 +268,66 @@ class AppConfig:
                 ),
             )
 
-        super().__setattr__("_state", {})
+            if ENABLE_PERSISTENT_CONFIG:
+                threading.Thread(
+                    target=self._listen_for_updates,
+                    name="config-redis-listener",
+                    daemon=True,
+                ).start()
+
+    def _get_channel(self) -> str:
+        return f"{self._redis_key_prefix}:config:updates"
+
+    def _get_version_key(self) -> str:
+        return f"{self._redis_key_prefix}:config:version"
+
+    def _get_redis_version(self) -> Optional[str]:
+        return self._redis.get(self._get_version_key())
+
+    def _invalidate_all(self, version: Optional[str] = None):
+        super().__setattr__("_version", version)
+        self._stale_keys.update(self._state.keys())
+
+    def _listen_for_updates(self):
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._get_channel())
+
+                # Anything may have changed before we were subscribed
+                self._invalidate_all(self._get_redis_version())
+                super().__setattr__("_listening", True)
+
+                last_check = time.monotonic()
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        data = json.loads(message["data"])
+                        self._stale_keys.add(data.get("key"))
+                        super().__setattr__("_version", data.get("version"))
+
+                    if time.monotonic() - last_check >= REDIS_CONFIG_SYNC_INTERVAL:
+                        last_check = time.monotonic()
+                        version = self._get_redis_version()
+                        if version != self._version:
+                            self._invalidate_all(version)
+            except Exception as e:
+                log.warning(f"Config update listener disconnected from Redis: {e}")
+            finally:
+                super().__setattr__("_listening", False)
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+            time.sleep(max(REDIS_CONFIG_SYNC_INTERVAL / 10, 1))
 
     def __setattr__(self, key, value):
         if isinstance(value, PersistentConfig):
             self._state[key] = value
+            self._stale_keys.add(key)
         else:
             self._state[key].value = value
             self._state[key].save()
@@ -263,12 +336,26 @@ class AppConfig:
                 redis_key = f"{self._redis_key_prefix}:config:{key}"
                 self._redis.set(redis_key, json.dumps(self._state[key].value))
 
+                version = self._redis.incr(self._get_version_key())
+                self._redis.publish(
+                    self._get_channel(),
+                    json.dumps({"key": key, "version": str(version)}),
+                )
+
     def __getattr__(self, key):
         if key not in self._state:
             raise AttributeError(f"Config key '{key}' not found")
 
-        # If Redis is available and persistent config is enabled, check for an updated value
-        if self._redis and ENABLE_PERSISTENT_CONFIG:
+        # If Redis is available and persistent config is enabled, check for an updated
+        # value, unless the local value is known to be current
+        if (
+            self._redis
+            and ENABLE_PERSISTENT_CONFIG
+            and (not self._listening or key in self._stale_keys)
+        ):
+            # Discard first so an invalidation arriving during the read is kept
+            self._stale_keys.discard(key)
+
             redis_key = f"{self._redis_key_prefix}:config:{key}"
             redis_value = self._redis.get(redis_key)
 
@@ -1952,6 +2039,36 @@ ENABLE_TITLE_GENERATION = PersistentConfig(
     os.environ.get("ENABLE_TITLE_GENERATION", "True").lower() == "true",
 )
 
+ENABLE_COMBINED_TASK_GENERATION = PersistentConfig(
+    "ENABLE_COMBINED_TASK_GENERATION",
+    "task.combined.enable",
+    os.environ.get("ENABLE_COMBINED_TASK_GENERATION", "False").lower() == "true",
+)
+
+COMBINED_TASK_GENERATION_PROMPT_TEMPLATE = PersistentConfig(
+    "COMBINED_TASK_GENERATION_PROMPT_TEMPLATE",
+    "task.combined.prompt_template",
+    os.environ.get("COMBINED_TASK_GENERATION_PROMPT_TEMPLATE", ""),
+)
+
+DEFAULT_COMBINED_TASK_GENERATION_PROMPT_TEMPLATE = """### Task:
+Analyze the chat history and generate, in a single JSON object:
+- "title": a concise, 3-5 word title with an emoji summarizing the chat history.
+- "tags": 1-3 broad tags categorizing the main themes of the chat history, along with 1-3 more specific subtopic tags.
+- "follow_ups": 3-5 relevant follow-up questions or prompts that the user might naturally ask next, written from the user's point of view.
+### Guidelines:
+- The title should clearly represent the main theme or subject of the conversation; avoid quotation marks or special formatting.
+- Start tags with high-level domains (e.g. Science, Technology, Philosophy, Arts, Politics, Business, Health, Sports, Entertainment, Education); if the content is too short or too diverse, use only ["General"].
+- Make follow-up questions concise, clear, directly related to the discussed topic(s), and do not repeat what was already covered.
+- Use the chat's primary language; default to English if multilingual.
+- Your entire response must consist solely of a single, raw JSON object, without any markdown code fences, introductory or concluding text.
+### Output:
+JSON format: { "title": "your concise title here", "tags": ["tag1", "tag2", "tag3"], "follow_ups": ["Question 1?", "Question 2?", "Question 3?"] }
+### Chat History:
+<chat_history>
+{{MESSAGES:END:6}}
+</chat_history>"""
+
 
 ENABLE_SEARCH_QUERY_GENERATION = PersistentConfig(
     "ENABLE_SEARCH_QUERY_GENERATION",
@@ -410,6 +410,27 @@ if DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL is not None:
     except Exception:
         DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL = 0.0
 
+# last_active_at updates are buffered in memory and written in one batched
+# UPDATE on this interval (seconds)
+DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = os.environ.get(
+    "DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL", "10"
+)
+try:
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = float(
+        DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL
+    )
+except ValueError:
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = 10.0
+
+# Chats per transaction for bulk chat imports and the chat_message backfill
+DATABASE_CHAT_IMPORT_BATCH_SIZE = os.environ.get(
+    "DATABASE_CHAT_IMPORT_BATCH_SIZE", "100"
+)
+try:
+    DATABASE_CHAT_IMPORT_BATCH_SIZE = max(int(DATABASE_CHAT_IMPORT_BATCH_SIZE), 1)
+except ValueError:
+    DATABASE_CHAT_IMPORT_BATCH_SIZE = 100
+
 # When enabled, get_db_context reuses existing sessions; set to False to always create new sessions
 DATABASE_ENABLE_SESSION_SHARING = (
     os.environ.get("DATABASE_ENABLE_SESSION_SHARING", "False").lower() == "true"
@@ -428,6 +449,26 @@ ENABLE_REALTIME_CHAT_SAVE = (
     os.environ.get("ENABLE_REALTIME_CHAT_SAVE", "False").lower() == "true"
 )
 
+# Realtime chat saves are coalesced and written at most once per interval
+# (seconds), or once the buffered content has grown by this many characters
+REALTIME_CHAT_SAVE_FLUSH_INTERVAL = os.environ.get(
+    "REALTIME_CHAT_SAVE_FLUSH_INTERVAL", "1"
+)
+
+try:
+    REALTIME_CHAT_SAVE_FLUSH_INTERVAL = float(REALTIME_CHAT_SAVE_FLUSH_INTERVAL)
+except Exception:
+    REALTIME_CHAT_SAVE_FLUSH_INTERVAL = 1.0
+
+REALTIME_CHAT_SAVE_FLUSH_BYTES = os.environ.get(
+    "REALTIME_CHAT_SAVE_FLUSH_BYTES", "8192"
+)
+
+try:
+    REALTIME_CHAT_SAVE_FLUSH_BYTES = int(REALTIME_CHAT_SAVE_FLUSH_BYTES)
+except Exception:
+    REALTIME_CHAT_SAVE_FLUSH_BYTES = 8192
+
 ENABLE_QUERIES_CACHE = os.environ.get("ENABLE_QUERIES_CACHE", "False").lower() == "true"
 
 RAG_SYSTEM_CONTEXT = os.environ.get("RAG_SYSTEM_CONTEXT", "False").lower() == "true"
@@ -441,6 +482,15 @@ REDIS_CLUSTER = os.environ.get("REDIS_CLUSTER", "False").lower() == "true"
 
 REDIS_KEY_PREFIX = os.environ.get("REDIS_KEY_PREFIX", "open-webui")
 
+# Persistent config values are cached in-process and invalidated over Redis
+# pub/sub; the config version counter is also re-checked on this interval
+# (seconds) in case an invalidation message was missed
+REDIS_CONFIG_SYNC_INTERVAL = os.environ.get("REDIS_CONFIG_SYNC_INTERVAL", "30")
+try:
+    REDIS_CONFIG_SYNC_INTERVAL = float(REDIS_CONFIG_SYNC_INTERVAL)
+except ValueError:
+    REDIS_CONFIG_SYNC_INTERVAL = 30.0
+
 REDIS_SENTINEL_HOSTS = os.environ.get("REDIS_SENTINEL_HOSTS", "")
 REDIS_SENTINEL_PORT = os.environ.get("REDIS_SENTINEL_PORT", "26379")
 
@@ -547,6 +597,33 @@ WEBUI_AUTH_SIGNOUT_REDIRECT_URL = os.environ.get(
     "WEBUI_AUTH_SIGNOUT_REDIRECT_URL", None
 )
 
+# Authenticated users (by ID and API key hash) are cached for this many seconds
+# to avoid a database lookup on every request; 0 disables the cache
+AUTH_USER_CACHE_TTL = os.environ.get("AUTH_USER_CACHE_TTL", "10")
+try:
+    AUTH_USER_CACHE_TTL = float(AUTH_USER_CACHE_TTL)
+except ValueError:
+    AUTH_USER_CACHE_TTL = 10.0
+
+AUTH_USER_CACHE_MAX_SIZE = os.environ.get("AUTH_USER_CACHE_MAX_SIZE", "10000")
+try:
+    AUTH_USER_CACHE_MAX_SIZE = int(AUTH_USER_CACHE_MAX_SIZE)
+except ValueError:
+    AUTH_USER_CACHE_MAX_SIZE = 10000
+
+# Share the authenticated user cache between replicas through Redis
+ENABLE_AUTH_USER_CACHE_REDIS = (
+    os.environ.get("ENABLE_AUTH_USER_CACHE_REDIS", "False").lower() == "true"
+)
+
+# Effective (group-merged) permissions are cached per user for this many
+# seconds; group changes on other replicas apply after it expires. 0 disables
+AUTH_PERMISSION_CACHE_TTL = os.environ.get("AUTH_PERMISSION_CACHE_TTL", "10")
+try:
+    AUTH_PERMISSION_CACHE_TTL = float(AUTH_PERMISSION_CACHE_TTL)
+except ValueError:
+    AUTH_PERMISSION_CACHE_TTL = 10.0
+
 ####################################
 # WEBUI_SECRET_KEY
 ####################################
@@ -694,6 +771,22 @@ else:
     except Exception:
         CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE = 1
 
+# Stream only the changed tail of the message content/output in chat:completion
+# events (sequence numbered), instead of the whole accumulated message each time
+ENABLE_CHAT_RESPONSE_STREAM_DELTA = (
+    os.environ.get("ENABLE_CHAT_RESPONSE_STREAM_DELTA", "False").lower() == "true"
+)
+
+# Number of delta events between full snapshots, used by clients to resync
+CHAT_RESPONSE_STREAM_SNAPSHOT_INTERVAL = os.environ.get(
+    "CHAT_RESPONSE_STREAM_SNAPSHOT_INTERVAL", "100"
+)
+
+try:
+    CHAT_RESPONSE_STREAM_SNAPSHOT_INTERVAL = int(CHAT_RESPONSE_STREAM_SNAPSHOT_INTERVAL)
+except Exception:
+    CHAT_RESPONSE_STREAM_SNAPSHOT_INTERVAL = 100
+
 
 CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES = os.environ.get(
     "CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES", "30"
@@ -788,6 +881,29 @@ try:
 except ValueError:
     WEBSOCKET_SERVER_PING_INTERVAL = 25
 
+# Persist the collaborative (Yjs) state of a note along with its content at
+# most every this many seconds while it is edited (0 for every save)
+YDOC_SNAPSHOT_INTERVAL = os.environ.get("YDOC_SNAPSHOT_INTERVAL", "10")
+try:
+    YDOC_SNAPSHOT_INTERVAL = float(YDOC_SNAPSHOT_INTERVAL)
+except ValueError:
+    YDOC_SNAPSHOT_INTERVAL = 10.0
+
+# Write a collaboratively edited note once it has been idle for this many
+# seconds, keeping only the latest content of the updates in between
+YDOC_SAVE_DEBOUNCE_INTERVAL = os.environ.get("YDOC_SAVE_DEBOUNCE_INTERVAL", "1")
+try:
+    YDOC_SAVE_DEBOUNCE_INTERVAL = float(YDOC_SAVE_DEBOUNCE_INTERVAL)
+except ValueError:
+    YDOC_SAVE_DEBOUNCE_INTERVAL = 1.0
+
+# ...but at least every this many seconds while it keeps being edited
+YDOC_SAVE_MAX_WAIT = os.environ.get("YDOC_SAVE_MAX_WAIT", "10")
+try:
+    YDOC_SAVE_MAX_WAIT = float(YDOC_SAVE_MAX_WAIT)
+except ValueError:
+    YDOC_SAVE_MAX_WAIT = 10.0
+
 
 REQUESTS_VERIFY = os.environ.get("REQUESTS_VERIFY", "True").lower() == "true"
 
@@ -839,6 +955,85 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+# Tool server OpenAPI specs are revalidated in the background once they are
+# older than this many seconds; the last good spec is served meanwhile
+TOOL_SERVER_SPEC_CACHE_TTL = os.environ.get("TOOL_SERVER_SPEC_CACHE_TTL", "300")
+try:
+    TOOL_SERVER_SPEC_CACHE_TTL = float(TOOL_SERVER_SPEC_CACHE_TTL)
+except ValueError:
+    TOOL_SERVER_SPEC_CACHE_TTL = 300.0
+
+# Shared connection pools for upstream model, embedding and tool requests
+# (0 disables the corresponding limit)
+AIOHTTP_CLIENT_POOL_LIMIT = os.environ.get("AIOHTTP_CLIENT_POOL_LIMIT", "0")
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT = int(AIOHTTP_CLIENT_POOL_LIMIT)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_LIMIT = 0
+
+AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = os.environ.get(
+    "AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST", "0"
+)
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = int(AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = 0
+
+AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = os.environ.get(
+    "AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT", "30"
+)
+try:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = float(AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = 30.0
+
+AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL = os.environ.get(
+    "AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL", "300"
+)
+try:
+    AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL = int(AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL = 300
+
+# Balance requests for a model across every OpenAI connection serving it,
+# instead of always using the first one. Only enable this when those
+# connections are interchangeable (same provider, account and behavior).
+ENABLE_OPENAI_API_BALANCING = (
+    os.environ.get("ENABLE_OPENAI_API_BALANCING", "False").lower() == "true"
+)
+
+# How requests for a model served by several Ollama/OpenAI connections are
+# spread: random, weighted (by the connection's "weight"), least_outstanding
+# or ewma (response latency times outstanding requests)
+UPSTREAM_BALANCER_STRATEGY = os.environ.get(
+    "UPSTREAM_BALANCER_STRATEGY", "least_outstanding"
+).lower()
+if UPSTREAM_BALANCER_STRATEGY not in (
+    "random",
+    "weighted",
+    "least_outstanding",
+    "ewma",
+):
+    UPSTREAM_BALANCER_STRATEGY = "least_outstanding"
+
+# Consecutive connection errors or 5xx responses after which a connection is
+# left out of balancing for UPSTREAM_BALANCER_EJECT_SECONDS (0 disables)
+UPSTREAM_BALANCER_EJECT_FAILURES = os.environ.get(
+    "UPSTREAM_BALANCER_EJECT_FAILURES", "3"
+)
+try:
+    UPSTREAM_BALANCER_EJECT_FAILURES = int(UPSTREAM_BALANCER_EJECT_FAILURES)
+except ValueError:
+    UPSTREAM_BALANCER_EJECT_FAILURES = 3
+
+UPSTREAM_BALANCER_EJECT_SECONDS = os.environ.get(
+    "UPSTREAM_BALANCER_EJECT_SECONDS", "30"
+)
+try:
+    UPSTREAM_BALANCER_EJECT_SECONDS = float(UPSTREAM_BALANCER_EJECT_SECONDS)
+except ValueError:
+    UPSTREAM_BALANCER_EJECT_SECONDS = 30.0
+
 
 RAG_EMBEDDING_TIMEOUT = os.environ.get("RAG_EMBEDDING_TIMEOUT", "")
 
@@ -850,6 +1045,51 @@ else:
     except Exception:
         RAG_EMBEDDING_TIMEOUT = None
 
+# Maintain a persistent BM25 index per collection for hybrid search instead of
+# rebuilding one from the whole collection on every query
+ENABLE_RAG_BM25_INDEX = (
+    os.environ.get("ENABLE_RAG_BM25_INDEX", "True").lower() == "true"
+)
+
+# Persist embeddings keyed by engine, model, prefix and content hash so that
+# re-indexing unchanged chunks skips the embedding backend
+ENABLE_RAG_EMBEDDING_CACHE = (
+    os.environ.get("ENABLE_RAG_EMBEDDING_CACHE", "True").lower() == "true"
+)
+
+RAG_EMBEDDING_CACHE_MAX_ENTRIES = os.environ.get(
+    "RAG_EMBEDDING_CACHE_MAX_ENTRIES", "100000"
+)
+
+try:
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES = int(RAG_EMBEDDING_CACHE_MAX_ENTRIES)
+except ValueError:
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES = 100000
+
+# Load, split, embed and insert uploaded files page by page through bounded
+# queues, checkpointing progress so a failed file resumes where it stopped
+ENABLE_RAG_STREAMING_INGESTION = (
+    os.environ.get("ENABLE_RAG_STREAMING_INGESTION", "False").lower() == "true"
+)
+
+RAG_STREAMING_INGESTION_BATCH_SIZE = os.environ.get(
+    "RAG_STREAMING_INGESTION_BATCH_SIZE", "128"
+)
+
+try:
+    RAG_STREAMING_INGESTION_BATCH_SIZE = max(int(RAG_STREAMING_INGESTION_BATCH_SIZE), 1)
+except ValueError:
+    RAG_STREAMING_INGESTION_BATCH_SIZE = 128
+
+RAG_STREAMING_INGESTION_QUEUE_SIZE = os.environ.get(
+    "RAG_STREAMING_INGESTION_QUEUE_SIZE", "4"
+)
+
+try:
+    RAG_STREAMING_INGESTION_QUEUE_SIZE = max(int(RAG_STREAMING_INGESTION_QUEUE_SIZE), 1)
+except ValueError:
+    RAG_STREAMING_INGESTION_QUEUE_SIZE = 4
+
 
 ####################################
 # SENTENCE TRANSFORMERS
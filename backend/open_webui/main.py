@@ -62,6 +62,7 @@ from open_webui.utils.audit import AuditLevel, AuditLoggingMiddleware
 from open_webui.utils.logger import start_logger
 from open_webui.socket.main import (
     MODELS,
+    DOCUMENT_SAVE_COALESCER,
     app as socket_app,
     periodic_usage_pool_cleanup,
     periodic_session_pool_cleanup,
@@ -115,6 +116,7 @@ from open_webui.models.functions import Functions
 from open_webui.models.models import Models
 from open_webui.models.users import UserModel, Users
 from open_webui.models.chats import Chats
+from open_webui.models.chat_search import ChatSearch
 
 from open_webui.config import (
     # Ollama
@@ -447,12 +449,14 @@ from open_webui.config import (
     ENABLE_TAGS_GENERATION,
     ENABLE_TITLE_GENERATION,
     ENABLE_FOLLOW_UP_GENERATION,
+    ENABLE_COMBINED_TASK_GENERATION,
     ENABLE_SEARCH_QUERY_GENERATION,
     ENABLE_RETRIEVAL_QUERY_GENERATION,
     ENABLE_AUTOCOMPLETE_GENERATION,
     TITLE_GENERATION_PROMPT_TEMPLATE,
     FOLLOW_UP_GENERATION_PROMPT_TEMPLATE,
     TAGS_GENERATION_PROMPT_TEMPLATE,
+    COMBINED_TASK_GENERATION_PROMPT_TEMPLATE,
     IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE,
     TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE,
     VOICE_MODE_PROMPT_TEMPLATE,
@@ -526,6 +530,9 @@ from open_webui.utils.middleware import (
     process_chat_payload,
     process_chat_response,
 )
+from open_webui.utils.chat_save import chat_save_buffer
+from open_webui.utils.session_pool import session_pool
+from open_webui.utils.balancer import upstream_balancer
 from open_webui.utils.tools import set_tool_servers
 
 from open_webui.utils.auth import (
@@ -535,6 +542,7 @@ from open_webui.utils.auth import (
     get_admin_user,
     get_verified_user,
     create_admin_user,
+    periodic_last_active_flush,
 )
 from open_webui.utils.plugin import install_tool_and_function_dependencies
 from open_webui.utils.oauth import (
@@ -646,6 +654,9 @@ async def lifespan(app: FastAPI):
 
     asyncio.create_task(periodic_usage_pool_cleanup())
     asyncio.create_task(periodic_session_pool_cleanup())
+    asyncio.create_task(periodic_last_active_flush())
+    # Index chats that predate the chat search index without delaying startup
+    asyncio.create_task(asyncio.to_thread(ChatSearch.resume_backfill))
 
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         try:
@@ -700,6 +711,14 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    # Persist any realtime chat saves still buffered in memory
+    chat_save_buffer.flush_all()
+    # ...and collaborative note edits still waiting for their debounced save
+    await DOCUMENT_SAVE_COALESCER.flush_all()
+    Users.flush_last_active()
+
+    await session_pool.close()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -1302,6 +1321,7 @@ app.state.config.ENABLE_AUTOCOMPLETE_GENERATION = ENABLE_AUTOCOMPLETE_GENERATION
 app.state.config.ENABLE_TAGS_GENERATION = ENABLE_TAGS_GENERATION
 app.state.config.ENABLE_TITLE_GENERATION = ENABLE_TITLE_GENERATION
 app.state.config.ENABLE_FOLLOW_UP_GENERATION = ENABLE_FOLLOW_UP_GENERATION
+app.state.config.ENABLE_COMBINED_TASK_GENERATION = ENABLE_COMBINED_TASK_GENERATION
 
 
 app.state.config.TITLE_GENERATION_PROMPT_TEMPLATE = TITLE_GENERATION_PROMPT_TEMPLATE
@@ -1312,6 +1332,9 @@ app.state.config.IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE = (
 app.state.config.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE = (
     FOLLOW_UP_GENERATION_PROMPT_TEMPLATE
 )
+app.state.config.COMBINED_TASK_GENERATION_PROMPT_TEMPLATE = (
+    COMBINED_TASK_GENERATION_PROMPT_TEMPLATE
+)
 
 app.state.config.TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE = (
     TOOLS_FUNCTION_CALLING_PROMPT_TEMPLATE
@@ -2297,6 +2320,21 @@ async def get_app_latest_release_version(user=Depends(get_verified_user)):
         return {"current": VERSION, "latest": VERSION}
 
 
+@app.get("/api/connections/pools")
+async def get_connection_pool_stats(user=Depends(get_admin_user)):
+    """Statistics for the shared upstream HTTP connection pools."""
+    return {"pools": session_pool.get_stats()}
+
+
+@app.get("/api/connections/upstreams")
+async def get_upstream_stats(user=Depends(get_admin_user)):
+    """Balancing statistics per Ollama/OpenAI connection base URL."""
+    return {
+        "strategy": upstream_balancer.strategy,
+        "upstreams": upstream_balancer.get_stats(),
+    }
+
+
 @app.get("/api/changelog")
 async def get_app_changelog():
     return {key: CHANGELOG[key] for idx, key in enumerate(CHANGELOG) if idx < 5}
@@ -2317,7 +2355,7 @@ async def get_current_usage(user=Depends(get_verified_user)):
             )
 
         return {
-            "model_ids": get_models_in_use(),
+            "model_ids": await get_models_in_use(),
             "user_count": Users.get_active_user_count(),
         }
     except HTTPException:
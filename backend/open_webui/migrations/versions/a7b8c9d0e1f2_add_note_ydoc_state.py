@@ -0,0 +1,35 @@
+"""Add collaborative document snapshot to note table
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "a7b8c9d0e1f2"
+down_revision: Union[str, None] = "f6a7b8c9d0e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("note")}
+
+    # Base64 encoded Yjs state, valid while ydoc_updated_at matches updated_at
+    if "ydoc_state" not in columns:
+        op.add_column("note", sa.Column("ydoc_state", sa.Text(), nullable=True))
+    if "ydoc_updated_at" not in columns:
+        op.add_column(
+            "note", sa.Column("ydoc_updated_at", sa.BigInteger(), nullable=True)
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("note", "ydoc_updated_at")
+    op.drop_column("note", "ydoc_state")
@@ -0,0 +1,63 @@
+"""Add chat search backfill progress
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-18 16:00:00.000000
+
+Chats that existed before the chat_search index are indexed in the
+background after startup (see ChatSearchTable.resume_backfill), resuming
+from the recorded cursor. Chat search only uses the index once that is done.
+"""
+
+import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from open_webui.migrations.util import get_existing_tables
+
+revision: str = "b8c9d0e1f2a3"
+down_revision: Union[str, None] = "a7b8c9d0e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing_tables = set(get_existing_tables())
+    if "chat_search_backfill" in existing_tables:
+        return
+
+    backfill = op.create_table(
+        "chat_search_backfill",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("last_chat_id", sa.Text(), nullable=False),
+        sa.Column("completed_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+
+    # Nothing to backfill on new installs
+    has_chats = "chat" in existing_tables and (
+        op.get_bind()
+        .execute(
+            sa.text("SELECT 1 FROM chat WHERE user_id NOT LIKE 'shared-%' LIMIT 1")
+        )
+        .first()
+        is not None
+    )
+    now = int(time.time())
+    op.bulk_insert(
+        backfill,
+        [
+            {
+                "id": 1,
+                "last_chat_id": "",
+                "completed_at": None if has_chats else now,
+                "updated_at": now,
+            }
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("chat_search_backfill")
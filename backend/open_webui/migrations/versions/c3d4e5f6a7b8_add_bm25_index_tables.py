@@ -0,0 +1,83 @@
+"""Add bm25 index tables
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from open_webui.migrations.util import get_existing_tables
+
+revision: str = "c3d4e5f6a7b8"
+down_revision: Union[str, None] = "b2c3d4e5f6a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing_tables = set(get_existing_tables())
+
+    # Collections are indexed lazily on first hybrid search (or on next
+    # insert), so there is nothing to backfill here.
+    if "bm25_collection" not in existing_tables:
+        op.create_table(
+            "bm25_collection",
+            sa.Column("name", sa.Text(), primary_key=True),
+            sa.Column("doc_count", sa.BigInteger(), nullable=False),
+            sa.Column("total_length", sa.BigInteger(), nullable=False),
+            sa.Column("total_enriched_length", sa.BigInteger(), nullable=False),
+            sa.Column("updated_at", sa.BigInteger()),
+        )
+
+    if "bm25_document" not in existing_tables:
+        op.create_table(
+            "bm25_document",
+            sa.Column("collection_name", sa.Text(), primary_key=True),
+            sa.Column("id", sa.Text(), primary_key=True),
+            sa.Column("text", sa.Text()),
+            sa.Column("meta", sa.JSON(), nullable=True),
+            sa.Column("file_id", sa.Text(), nullable=True),
+            sa.Column("hash", sa.Text(), nullable=True),
+            sa.Column("length", sa.Integer(), nullable=False),
+            sa.Column("enriched_length", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.BigInteger()),
+        )
+        op.create_index(
+            "bm25_document_collection_file_idx",
+            "bm25_document",
+            ["collection_name", "file_id"],
+        )
+        op.create_index(
+            "bm25_document_collection_hash_idx",
+            "bm25_document",
+            ["collection_name", "hash"],
+        )
+
+    if "bm25_posting" not in existing_tables:
+        op.create_table(
+            "bm25_posting",
+            sa.Column("collection_name", sa.Text(), primary_key=True),
+            sa.Column("term", sa.Text(), primary_key=True),
+            sa.Column("document_id", sa.Text(), primary_key=True),
+            sa.Column("tf", sa.Integer(), nullable=False),
+            sa.Column("enriched_tf", sa.Integer(), nullable=False),
+        )
+        op.create_index(
+            "bm25_posting_collection_document_idx",
+            "bm25_posting",
+            ["collection_name", "document_id"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("bm25_posting_collection_document_idx", table_name="bm25_posting")
+    op.drop_table("bm25_posting")
+    op.drop_index("bm25_document_collection_hash_idx", table_name="bm25_document")
+    op.drop_index("bm25_document_collection_file_idx", table_name="bm25_document")
+    op.drop_table("bm25_document")
+    op.drop_table("bm25_collection")
@@ -0,0 +1,47 @@
+"""Add embedding cache table
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from open_webui.migrations.util import get_existing_tables
+
+revision: str = "d4e5f6a7b8c9"
+down_revision: Union[str, None] = "c3d4e5f6a7b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing_tables = set(get_existing_tables())
+
+    if "embedding_cache" not in existing_tables:
+        op.create_table(
+            "embedding_cache",
+            sa.Column("id", sa.Text(), primary_key=True),
+            sa.Column("engine", sa.Text(), nullable=False),
+            sa.Column("model", sa.Text(), nullable=False),
+            sa.Column("dimensions", sa.Integer(), nullable=False),
+            sa.Column("embedding", sa.LargeBinary(), nullable=False),
+            sa.Column("last_used_at", sa.BigInteger(), nullable=False),
+            sa.Column("created_at", sa.BigInteger(), nullable=False),
+        )
+        op.create_index(
+            "embedding_cache_last_used_at_idx", "embedding_cache", ["last_used_at"]
+        )
+        op.create_index(
+            "embedding_cache_engine_model_idx", "embedding_cache", ["engine", "model"]
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("embedding_cache_engine_model_idx", table_name="embedding_cache")
+    op.drop_index("embedding_cache_last_used_at_idx", table_name="embedding_cache")
+    op.drop_table("embedding_cache")
@@ -0,0 +1,91 @@
+"""Add chat search index
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from open_webui.migrations.util import get_existing_tables
+
+revision: str = "e5f6a7b8c9d0"
+down_revision: Union[str, None] = "d4e5f6a7b8c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing_tables = set(get_existing_tables())
+    dialect_name = op.get_bind().dialect.name
+
+    if "chat_search" not in existing_tables:
+        op.create_table(
+            "chat_search",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("document_id", sa.Text(), nullable=False, unique=True),
+            sa.Column("chat_id", sa.Text(), nullable=False),
+            sa.Column("user_id", sa.Text(), nullable=False),
+            sa.Column("message_id", sa.Text(), nullable=True),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("updated_at", sa.BigInteger(), nullable=True),
+        )
+        op.create_index("ix_chat_search_chat_id", "chat_search", ["chat_id"])
+        op.create_index("ix_chat_search_user_id", "chat_search", ["user_id"])
+
+    if dialect_name == "sqlite":
+        # External content FTS5 table over chat_search.content, kept in sync
+        # by triggers so writers only touch chat_search
+        op.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS chat_search_fts USING fts5(
+                content,
+                content='chat_search',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS chat_search_ai AFTER INSERT ON chat_search BEGIN
+                INSERT INTO chat_search_fts(rowid, content) VALUES (new.id, new.content);
+            END
+            """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS chat_search_ad AFTER DELETE ON chat_search BEGIN
+                INSERT INTO chat_search_fts(chat_search_fts, rowid, content)
+                VALUES ('delete', old.id, old.content);
+            END
+            """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS chat_search_au AFTER UPDATE ON chat_search BEGIN
+                INSERT INTO chat_search_fts(chat_search_fts, rowid, content)
+                VALUES ('delete', old.id, old.content);
+                INSERT INTO chat_search_fts(rowid, content) VALUES (new.id, new.content);
+            END
+            """)
+    elif dialect_name == "postgresql":
+        # Must match the expression used by ChatSearchTable for the planner
+        # to use the index
+        op.execute("""
+            CREATE INDEX IF NOT EXISTS chat_search_content_fts_idx ON chat_search
+            USING GIN (to_tsvector('simple'::regconfig, content))
+            """)
+
+
+def downgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+
+    if dialect_name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS chat_search_au")
+        op.execute("DROP TRIGGER IF EXISTS chat_search_ad")
+        op.execute("DROP TRIGGER IF EXISTS chat_search_ai")
+        op.execute("DROP TABLE IF EXISTS chat_search_fts")
+    elif dialect_name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS chat_search_content_fts_idx")
+
+    op.drop_index("ix_chat_search_user_id", table_name="chat_search")
+    op.drop_index("ix_chat_search_chat_id", table_name="chat_search")
+    op.drop_table("chat_search")
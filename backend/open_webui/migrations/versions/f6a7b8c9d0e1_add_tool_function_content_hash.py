@@ -0,0 +1,58 @@
+"""Add content hash to tool and function tables
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "f6a7b8c9d0e1"
+down_revision: Union[str, None] = "e5f6a7b8c9d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ["tool", "function"]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    conn = op.get_bind()
+
+    for table_name in TABLES:
+        columns = {column["name"] for column in inspector.get_columns(table_name)}
+        if "content_hash" not in columns:
+            op.add_column(
+                table_name, sa.Column("content_hash", sa.Text(), nullable=True)
+            )
+
+        table = sa.table(
+            table_name,
+            sa.column("id", sa.Text()),
+            sa.column("content", sa.Text()),
+            sa.column("content_hash", sa.Text()),
+        )
+        rows = conn.execute(
+            sa.select(table.c.id, table.c.content).where(table.c.content_hash.is_(None))
+        ).fetchall()
+        for id, content in rows:
+            conn.execute(
+                table.update()
+                .where(table.c.id == id)
+                .values(
+                    content_hash=hashlib.sha256(
+                        (content or "").encode("utf-8")
+                    ).hexdigest()
+                )
+            )
+
+
+def downgrade() -> None:
+    for table_name in TABLES:
+        op.drop_column(table_name, "content_hash")
@@ -5,6 +5,7 @@ from typing import Any, Optional
 
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, get_db_context
+from open_webui.models.chat_search import ChatSearch
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import (
@@ -18,6 +19,10 @@ from sqlalchemy import (
     func,
 )
 
+# Rows per executemany batch for bulk upserts
+BATCH_SIZE = 500
+
+
 ####################
 # Helpers
 ####################
@@ -41,6 +46,37 @@ def _normalize_timestamp(timestamp: int) -> float:
     return timestamp
 
 
+def get_message_values(
+    message_id: str, chat_id: str, user_id: str, data: dict, now: int
+) -> dict:
+    """Column values of a new chat_message row from a chat history message."""
+    # Extract usage - check direct field first, then info.usage
+    usage = data.get("usage")
+    if not usage:
+        info = data.get("info", {})
+        usage = info.get("usage") if info else None
+
+    return {
+        "id": f"{chat_id}-{message_id}",
+        "chat_id": chat_id,
+        "user_id": user_id,
+        "role": data.get("role", "user"),
+        "parent_id": data.get("parent_id") or data.get("parentId"),
+        "content": data.get("content"),
+        "output": data.get("output"),
+        "model_id": data.get("model_id") or data.get("model"),
+        "files": data.get("files"),
+        "sources": data.get("sources"),
+        "embeds": data.get("embeds"),
+        "done": data.get("done", True),
+        "status_history": data.get("status_history") or data.get("statusHistory"),
+        "error": data.get("error"),
+        "usage": usage,
+        "created_at": data.get("timestamp", now),
+        "updated_at": now,
+    }
+
+
 ####################
 # ChatMessage DB Schema
 ####################
@@ -124,6 +160,19 @@ class ChatMessageModel(BaseModel):
 
 
 class ChatMessageTable:
+    def _index_message(self, db: Session, message: ChatMessage) -> None:
+        # Skip partial content while a response is still streaming
+        if message.done is False:
+            return
+        ChatSearch.upsert_message(
+            db,
+            document_id=message.id,
+            chat_id=message.chat_id,
+            message_id=message.id[len(message.chat_id) + 1 :],
+            user_id=message.user_id or "",
+            content=message.content,
+        )
+
     def upsert_message(
         self,
         message_id: str,
@@ -135,7 +184,6 @@ class ChatMessageTable:
         """Insert or update a chat message."""
         with get_db_context(db) as db:
             now = int(time.time())
-            timestamp = data.get("timestamp", now)
 
             # Use composite ID: {chat_id}-{message_id}
             composite_id = f"{chat_id}-{message_id}"
@@ -175,41 +223,49 @@ class ChatMessageTable:
                 if usage:
                     existing.usage = usage
                 existing.updated_at = now
+                self._index_message(db, existing)
                 db.commit()
                 db.refresh(existing)
                 return ChatMessageModel.model_validate(existing)
             else:
                 # Insert new
-                # Extract usage - check direct field first, then info.usage
-                usage = data.get("usage")
-                if not usage:
-                    info = data.get("info", {})
-                    usage = info.get("usage") if info else None
                 message = ChatMessage(
-                    id=composite_id,
-                    chat_id=chat_id,
-                    user_id=user_id,
-                    role=data.get("role", "user"),
-                    parent_id=data.get("parent_id") or data.get("parentId"),
-                    content=data.get("content"),
-                    output=data.get("output"),
-                    model_id=data.get("model_id") or data.get("model"),
-                    files=data.get("files"),
-                    sources=data.get("sources"),
-                    embeds=data.get("embeds"),
-                    done=data.get("done", True),
-                    status_history=data.get("status_history")
-                    or data.get("statusHistory"),
-                    error=data.get("error"),
-                    usage=usage,
-                    created_at=timestamp,
-                    updated_at=now,
+                    **get_message_values(message_id, chat_id, user_id, data, now)
                 )
                 db.add(message)
+                self._index_message(db, message)
                 db.commit()
                 db.refresh(message)
                 return ChatMessageModel.model_validate(message)
 
+    def upsert_messages(self, db: Session, rows: list[dict]) -> None:
+        """
+        Insert or replace chat_message rows (see get_message_values) with
+        batched INSERT ... ON CONFLICT statements. Does not commit, so callers
+        can batch several chats per transaction. Search documents are not
+        written here: only the current branch of a chat is indexed, see
+        ChatSearchTable.index_current_branches.
+        """
+        if not rows:
+            return
+
+        if db.bind.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        statement = insert(ChatMessage)
+        statement = statement.on_conflict_do_update(
+            index_elements=[ChatMessage.id],
+            set_={
+                column: statement.excluded[column]
+                for column in rows[0]
+                if column not in ("id", "chat_id", "created_at")
+            },
+        )
+        for i in range(0, len(rows), BATCH_SIZE):
+            db.execute(statement, rows[i : i + BATCH_SIZE])
+
     def get_message_by_id(
         self, id: str, db: Optional[Session] = None
     ) -> Optional[ChatMessageModel]:
@@ -306,6 +362,7 @@ class ChatMessageTable:
     ) -> bool:
         with get_db_context(db) as db:
             db.query(ChatMessage).filter_by(chat_id=chat_id).delete()
+            ChatSearch.delete_messages_by_chat_id(db, chat_id)
             db.commit()
             return True
 
@@ -0,0 +1,562 @@
+import logging
+import re
+import time
+from typing import Any, Callable, Optional
+
+from sqlalchemy import BigInteger, Column, Float, Integer, Text, func, literal_column
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.orm import Session
+
+from open_webui.internal.db import Base, get_db_context
+
+log = logging.getLogger(__name__)
+
+# SQLite full-text table over chat_search.content, kept in sync by triggers
+# (see the add_chat_search migration)
+SQLITE_FTS_TABLE = "chat_search_fts"
+POSTGRES_TS_CONFIG = literal_column("'simple'::regconfig")
+
+SNIPPET_MARKER = "**"
+SNIPPET_WORDS = 24
+
+# Keep IN (...) clauses well below the SQLite bound parameter limit
+BATCH_SIZE = 500
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+####################
+# Chat Search DB Schema
+####################
+
+
+class ChatSearchDocument(Base):
+    __tablename__ = "chat_search"
+
+    # Integer primary key doubles as the SQLite rowid the FTS table refers to
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # chat_message.id for messages, "title:{chat_id}" for chat titles
+    document_id = Column(Text, nullable=False, unique=True)
+    chat_id = Column(Text, nullable=False, index=True)
+    user_id = Column(Text, nullable=False, index=True)
+    message_id = Column(Text, nullable=True)
+    content = Column(Text, nullable=False)
+    updated_at = Column(BigInteger)
+
+
+class ChatSearchBackfill(Base):
+    __tablename__ = "chat_search_backfill"
+
+    # Single row tracking the indexing of chats that predate chat_search:
+    # last_chat_id is the keyset cursor, the index is complete once
+    # completed_at is set
+    id = Column(Integer, primary_key=True)
+    last_chat_id = Column(Text, nullable=False)
+    completed_at = Column(BigInteger, nullable=True)
+    updated_at = Column(BigInteger)
+
+
+####################
+# Helpers
+####################
+
+
+def get_content_text(content: Any) -> str:
+    """Plain text of a message content, which is a string or a list of blocks."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts = []
+        for block in content:
+            if isinstance(block, str):
+                parts.append(block)
+            elif isinstance(block, dict) and isinstance(block.get("text"), str):
+                parts.append(block["text"])
+        return "\n".join(parts)
+    return ""
+
+
+def get_title_document_id(chat_id: str) -> str:
+    return f"title:{chat_id}"
+
+
+def get_current_path_messages(chat: Any) -> list[tuple[str, dict]]:
+    """
+    (message_id, message) of the finished messages on the current branch of
+    a chat blob, from the root to history.currentId.
+    """
+    if not isinstance(chat, dict):
+        return []
+
+    history = chat.get("history") or {}
+    messages = history.get("messages") or {}
+    if not isinstance(messages, dict):
+        return []
+
+    path = []
+    seen = set()
+    message_id = history.get("currentId")
+    while message_id and message_id not in seen:
+        seen.add(message_id)
+        message = messages.get(message_id)
+        if not isinstance(message, dict):
+            break
+        if message.get("role") and message.get("done") is not False:
+            path.append((message_id, message))
+        message_id = message.get("parentId")
+
+    return path[::-1]
+
+
+####################
+# Chat Search
+####################
+
+
+class ChatSearchTable:
+    """
+    Full-text index over chat titles and chat_message contents.
+
+    Documents live in the chat_search table and are indexed with FTS5 on
+    SQLite and with a GIN index on to_tsvector('simple', content) on
+    PostgreSQL. Writers call the upsert/delete helpers inside their own
+    transaction; search only applies when the index exists for the dialect
+    and the chats that predate it have been backfilled.
+    """
+
+    def __init__(self):
+        self._available: dict[str, bool] = {}
+        self._backfilled: set[str] = set()
+
+    def is_available(self, db: Session) -> bool:
+        dialect_name = db.bind.dialect.name
+        key = f"{dialect_name}:{db.bind.url}"
+        if not self._has_index(db, dialect_name, key):
+            return False
+
+        # Until the backfill completes, older chats are missing from the
+        # index; checked on every call until then, possibly by another process
+        if key not in self._backfilled:
+            backfill = db.get(ChatSearchBackfill, 1)
+            if backfill is not None and backfill.completed_at is None:
+                return False
+            self._backfilled.add(key)
+        return True
+
+    def _has_index(self, db: Session, dialect_name: str, key: str) -> bool:
+        if key not in self._available:
+            try:
+                if dialect_name == "sqlite":
+                    self._available[key] = (
+                        db.execute(
+                            text(
+                                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+                            ),
+                            {"name": SQLITE_FTS_TABLE},
+                        ).first()
+                        is not None
+                    )
+                elif dialect_name == "postgresql":
+                    self._available[key] = (
+                        db.execute(
+                            text("SELECT to_regclass('chat_search') IS NOT NULL")
+                        ).scalar()
+                        is True
+                    )
+                else:
+                    self._available[key] = False
+            except Exception as e:
+                log.warning(f"Chat search index unavailable: {e}")
+                self._available[key] = False
+        return self._available[key]
+
+    ####################
+    # Writes (no commit, callers own the transaction)
+    ####################
+
+    def upsert_document(
+        self,
+        db: Session,
+        document_id: str,
+        chat_id: str,
+        user_id: str,
+        content: str,
+        message_id: Optional[str] = None,
+    ) -> None:
+        content = (content or "").strip()
+        document = db.query(ChatSearchDocument).filter_by(document_id=document_id)
+        document = document.first()
+
+        if not content:
+            if document is not None:
+                db.delete(document)
+            return
+
+        if document is None:
+            db.add(
+                ChatSearchDocument(
+                    document_id=document_id,
+                    chat_id=chat_id,
+                    user_id=user_id,
+                    message_id=message_id,
+                    content=content,
+                    updated_at=int(time.time()),
+                )
+            )
+        elif document.content != content or document.user_id != user_id:
+            document.content = content
+            document.user_id = user_id
+            document.updated_at = int(time.time())
+
+    def upsert_message(
+        self,
+        db: Session,
+        document_id: str,
+        chat_id: str,
+        message_id: str,
+        user_id: str,
+        content: Any,
+    ) -> None:
+        self.upsert_document(
+            db,
+            document_id=document_id,
+            chat_id=chat_id,
+            user_id=user_id,
+            content=get_content_text(content),
+            message_id=message_id,
+        )
+
+    def upsert_title(self, db: Session, chat_id: str, user_id: str, title: str) -> None:
+        self.upsert_document(
+            db,
+            document_id=get_title_document_id(chat_id),
+            chat_id=chat_id,
+            user_id=user_id,
+            content=title,
+        )
+
+    def index_chat_messages(
+        self, db: Session, chat_id: str, user_id: str, chat: Any
+    ) -> None:
+        """
+        Make the chat's message documents match the current branch of its
+        blob: edited messages are updated, messages no longer on the branch
+        (deleted or switched away from) are dropped.
+        """
+        self.index_current_branches(db, [(chat_id, user_id, chat)])
+
+    def index_current_branches(
+        self, db: Session, chats: list[tuple[str, str, Any]]
+    ) -> None:
+        """
+        Bulk version of index_chat_messages for (chat_id, user_id, chat)
+        tuples. Only messages on the current branch of a chat are indexed,
+        which is the rule for every writer of message documents.
+        """
+        documents = {}
+        for chat_id, user_id, chat in chats:
+            for message_id, message in get_current_path_messages(chat):
+                content = get_content_text(message.get("content")).strip()
+                if content:
+                    documents[f"{chat_id}-{message_id}"] = {
+                        "document_id": f"{chat_id}-{message_id}",
+                        "chat_id": chat_id,
+                        "user_id": user_id,
+                        "message_id": message_id,
+                        "content": content,
+                    }
+
+        chat_ids = [chat_id for chat_id, _, _ in chats]
+        existing = {}
+        for i in range(0, len(chat_ids), BATCH_SIZE):
+            existing.update(
+                db.query(ChatSearchDocument.document_id, ChatSearchDocument.content)
+                .filter(
+                    ChatSearchDocument.chat_id.in_(chat_ids[i : i + BATCH_SIZE]),
+                    ChatSearchDocument.message_id.isnot(None),
+                )
+                .all()
+            )
+
+        stale_ids = [
+            document_id
+            for document_id, content in existing.items()
+            if document_id not in documents
+            or documents[document_id]["content"] != content
+        ]
+        now = int(time.time())
+        self._replace_documents(
+            db,
+            stale_ids,
+            [
+                {**document, "updated_at": now}
+                for document_id, document in documents.items()
+                if existing.get(document_id) != document["content"]
+            ],
+        )
+
+    def index_titles(self, db: Session, chats: list[tuple[str, str, str]]) -> None:
+        """Bulk version of upsert_title for (chat_id, user_id, title) tuples."""
+        now = int(time.time())
+        self._replace_documents(
+            db,
+            [get_title_document_id(chat_id) for chat_id, _, _ in chats],
+            [
+                {
+                    "document_id": get_title_document_id(chat_id),
+                    "chat_id": chat_id,
+                    "user_id": user_id,
+                    "message_id": None,
+                    "content": title.strip(),
+                    "updated_at": now,
+                }
+                for chat_id, user_id, title in chats
+                if title and title.strip()
+            ],
+        )
+
+    def _replace_documents(
+        self, db: Session, document_ids: list[str], documents: list[dict]
+    ) -> None:
+        for i in range(0, len(document_ids), BATCH_SIZE):
+            db.execute(
+                delete(ChatSearchDocument).where(
+                    ChatSearchDocument.document_id.in_(document_ids[i : i + BATCH_SIZE])
+                )
+            )
+        for i in range(0, len(documents), BATCH_SIZE):
+            db.execute(insert(ChatSearchDocument), documents[i : i + BATCH_SIZE])
+
+    def delete_by_chat_ids(self, db: Session, chat_ids) -> None:
+        """Delete the documents of chats; chat_ids may be a list or a subquery."""
+        db.query(ChatSearchDocument).filter(
+            ChatSearchDocument.chat_id.in_(chat_ids)
+        ).delete(synchronize_session=False)
+
+    def delete_messages_by_chat_id(self, db: Session, chat_id: str) -> None:
+        db.query(ChatSearchDocument).filter(
+            ChatSearchDocument.chat_id == chat_id,
+            ChatSearchDocument.message_id.isnot(None),
+        ).delete(synchronize_session=False)
+
+    ####################
+    # Search
+    ####################
+
+    def _get_match_query(self, dialect_name: str, search_text: str) -> Optional[str]:
+        # Every term must match, as a prefix so results update while typing
+        terms = TOKEN_PATTERN.findall(search_text.lower())
+        if not terms:
+            return None
+        if dialect_name == "sqlite":
+            return " ".join(f'"{term}"*' for term in terms)
+        return " & ".join(f"{term}:*" for term in terms)
+
+    def get_hits_subquery(self, db: Session, user_id: str, search_text: str):
+        """
+        Subquery of (chat_id, score) for the user's chats matching search_text,
+        higher scores first, or None if the index cannot serve this query.
+        """
+        if not self.is_available(db):
+            return None
+
+        dialect_name = db.bind.dialect.name
+        match_query = self._get_match_query(dialect_name, search_text)
+        if match_query is None:
+            return None
+
+        if dialect_name == "sqlite":
+            return (
+                text(f"""
+                    SELECT chat_search.chat_id AS chat_id, MAX(matches.score) AS score
+                    FROM (
+                        SELECT rowid, -rank AS score
+                        FROM {SQLITE_FTS_TABLE}
+                        WHERE {SQLITE_FTS_TABLE} MATCH :search_query
+                    ) AS matches
+                    JOIN chat_search ON chat_search.id = matches.rowid
+                    WHERE chat_search.user_id = :search_user_id
+                    GROUP BY chat_search.chat_id
+                    """)
+                .bindparams(search_query=match_query, search_user_id=user_id)
+                .columns(chat_id=Text, score=Float)
+                .subquery("chat_search_hits")
+            )
+
+        vector = func.to_tsvector(POSTGRES_TS_CONFIG, ChatSearchDocument.content)
+        query = func.to_tsquery(POSTGRES_TS_CONFIG, match_query)
+        return (
+            select(
+                ChatSearchDocument.chat_id.label("chat_id"),
+                func.max(func.ts_rank(vector, query)).label("score"),
+            )
+            .where(ChatSearchDocument.user_id == user_id, vector.op("@@")(query))
+            .group_by(ChatSearchDocument.chat_id)
+            .subquery("chat_search_hits")
+        )
+
+    def get_snippets(
+        self, db: Session, user_id: str, chat_ids: list[str], search_text: str
+    ) -> dict[str, dict]:
+        """
+        Best matching document per chat as {chat_id: {snippet, message_id}},
+        with matched terms wrapped in SNIPPET_MARKER.
+        """
+        if not chat_ids or not self.is_available(db):
+            return {}
+
+        dialect_name = db.bind.dialect.name
+        match_query = self._get_match_query(dialect_name, search_text)
+        if match_query is None:
+            return {}
+
+        rows = []
+        for i in range(0, len(chat_ids), BATCH_SIZE):
+            batch = chat_ids[i : i + BATCH_SIZE]
+            if dialect_name == "sqlite":
+                placeholders = ", ".join(f":chat_id_{idx}" for idx in range(len(batch)))
+                rows.extend(
+                    db.execute(
+                        text(f"""
+                            SELECT chat_search.chat_id, chat_search.message_id,
+                                   snippet({SQLITE_FTS_TABLE}, 0, :marker, :marker, '...', :words),
+                                   -rank AS score
+                            FROM {SQLITE_FTS_TABLE}
+                            JOIN chat_search ON chat_search.id = {SQLITE_FTS_TABLE}.rowid
+                            WHERE {SQLITE_FTS_TABLE} MATCH :search_query
+                              AND chat_search.user_id = :search_user_id
+                              AND chat_search.chat_id IN ({placeholders})
+                            """),
+                        {
+                            "marker": SNIPPET_MARKER,
+                            "words": SNIPPET_WORDS,
+                            "search_query": match_query,
+                            "search_user_id": user_id,
+                            **{f"chat_id_{idx}": id for idx, id in enumerate(batch)},
+                        },
+                    ).all()
+                )
+            else:
+                vector = func.to_tsvector(
+                    POSTGRES_TS_CONFIG, ChatSearchDocument.content
+                )
+                query = func.to_tsquery(POSTGRES_TS_CONFIG, match_query)
+                rows.extend(
+                    db.execute(
+                        select(
+                            ChatSearchDocument.chat_id,
+                            ChatSearchDocument.message_id,
+                            func.ts_headline(
+                                POSTGRES_TS_CONFIG,
+                                ChatSearchDocument.content,
+                                query,
+                                f"StartSel={SNIPPET_MARKER}, StopSel={SNIPPET_MARKER}, "
+                                f"MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}",
+                            ),
+                            func.ts_rank(vector, query),
+                        ).where(
+                            ChatSearchDocument.user_id == user_id,
+                            ChatSearchDocument.chat_id.in_(batch),
+                            vector.op("@@")(query),
+                        )
+                    ).all()
+                )
+
+        snippets = {}
+        for chat_id, message_id, snippet, score in sorted(
+            rows, key=lambda row: row[3], reverse=True
+        ):
+            if chat_id not in snippets:
+                snippets[chat_id] = {"snippet": snippet, "message_id": message_id}
+        return snippets
+
+    ####################
+    # Backfill
+    ####################
+
+    def backfill(
+        self,
+        batch_size: int = BATCH_SIZE,
+        progress: Optional[Callable[[str, int], None]] = None,
+        last_id: str = "",
+        db: Optional[Session] = None,
+    ) -> dict:
+        """
+        (Re)index the title and the current branch of every chat after
+        last_id, in keyset-paginated batches committed one at a time together
+        with the backfill cursor, then mark the backfill complete. Safe to
+        re-run.
+        """
+        # Imported here, chats imports this module
+        from open_webui.models.chats import Chat
+
+        counts = {"chats": 0}
+        with get_db_context(db) as db:
+            while True:
+                rows = (
+                    db.query(Chat.id, Chat.user_id, Chat.title, Chat.chat)
+                    .filter(Chat.id > last_id, ~Chat.user_id.startswith("shared-"))
+                    .order_by(Chat.id)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not rows:
+                    break
+
+                self.index_titles(
+                    db, [(id, user_id, title) for id, user_id, title, _ in rows]
+                )
+                self.index_current_branches(
+                    db, [(id, user_id, chat) for id, user_id, _, chat in rows]
+                )
+                last_id = rows[-1][0]
+                self._set_backfill(db, last_id)
+                db.commit()
+
+                counts["chats"] += len(rows)
+                if progress:
+                    progress("chats", counts["chats"])
+
+            self._set_backfill(db, last_id, completed=True)
+            db.commit()
+
+        return counts
+
+    def resume_backfill(self, batch_size: int = BATCH_SIZE) -> Optional[dict]:
+        """
+        Continue the backfill of chats that predate the index from its
+        cursor, if it hasn't completed yet. Run in the background at startup.
+        """
+        with get_db_context() as db:
+            backfill = db.get(ChatSearchBackfill, 1)
+            if backfill is None or backfill.completed_at is not None:
+                return None
+            last_id = backfill.last_chat_id
+
+        log.info(f"Indexing existing chats for chat search after {last_id!r}")
+        try:
+            counts = self.backfill(
+                batch_size=batch_size,
+                progress=lambda kind, count: log.debug(f"Indexed {count} {kind}"),
+                last_id=last_id,
+            )
+        except Exception as e:
+            # Resumed from the last committed batch on the next start
+            log.exception(f"Failed to index existing chats for chat search: {e}")
+            return None
+        log.info(f"Indexed {counts['chats']} existing chats for chat search")
+        return counts
+
+    def _set_backfill(self, db: Session, last_id: str, completed: bool = False):
+        now = int(time.time())
+        backfill = db.get(ChatSearchBackfill, 1)
+        if backfill is None:
+            backfill = ChatSearchBackfill(id=1)
+            db.add(backfill)
+        backfill.last_chat_id = last_id
+        backfill.updated_at = now
+        if completed:
+            backfill.completed_at = now
+
+
+ChatSearch = ChatSearchTable()
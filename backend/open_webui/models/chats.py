@@ -2,14 +2,20 @@ import logging
 import json
 import time
 import uuid
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
-from open_webui.models.chat_messages import ChatMessage, ChatMessages
+from open_webui.models.chat_messages import (
+    ChatMessage,
+    ChatMessages,
+    get_message_values,
+)
+from open_webui.models.chat_search import ChatSearch
 from open_webui.utils.misc import sanitize_data_for_db, sanitize_text_for_db
+from open_webui.env import DATABASE_CHAT_IMPORT_BATCH_SIZE
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import (
@@ -23,7 +29,7 @@ from sqlalchemy import (
     Index,
     UniqueConstraint,
 )
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import or_, func, select, and_, text, insert
 from sqlalchemy.sql import exists
 from sqlalchemy.sql.expression import bindparam
 
@@ -86,6 +92,41 @@ class ChatModel(BaseModel):
     folder_id: Optional[str] = None
 
 
+class ChatListItemModel(BaseModel):
+    """ChatModel without the chat JSON blob, for list views."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    user_id: str
+    title: str
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+    share_id: Optional[str] = None
+    archived: bool = False
+    pinned: Optional[bool] = False
+
+    meta: dict = {}
+    folder_id: Optional[str] = None
+
+
+# Columns loaded for ChatListItemModel; Chat.chat stays deferred
+CHAT_LIST_COLUMNS = (
+    Chat.id,
+    Chat.user_id,
+    Chat.title,
+    Chat.created_at,
+    Chat.updated_at,
+    Chat.share_id,
+    Chat.archived,
+    Chat.pinned,
+    Chat.meta,
+    Chat.folder_id,
+)
+
+
 class ChatFile(Base):
     __tablename__ = "chat_file"
 
@@ -139,6 +180,28 @@ class ChatsImportForm(BaseModel):
     chats: list[ChatImportForm]
 
 
+def get_chat_import_form(item: dict) -> ChatImportForm:
+    """Import form for an item of a chat export, or a legacy bare chat object."""
+    if item.get("chat"):
+        return ChatImportForm(
+            chat=item["chat"],
+            meta=item.get("meta") or {},
+            pinned=False,
+            folder_id=item.get("folder_id"),
+            created_at=item.get("created_at"),
+            updated_at=item.get("updated_at"),
+        )
+
+    # Legacy format
+    return ChatImportForm(
+        chat=item,
+        meta={},
+        pinned=False,
+        created_at=item.get("created_at"),
+        updated_at=item.get("updated_at"),
+    )
+
+
 class ChatTitleMessagesForm(BaseModel):
     title: str
     messages: list[dict]
@@ -167,6 +230,7 @@ class ChatTitleIdResponse(BaseModel):
     title: str
     updated_at: int
     created_at: int
+    snippet: Optional[str] = None
 
 
 class SharedChatResponse(BaseModel):
@@ -262,7 +326,25 @@ class ChatStatsExport(BaseModel):
     chat: ChatBody
 
 
+SEARCH_FILTER_PREFIXES = ("tag:", "folder:", "pinned:", "archived:", "shared:")
+
+
+def get_search_text_without_filters(search_text: str) -> str:
+    """Drop tag:/folder:/pinned:/archived:/shared: filters from a search query."""
+    return " ".join(
+        word
+        for word in search_text.split(" ")
+        if not word.startswith(SEARCH_FILTER_PREFIXES)
+    )
+
+
 class ChatTable:
+    def _get_chat_list_query(self, db: Session):
+        # The chat blob can be megabytes per chat (inline images, long
+        # histories), so list queries load only the list columns and raise
+        # instead of lazily loading the blob if anything touches it.
+        return db.query(Chat).options(load_only(*CHAT_LIST_COLUMNS, raiseload=True))
+
     def _clean_null_bytes(self, obj):
         """Recursively remove null bytes from strings in dict/list structures."""
         return sanitize_data_for_db(obj)
@@ -290,6 +372,22 @@ class ChatTable:
 
         return changed
 
+    def _index_chat_title(self, db: Session, chat_item: Chat) -> None:
+        # Shared snapshots are never searched, only their owner's chat is
+        if not chat_item.user_id.startswith("shared-"):
+            ChatSearch.upsert_title(
+                db, chat_item.id, chat_item.user_id, chat_item.title
+            )
+
+    def _index_current_messages(self, db: Session, chat_item: Chat) -> None:
+        # Messages saved from the client are not written to chat_message, so
+        # index the current branch of the blob (edits and deleted branches
+        # included).
+        if not chat_item.user_id.startswith("shared-"):
+            ChatSearch.index_chat_messages(
+                db, chat_item.id, chat_item.user_id, chat_item.chat
+            )
+
     def insert_new_chat(
         self, user_id: str, form_data: ChatForm, db: Optional[Session] = None
     ) -> Optional[ChatModel]:
@@ -313,6 +411,7 @@ class ChatTable:
 
             chat_item = Chat(**chat.model_dump())
             db.add(chat_item)
+            self._index_chat_title(db, chat_item)
             db.commit()
             db.refresh(chat_item)
 
@@ -360,41 +459,129 @@ class ChatTable:
         )
         return chat
 
+    def _get_message_rows(
+        self, chat_id: str, user_id: str, chat: dict, now: int
+    ) -> list[dict]:
+        messages = (chat or {}).get("history", {}).get("messages", {}) or {}
+        return [
+            get_message_values(message_id, chat_id, user_id, message, now)
+            for message_id, message in messages.items()
+            if isinstance(message, dict) and message.get("role")
+        ]
+
+    def _insert_chats(self, db: Session, chats: list[ChatModel]) -> None:
+        """
+        Insert chats, their chat_message rows and search documents with
+        batched statements. Does not commit.
+        """
+        now = int(time.time())
+        db.execute(insert(Chat), [chat.model_dump() for chat in chats])
+        ChatSearch.index_titles(
+            db, [(chat.id, chat.user_id, chat.title) for chat in chats]
+        )
+        ChatSearch.index_current_branches(
+            db, [(chat.id, chat.user_id, chat.chat) for chat in chats]
+        )
+        ChatMessages.upsert_messages(
+            db,
+            [
+                row
+                for chat in chats
+                for row in self._get_message_rows(chat.id, chat.user_id, chat.chat, now)
+            ],
+        )
+
+    def import_chats_in_batches(
+        self,
+        user_id: str,
+        chat_import_forms: Iterable[ChatImportForm],
+        batch_size: int = DATABASE_CHAT_IMPORT_BATCH_SIZE,
+        db: Optional[Session] = None,
+    ) -> Iterator[list[ChatModel]]:
+        """
+        Import chats from any iterable (e.g. a streamed export), inserting
+        every batch_size chats and yielding each inserted batch. The import is
+        committed once the iterable is exhausted, and rolled back entirely if
+        it (or an insert) fails or the generator is closed early.
+        """
+        with get_db_context(db) as db:
+            try:
+                batch = []
+                for form_data in chat_import_forms:
+                    batch.append(
+                        self._chat_import_form_to_chat_model(user_id, form_data)
+                    )
+                    if len(batch) >= batch_size:
+                        self._insert_chats(db, batch)
+                        yield batch
+                        batch = []
+
+                if batch:
+                    self._insert_chats(db, batch)
+                    yield batch
+                db.commit()
+            except BaseException:
+                db.rollback()
+                raise
+
     def import_chats(
         self,
         user_id: str,
         chat_import_forms: list[ChatImportForm],
         db: Optional[Session] = None,
     ) -> list[ChatModel]:
-        with get_db_context(db) as db:
-            chats = []
-
-            for form_data in chat_import_forms:
-                chat = self._chat_import_form_to_chat_model(user_id, form_data)
-                chats.append(Chat(**chat.model_dump()))
-
-            db.add_all(chats)
-            db.commit()
+        return [
+            chat
+            for batch in self.import_chats_in_batches(user_id, chat_import_forms, db=db)
+            for chat in batch
+        ]
 
-            # Dual-write messages to chat_message table
-            try:
-                for form_data, chat_obj in zip(chat_import_forms, chats):
-                    history = form_data.chat.get("history", {})
-                    messages = history.get("messages", {})
-                    for message_id, message in messages.items():
-                        if isinstance(message, dict) and message.get("role"):
-                            ChatMessages.upsert_message(
-                                message_id=message_id,
-                                chat_id=chat_obj.id,
-                                user_id=user_id,
-                                data=message,
-                            )
-            except Exception as e:
-                log.warning(
-                    f"Failed to write imported messages to chat_message table: {e}"
+    def backfill_chat_messages(
+        self,
+        batch_size: int = DATABASE_CHAT_IMPORT_BATCH_SIZE,
+        db: Optional[Session] = None,
+    ) -> Iterator[dict]:
+        """
+        Populate chat_message (and the search index of current branches) from
+        the history stored in every chat blob, replacing existing rows. Chats
+        are read in keyset-paginated batches, each committed separately;
+        yields progress as {"chats", "messages", "total"} after every batch.
+        Safe to re-run.
+        """
+        with get_db_context(db) as db:
+            total = (
+                db.query(func.count(Chat.id))
+                .filter(~Chat.user_id.startswith("shared-"))
+                .scalar()
+            )
+            progress = {"chats": 0, "messages": 0, "total": total}
+
+            last_id = ""
+            while True:
+                chats = (
+                    db.query(Chat.id, Chat.user_id, Chat.chat)
+                    .filter(Chat.id > last_id, ~Chat.user_id.startswith("shared-"))
+                    .order_by(Chat.id)
+                    .limit(batch_size)
+                    .all()
                 )
+                if not chats:
+                    break
 
-            return [ChatModel.model_validate(chat) for chat in chats]
+                now = int(time.time())
+                rows = [
+                    row
+                    for id, user_id, chat in chats
+                    for row in self._get_message_rows(id, user_id, chat, now)
+                ]
+                ChatMessages.upsert_messages(db, rows)
+                ChatSearch.index_current_branches(db, chats)
+                db.commit()
+
+                last_id = chats[-1][0]
+                progress["chats"] += len(chats)
+                progress["messages"] += len(rows)
+                yield dict(progress)
 
     def update_chat_by_id(
         self, id: str, chat: dict, db: Optional[Session] = None
@@ -411,6 +598,8 @@ class ChatTable:
 
                 chat_item.updated_at = int(time.time())
 
+                self._index_chat_title(db, chat_item)
+                self._index_current_messages(db, chat_item)
                 db.commit()
                 db.refresh(chat_item)
 
@@ -838,9 +1027,9 @@ class ChatTable:
         skip: int = 0,
         limit: int = 50,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemModel]:
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = self._get_chat_list_query(db).filter_by(user_id=user_id)
             if not include_archived:
                 query = query.filter_by(archived=False)
 
@@ -868,7 +1057,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListItemModel.model_validate(chat) for chat in all_chats]
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -922,16 +1111,28 @@ class ChatTable:
         skip: int = 0,
         limit: int = 50,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemModel]:
         with get_db_context(db) as db:
             all_chats = (
-                db.query(Chat)
+                self._get_chat_list_query(db)
                 .filter(Chat.id.in_(chat_ids))
                 .filter_by(archived=False)
                 .order_by(Chat.updated_at.desc())
                 .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListItemModel.model_validate(chat) for chat in all_chats]
+
+    def get_chat_messages_by_chat_ids_and_user_id(
+        self, chat_ids: list[str], user_id: str, db: Optional[Session] = None
+    ) -> dict[str, dict]:
+        """The history messages of several chats of a user, in one query."""
+        with get_db_context(db) as db:
+            return {
+                id: ((chat or {}).get("history") or {}).get("messages") or {}
+                for id, chat in db.query(Chat.id, Chat.chat)
+                .filter(Chat.id.in_(chat_ids), Chat.user_id == user_id)
+                .all()
+            }
 
     def get_chat_by_id(
         self, id: str, db: Optional[Session] = None
@@ -1105,7 +1306,7 @@ class ChatTable:
         skip: int = 0,
         limit: int = 60,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemModel]:
         """
         Filters chats based on a search query using Python, allowing pagination using skip and limit.
         """
@@ -1154,22 +1355,10 @@ class ChatTable:
         elif "shared:false" in search_text_words:
             is_shared = False
 
-        search_text_words = [
-            word
-            for word in search_text_words
-            if (
-                not word.startswith("tag:")
-                and not word.startswith("folder:")
-                and not word.startswith("pinned:")
-                and not word.startswith("archived:")
-                and not word.startswith("shared:")
-            )
-        ]
-
-        search_text = " ".join(search_text_words)
+        search_text = get_search_text_without_filters(search_text)
 
         with get_db_context(db) as db:
-            query = db.query(Chat).filter(Chat.user_id == user_id)
+            query = self._get_chat_list_query(db).filter(Chat.user_id == user_id)
 
             if is_archived is not None:
                 query = query.filter(Chat.archived == is_archived)
@@ -1188,25 +1377,39 @@ class ChatTable:
             if folder_ids:
                 query = query.filter(Chat.folder_id.in_(folder_ids))
 
-            query = query.order_by(Chat.updated_at.desc())
+            # Rank by the full-text index when it is available, otherwise
+            # fall back to scanning titles and message JSON below
+            hits = (
+                ChatSearch.get_hits_subquery(db, user_id, search_text)
+                if search_text
+                else None
+            )
+            if hits is not None:
+                query = query.join(hits, hits.c.chat_id == Chat.id).order_by(
+                    hits.c.score.desc(), Chat.updated_at.desc()
+                )
+            else:
+                query = query.order_by(Chat.updated_at.desc())
 
             # Check if the database dialect is either 'sqlite' or 'postgresql'
             dialect_name = db.bind.dialect.name
             if dialect_name == "sqlite":
-                # SQLite case: using JSON1 extension for JSON searching
-                sqlite_content_sql = (
-                    "EXISTS ("
-                    "    SELECT 1 "
-                    "    FROM json_each(Chat.chat, '$.messages') AS message "
-                    "    WHERE LOWER(message.value->>'content') LIKE '%' || :content_key || '%'"
-                    ")"
-                )
-                sqlite_content_clause = text(sqlite_content_sql)
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")), sqlite_content_clause
-                    ).params(title_key=f"%{search_text}%", content_key=search_text)
-                )
+                if hits is None:
+                    # SQLite case: using JSON1 extension for JSON searching
+                    sqlite_content_sql = (
+                        "EXISTS ("
+                        "    SELECT 1 "
+                        "    FROM json_each(Chat.chat, '$.messages') AS message "
+                        "    WHERE LOWER(message.value->>'content') LIKE '%' || :content_key || '%'"
+                        ")"
+                    )
+                    sqlite_content_clause = text(sqlite_content_sql)
+                    query = query.filter(
+                        or_(
+                            Chat.title.ilike(bindparam("title_key")),
+                            sqlite_content_clause,
+                        ).params(title_key=f"%{search_text}%", content_key=search_text)
+                    )
 
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
@@ -1233,32 +1436,35 @@ class ChatTable:
                     )
 
             elif dialect_name == "postgresql":
-                # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
-                # the JSON representation for \u0000 before attempting text extraction
-
-                # Safety filter: JSON field must not contain \u0000
-                query = query.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
-
-                # Safety filter: title must not contain actual null bytes
-                query = query.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
-
-                postgres_content_sql = """
-                EXISTS (
-                    SELECT 1
-                    FROM json_array_elements(Chat.chat->'messages') AS message
-                    WHERE json_typeof(message->'content') = 'string'
-                    AND LOWER(message->>'content') LIKE '%' || :content_key || '%'
-                )
-                """
+                if hits is None:
+                    # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
+                    # the JSON representation for \u0000 before attempting text extraction
+
+                    # Safety filter: JSON field must not contain \u0000
+                    query = query.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
+
+                    # Safety filter: title must not contain actual null bytes
+                    query = query.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
+
+                    postgres_content_sql = """
+                    EXISTS (
+                        SELECT 1
+                        FROM json_array_elements(Chat.chat->'messages') AS message
+                        WHERE json_typeof(message->'content') = 'string'
+                        AND LOWER(message->>'content') LIKE '%' || :content_key || '%'
+                    )
+                    """
 
-                postgres_content_clause = text(postgres_content_sql)
+                    postgres_content_clause = text(postgres_content_sql)
 
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")),
-                        postgres_content_clause,
+                    query = query.filter(
+                        or_(
+                            Chat.title.ilike(bindparam("title_key")),
+                            postgres_content_clause,
+                        )
+                    ).params(
+                        title_key=f"%{search_text}%", content_key=search_text.lower()
                     )
-                ).params(title_key=f"%{search_text}%", content_key=search_text.lower())
 
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
@@ -1294,7 +1500,27 @@ class ChatTable:
             log.info(f"The number of chats: {len(all_chats)}")
 
             # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListItemModel.model_validate(chat) for chat in all_chats]
+
+    def get_chat_search_snippets_by_user_id(
+        self,
+        user_id: str,
+        chat_ids: list[str],
+        search_text: str,
+        db: Optional[Session] = None,
+    ) -> dict[str, dict]:
+        """
+        Best matching snippet per chat for a search query, as
+        {chat_id: {"snippet", "message_id"}}. Empty when the index is unavailable.
+        """
+        search_text = get_search_text_without_filters(
+            sanitize_text_for_db(search_text).lower().strip()
+        )
+        if not search_text:
+            return {}
+
+        with get_db_context(db) as db:
+            return ChatSearch.get_snippets(db, user_id, chat_ids, search_text)
 
     def get_chats_by_folder_id_and_user_id(
         self,
@@ -1303,9 +1529,11 @@ class ChatTable:
         skip: int = 0,
         limit: int = 60,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemModel]:
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(folder_id=folder_id, user_id=user_id)
+            query = self._get_chat_list_query(db).filter_by(
+                folder_id=folder_id, user_id=user_id
+            )
             query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
             query = query.filter_by(archived=False)
 
@@ -1317,7 +1545,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListItemModel.model_validate(chat) for chat in all_chats]
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str, db: Optional[Session] = None
@@ -1364,9 +1592,9 @@ class ChatTable:
         skip: int = 0,
         limit: int = 50,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemModel]:
         with get_db_context(db) as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = self._get_chat_list_query(db).filter_by(user_id=user_id)
             tag_id = tag_name.replace(" ", "_").lower()
 
             log.info(f"DB dialect name: {db.bind.dialect.name}")
@@ -1391,7 +1619,7 @@ class ChatTable:
 
             all_chats = query.all()
             log.debug(f"all_chats: {all_chats}")
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListItemModel.model_validate(chat) for chat in all_chats]
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str, db: Optional[Session] = None
@@ -1514,6 +1742,7 @@ class ChatTable:
         try:
             with get_db_context(db) as db:
                 db.query(ChatMessage).filter_by(chat_id=id).delete()
+                ChatSearch.delete_by_chat_ids(db, [id])
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -1527,6 +1756,7 @@ class ChatTable:
         try:
             with get_db_context(db) as db:
                 db.query(ChatMessage).filter_by(chat_id=id).delete()
+                ChatSearch.delete_by_chat_ids(db, [id])
                 db.query(Chat).filter_by(id=id, user_id=user_id).delete()
                 db.commit()
 
@@ -1547,6 +1777,7 @@ class ChatTable:
                 db.query(ChatMessage).filter(
                     ChatMessage.chat_id.in_(chat_id_subquery)
                 ).delete(synchronize_session=False)
+                ChatSearch.delete_by_chat_ids(db, chat_id_subquery)
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -1567,6 +1798,7 @@ class ChatTable:
                 db.query(ChatMessage).filter(
                     ChatMessage.chat_id.in_(chat_id_subquery)
                 ).delete(synchronize_session=False)
+                ChatSearch.delete_by_chat_ids(db, chat_id_subquery)
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
                 db.commit()
 
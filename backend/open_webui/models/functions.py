@@ -5,8 +5,9 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.users import Users, UserModel
+from open_webui.utils.plugin_cache import get_content_hash, plugin_cache
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, Index
+from sqlalchemy import BigInteger, Boolean, Column, String, Text, Index, func
 
 log = logging.getLogger(__name__)
 
@@ -23,6 +24,7 @@ class Function(Base):
     name = Column(Text)
     type = Column(Text)
     content = Column(Text)
+    content_hash = Column(Text, nullable=True)
     meta = Column(JSONField)
     valves = Column(JSONField)
     is_active = Column(Boolean)
@@ -103,6 +105,21 @@ class FunctionValves(BaseModel):
 
 
 class FunctionsTable:
+    def __init__(self):
+        # Bumped on every function write in this process
+        self.version = 0
+
+    def get_functions_version(self, db: Optional[Session] = None) -> tuple:
+        """
+        Changes whenever a function (including its valves or status) is
+        inserted, updated or deleted, here or by another process.
+        """
+        with get_db_context(db) as db:
+            count, updated_at = db.query(
+                func.count(Function.id), func.max(Function.updated_at)
+            ).one()
+            return (self.version, count, updated_at)
+
     def insert_new_function(
         self,
         user_id: str,
@@ -122,9 +139,14 @@ class FunctionsTable:
 
         try:
             with get_db_context(db) as db:
-                result = Function(**function.model_dump())
+                result = Function(
+                    **function.model_dump(),
+                    content_hash=get_content_hash(function.content),
+                )
                 db.add(result)
                 db.commit()
+                self.version += 1
+                plugin_cache.invalidate("function", function.id)
                 db.refresh(result)
                 if result:
                     return FunctionModel.model_validate(result)
@@ -156,6 +178,7 @@ class FunctionsTable:
                         db.query(Function).filter_by(id=func.id).update(
                             {
                                 **func.model_dump(),
+                                "content_hash": get_content_hash(func.content),
                                 "user_id": user_id,
                                 "updated_at": int(time.time()),
                             }
@@ -164,6 +187,7 @@ class FunctionsTable:
                         new_func = Function(
                             **{
                                 **func.model_dump(),
+                                "content_hash": get_content_hash(func.content),
                                 "user_id": user_id,
                                 "updated_at": int(time.time()),
                             }
@@ -176,6 +200,9 @@ class FunctionsTable:
                         db.delete(func)
 
                 db.commit()
+                self.version += 1
+                for func_id in existing_ids | new_function_ids:
+                    plugin_cache.invalidate("function", func_id)
 
                 return [
                     FunctionModel.model_validate(func)
@@ -195,6 +222,12 @@ class FunctionsTable:
         except Exception:
             return None
 
+    def get_function_content_hash_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[str]:
+        with get_db_context(db) as db:
+            return db.query(Function.content_hash).filter_by(id=id).scalar()
+
     def get_functions_by_ids(
         self, ids: list[str], db: Optional[Session] = None
     ) -> list[FunctionModel]:
@@ -317,6 +350,7 @@ class FunctionsTable:
                 function.valves = valves
                 function.updated_at = int(time.time())
                 db.commit()
+                self.version += 1
                 db.refresh(function)
                 return FunctionModel.model_validate(function)
             except Exception:
@@ -337,6 +371,7 @@ class FunctionsTable:
 
                     function.updated_at = int(time.time())
                     db.commit()
+                    self.version += 1
                     db.refresh(function)
                     return FunctionModel.model_validate(function)
                 else:
@@ -393,6 +428,12 @@ class FunctionsTable:
     ) -> Optional[FunctionModel]:
         with get_db_context(db) as db:
             try:
+                if "content" in updated:
+                    updated = {
+                        **updated,
+                        "content_hash": get_content_hash(updated["content"]),
+                    }
+
                 db.query(Function).filter_by(id=id).update(
                     {
                         **updated,
@@ -400,6 +441,9 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                self.version += 1
+                if "content" in updated:
+                    plugin_cache.invalidate("function", id)
                 function = db.get(Function, id)
                 return FunctionModel.model_validate(function) if function else None
             except Exception:
@@ -415,6 +459,7 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                self.version += 1
                 return True
             except Exception:
                 return None
@@ -424,6 +469,8 @@ class FunctionsTable:
             try:
                 db.query(Function).filter_by(id=id).delete()
                 db.commit()
+                self.version += 1
+                plugin_cache.invalidate("function", id)
 
                 return True
             except Exception:
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 
 from open_webui.models.files import FileMetadataResponse
+from open_webui.utils.permission_cache import permission_cache
 
 
 from pydantic import BaseModel, ConfigDict
@@ -390,6 +391,7 @@ class GroupTable:
 
             db.add_all(new_members)
             db.commit()
+            permission_cache.clear()
 
     def get_group_member_count_by_id(
         self, id: str, db: Optional[Session] = None
@@ -432,6 +434,7 @@ class GroupTable:
                     }
                 )
                 db.commit()
+                permission_cache.clear()
                 return self.get_group_by_id(id=id, db=db)
         except Exception as e:
             log.exception(e)
@@ -442,6 +445,7 @@ class GroupTable:
             with get_db_context(db) as db:
                 db.query(Group).filter_by(id=id).delete()
                 db.commit()
+                permission_cache.clear()
                 return True
         except Exception:
             return False
@@ -451,6 +455,7 @@ class GroupTable:
             try:
                 db.query(Group).delete()
                 db.commit()
+                permission_cache.clear()
 
                 return True
             except Exception:
@@ -480,6 +485,7 @@ class GroupTable:
                     )
 
                 db.commit()
+                permission_cache.invalidate_user(user_id)
                 return True
 
             except Exception:
@@ -573,6 +579,7 @@ class GroupTable:
                     )
 
                 db.commit()
+                permission_cache.invalidate_user(user_id)
                 return True
 
             except Exception as e:
@@ -614,6 +621,7 @@ class GroupTable:
                 group.updated_at = now
                 db.commit()
                 db.refresh(group)
+                permission_cache.invalidate_users(user_ids or [])
 
                 return GroupModel.model_validate(group)
 
@@ -646,6 +654,7 @@ class GroupTable:
 
                 db.commit()
                 db.refresh(group)
+                permission_cache.invalidate_users(user_ids)
                 return GroupModel.model_validate(group)
 
         except Exception as e:
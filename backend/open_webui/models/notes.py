@@ -1,10 +1,11 @@
+import base64
 import json
 import time
 import uuid
 from typing import Optional
 from functools import lru_cache
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, deferred
 from open_webui.internal.db import Base, get_db, get_db_context
 from open_webui.models.groups import Groups
 from open_webui.models.users import User, UserModel, Users, UserResponse
@@ -33,6 +34,11 @@ class Note(Base):
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
+    # Snapshot of the collaborative (Yjs) document, base64 encoded; only valid
+    # while ydoc_updated_at matches updated_at
+    ydoc_state = deferred(Column(Text, nullable=True))
+    ydoc_updated_at = Column(BigInteger, nullable=True)
+
 
 class NoteModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -306,7 +312,11 @@ class NoteTable:
             return self._to_note_model(note, db=db) if note else None
 
     def update_note_by_id(
-        self, id: str, form_data: NoteUpdateForm, db: Optional[Session] = None
+        self,
+        id: str,
+        form_data: NoteUpdateForm,
+        db: Optional[Session] = None,
+        ydoc_state: Optional[bytes] = None,
     ) -> Optional[NoteModel]:
         with get_db_context(db) as db:
             note = db.query(Note).filter(Note.id == id).first()
@@ -329,9 +339,49 @@ class NoteTable:
 
             note.updated_at = int(time.time_ns())
 
+            if ydoc_state is not None:
+                note.ydoc_state = base64.b64encode(ydoc_state).decode("ascii")
+                note.ydoc_updated_at = note.updated_at
+
             db.commit()
             return self._to_note_model(note, db=db) if note else None
 
+    def get_note_ydoc_state_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[bytes]:
+        """
+        The collaborative document snapshot of a note, unless the note was
+        written without one since it was taken.
+        """
+        with get_db_context(db) as db:
+            result = (
+                db.query(Note.ydoc_state, Note.ydoc_updated_at, Note.updated_at)
+                .filter_by(id=id)
+                .first()
+            )
+            if not result or not result[0] or result[1] != result[2]:
+                return None
+            return base64.b64decode(result[0])
+
+    def update_note_ydoc_state_by_id(
+        self, id: str, ydoc_state: bytes, db: Optional[Session] = None
+    ) -> bool:
+        """Store a snapshot matching the note as it is now."""
+        with get_db_context(db) as db:
+            updated = (
+                db.query(Note)
+                .filter_by(id=id)
+                .update(
+                    {
+                        "ydoc_state": base64.b64encode(ydoc_state).decode("ascii"),
+                        "ydoc_updated_at": Note.updated_at,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return updated > 0
+
     def delete_note_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         try:
             with get_db_context(db) as db:
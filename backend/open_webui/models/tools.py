@@ -7,6 +7,7 @@ from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.users import Users, UserResponse
 from open_webui.models.groups import Groups
 from open_webui.models.access_grants import AccessGrantModel, AccessGrants
+from open_webui.utils.plugin_cache import get_content_hash, plugin_cache
 
 from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy import BigInteger, Column, String, Text
@@ -25,6 +26,7 @@ class Tool(Base):
     user_id = Column(String)
     name = Column(Text)
     content = Column(Text)
+    content_hash = Column(Text, nullable=True)
     specs = Column(JSONField)
     meta = Column(JSONField)
     valves = Column(JSONField)
@@ -126,6 +128,7 @@ class ToolsTable:
                 result = Tool(
                     **{
                         **form_data.model_dump(exclude={"access_grants"}),
+                        "content_hash": get_content_hash(form_data.content),
                         "specs": specs,
                         "user_id": user_id,
                         "updated_at": int(time.time()),
@@ -135,6 +138,7 @@ class ToolsTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                plugin_cache.invalidate("tool", result.id)
                 AccessGrants.set_access_grants(
                     "tool", result.id, form_data.access_grants, db=db
                 )
@@ -156,6 +160,12 @@ class ToolsTable:
         except Exception:
             return None
 
+    def get_tool_content_hash_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[str]:
+        with get_db_context(db) as db:
+            return db.query(Tool.content_hash).filter_by(id=id).scalar()
+
     def get_tools(
         self, defer_content: bool = False, db: Optional[Session] = None
     ) -> list[ToolUserModel]:
@@ -290,10 +300,18 @@ class ToolsTable:
         try:
             with get_db_context(db) as db:
                 access_grants = updated.pop("access_grants", None)
+                if "content" in updated:
+                    updated = {
+                        **updated,
+                        "content_hash": get_content_hash(updated["content"]),
+                    }
+
                 db.query(Tool).filter_by(id=id).update(
                     {**updated, "updated_at": int(time.time())}
                 )
                 db.commit()
+                if "content" in updated:
+                    plugin_cache.invalidate("tool", id)
                 if access_grants is not None:
                     AccessGrants.set_access_grants("tool", id, access_grants, db=db)
 
@@ -309,6 +327,7 @@ class ToolsTable:
                 AccessGrants.revoke_all_access("tool", id, db=db)
                 db.query(Tool).filter_by(id=id).delete()
                 db.commit()
+                plugin_cache.invalidate("tool", id)
 
                 return True
         except Exception:
@@ -1,3 +1,5 @@
+import logging
+import threading
 import time
 from typing import Optional
 
@@ -12,6 +14,7 @@ from open_webui.models.groups import Groups, GroupMember
 from open_webui.models.channels import ChannelMember
 
 from open_webui.utils.misc import throttle
+from open_webui.utils.user_cache import user_cache
 from open_webui.utils.validate import validate_profile_image_url
 
 
@@ -24,6 +27,7 @@ from sqlalchemy import (
     Boolean,
     Text,
     Date,
+    bindparam,
     exists,
     select,
     cast,
@@ -33,6 +37,8 @@ from sqlalchemy.dialects.postgresql import JSONB
 
 import datetime
 
+log = logging.getLogger(__name__)
+
 ####################
 # User DB Schema
 ####################
@@ -258,6 +264,10 @@ class UserUpdateForm(BaseModel):
 
 
 class UsersTable:
+    def __init__(self):
+        self._last_active: dict[str, int] = {}
+        self._last_active_lock = threading.Lock()
+
     def insert_new_user(
         self,
         id: str,
@@ -593,6 +603,7 @@ class UsersTable:
                 user.role = role
                 db.commit()
                 db.refresh(user)
+                user_cache.invalidate_user(id)
                 return UserModel.model_validate(user)
         except Exception:
             return None
@@ -609,6 +620,7 @@ class UsersTable:
                     setattr(user, key, value)
                 db.commit()
                 db.refresh(user)
+                user_cache.invalidate_user(id)
                 return UserModel.model_validate(user)
         except Exception:
             return None
@@ -624,25 +636,49 @@ class UsersTable:
                 user.profile_image_url = profile_image_url
                 db.commit()
                 db.refresh(user)
+                user_cache.invalidate_user(id)
                 return UserModel.model_validate(user)
         except Exception:
             return None
 
     @throttle(DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL)
-    def update_last_active_by_id(
-        self, id: str, db: Optional[Session] = None
-    ) -> Optional[UserModel]:
+    def update_last_active_by_id(self, id: str) -> None:
+        """
+        Record activity for a user. Timestamps are buffered and written by
+        flush_last_active, so frequent requests cost no database round trip.
+        """
+        with self._last_active_lock:
+            self._last_active[id] = int(time.time())
+
+    def flush_last_active(self, db: Optional[Session] = None) -> int:
+        """Write buffered last_active_at timestamps in one batched UPDATE."""
+        with self._last_active_lock:
+            pending, self._last_active = self._last_active, {}
+
+        if not pending:
+            return 0
+
+        table = User.__table__
         try:
             with get_db_context(db) as db:
-                user = db.query(User).filter_by(id=id).first()
-                if not user:
-                    return None
-                user.last_active_at = int(time.time())
+                db.execute(
+                    table.update()
+                    .where(table.c.id == bindparam("_id"))
+                    .values(last_active_at=bindparam("_last_active_at")),
+                    [
+                        {"_id": id, "_last_active_at": last_active_at}
+                        for id, last_active_at in pending.items()
+                    ],
+                )
                 db.commit()
-                db.refresh(user)
-                return UserModel.model_validate(user)
-        except Exception:
-            return None
+            return len(pending)
+        except Exception as e:
+            log.warning(f"Failed to update last active timestamps: {e}")
+            # Keep the timestamps for the next flush unless newer ones arrived
+            with self._last_active_lock:
+                for id, last_active_at in pending.items():
+                    self._last_active.setdefault(id, last_active_at)
+            return 0
 
     def update_user_oauth_by_id(
         self, id: str, provider: str, sub: str, db: Optional[Session] = None
@@ -670,6 +706,7 @@ class UsersTable:
                 # Persist updated JSON
                 db.query(User).filter_by(id=id).update({"oauth": oauth})
                 db.commit()
+                user_cache.invalidate_user(id)
 
                 return UserModel.model_validate(user)
 
@@ -702,6 +739,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"scim": scim})
                 db.commit()
+                user_cache.invalidate_user(id)
 
                 return UserModel.model_validate(user)
 
@@ -720,6 +758,7 @@ class UsersTable:
                     setattr(user, key, value)
                 db.commit()
                 db.refresh(user)
+                user_cache.invalidate_user(id)
                 return UserModel.model_validate(user)
         except Exception as e:
             print(e)
@@ -743,6 +782,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"settings": user_settings})
                 db.commit()
+                user_cache.invalidate_user(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -759,9 +799,13 @@ class UsersTable:
             if result:
                 with get_db_context(db) as db:
                     # Delete User
+                    api_key = self.get_user_api_key_by_id(id, db=db)
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
 
+                user_cache.invalidate_user(id)
+                user_cache.invalidate_api_key(api_key)
+
                 return True
             else:
                 return False
@@ -783,8 +827,10 @@ class UsersTable:
     ) -> bool:
         try:
             with get_db_context(db) as db:
+                old_api_key = self.get_user_api_key_by_id(id, db=db)
                 db.query(ApiKey).filter_by(user_id=id).delete()
                 db.commit()
+                user_cache.invalidate_api_key(old_api_key)
 
                 now = int(time.time())
                 new_api_key = ApiKey(
@@ -805,8 +851,10 @@ class UsersTable:
     def delete_user_api_key_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         try:
             with get_db_context(db) as db:
+                api_key = self.get_user_api_key_by_id(id, db=db)
                 db.query(ApiKey).filter_by(user_id=id).delete()
                 db.commit()
+                user_cache.invalidate_api_key(api_key)
                 return True
         except Exception:
             return False
@@ -0,0 +1,472 @@
+import logging
+import math
+import re
+import time
+from collections import Counter
+from typing import Optional
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Index,
+    Integer,
+    JSON,
+    Text,
+    and_,
+    delete,
+    func,
+    insert,
+    update,
+)
+from sqlalchemy.orm import Session
+
+from open_webui.internal.db import Base, get_db_context
+from open_webui.retrieval.vector.utils import process_metadata
+
+log = logging.getLogger(__name__)
+
+# Okapi BM25 parameters, matching the rank_bm25 defaults used by BM25Retriever
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Keep IN (...) clauses well below the SQLite bound parameter limit
+BATCH_SIZE = 500
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+####################
+# BM25 Index DB Schema
+####################
+
+
+class BM25Collection(Base):
+    __tablename__ = "bm25_collection"
+
+    name = Column(Text, primary_key=True)
+    doc_count = Column(BigInteger, nullable=False, default=0)
+    total_length = Column(BigInteger, nullable=False, default=0)
+    total_enriched_length = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(BigInteger)
+
+
+class BM25Document(Base):
+    __tablename__ = "bm25_document"
+
+    collection_name = Column(Text, primary_key=True)
+    id = Column(Text, primary_key=True)
+    text = Column(Text)
+    meta = Column(JSON, nullable=True)
+    file_id = Column(Text, nullable=True)
+    hash = Column(Text, nullable=True)
+    length = Column(Integer, nullable=False, default=0)
+    enriched_length = Column(Integer, nullable=False, default=0)
+    created_at = Column(BigInteger)
+
+    __table_args__ = (
+        Index("bm25_document_collection_file_idx", "collection_name", "file_id"),
+        Index("bm25_document_collection_hash_idx", "collection_name", "hash"),
+    )
+
+
+class BM25Posting(Base):
+    __tablename__ = "bm25_posting"
+
+    collection_name = Column(Text, primary_key=True)
+    term = Column(Text, primary_key=True)
+    document_id = Column(Text, primary_key=True)
+    # Term frequency in the chunk text, and in the chunk text plus metadata
+    # enrichment (see get_enriched_text)
+    tf = Column(Integer, nullable=False, default=0)
+    enriched_tf = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("bm25_posting_collection_document_idx", "collection_name", "document_id"),
+    )
+
+
+####################
+# Text helpers
+####################
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def get_enrichment_text(metadata: dict) -> str:
+    metadata_parts = []
+
+    # Add filename (repeat twice for extra weight in BM25 scoring)
+    if metadata.get("name"):
+        filename = metadata["name"]
+        filename_tokens = filename.replace("_", " ").replace("-", " ").replace(".", " ")
+        metadata_parts.append(
+            f"Filename: {filename} {filename_tokens} {filename_tokens}"
+        )
+
+    # Add title if available
+    if metadata.get("title"):
+        metadata_parts.append(f"Title: {metadata['title']}")
+
+    # Add document section headings if available (from markdown splitter)
+    if metadata.get("headings") and isinstance(metadata["headings"], list):
+        headings = " > ".join(str(h) for h in metadata["headings"])
+        metadata_parts.append(f"Section: {headings}")
+
+    # Add source URL/path if available
+    if metadata.get("source"):
+        metadata_parts.append(f"Source: {metadata['source']}")
+
+    # Add snippet for web search results
+    if metadata.get("snippet"):
+        metadata_parts.append(f"Snippet: {metadata['snippet']}")
+
+    return " ".join(metadata_parts)
+
+
+def get_enriched_text(text: str, metadata: dict) -> str:
+    enrichment = get_enrichment_text(metadata or {})
+    return f"{text} {enrichment}" if enrichment else text
+
+
+def _matches_filter(metadata: dict, filter: dict) -> bool:
+    return all(metadata.get(key) == value for key, value in filter.items())
+
+
+####################
+# BM25 Index
+####################
+
+
+class BM25IndexTable:
+    """
+    Persistent, incrementally maintained BM25 index per vector DB collection.
+
+    Postings and document length statistics live in the database so hybrid
+    search can score a query by reading only the postings of its terms instead
+    of fetching and re-indexing the whole collection on every request.
+    """
+
+    def has_collection(
+        self, collection_name: str, db: Optional[Session] = None
+    ) -> bool:
+        with get_db_context(db) as db:
+            return db.get(BM25Collection, collection_name) is not None
+
+    def upsert_documents(
+        self,
+        collection_name: str,
+        items: list[dict],
+        db: Optional[Session] = None,
+    ) -> None:
+        """Index vector items ({id, text, metadata}) into a collection."""
+        with get_db_context(db) as db:
+            self._ensure_collection(db, collection_name)
+            self._delete_documents(
+                db, collection_name, [str(item["id"]) for item in items]
+            )
+
+            now = int(time.time())
+            documents = []
+            postings = []
+            total_length = 0
+            total_enriched_length = 0
+            for item in items:
+                document_id = str(item["id"])
+                text = item.get("text") or ""
+                metadata = process_metadata(item.get("metadata") or {})
+
+                counts = Counter(tokenize(text))
+                enriched_counts = counts + Counter(
+                    tokenize(get_enrichment_text(metadata))
+                )
+                length = sum(counts.values())
+                enriched_length = sum(enriched_counts.values())
+
+                documents.append(
+                    {
+                        "collection_name": collection_name,
+                        "id": document_id,
+                        "text": text,
+                        "meta": metadata,
+                        "file_id": metadata.get("file_id"),
+                        "hash": metadata.get("hash"),
+                        "length": length,
+                        "enriched_length": enriched_length,
+                        "created_at": now,
+                    }
+                )
+                postings.extend(
+                    {
+                        "collection_name": collection_name,
+                        "term": term,
+                        "document_id": document_id,
+                        "tf": counts.get(term, 0),
+                        "enriched_tf": enriched_tf,
+                    }
+                    for term, enriched_tf in enriched_counts.items()
+                )
+
+                total_length += length
+                total_enriched_length += enriched_length
+
+            if documents:
+                db.execute(insert(BM25Document), documents)
+            for i in range(0, len(postings), BATCH_SIZE):
+                db.execute(insert(BM25Posting), postings[i : i + BATCH_SIZE])
+
+            self._update_collection(
+                db,
+                collection_name,
+                len(documents),
+                total_length,
+                total_enriched_length,
+            )
+            db.commit()
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+        db: Optional[Session] = None,
+    ) -> None:
+        """Mirror of VectorDBBase.delete: remove documents by ID or metadata filter."""
+        if not ids and not filter:
+            return self.delete_collection(collection_name, db=db)
+
+        with get_db_context(db) as db:
+            if db.get(BM25Collection, collection_name) is None:
+                return
+
+            query = db.query(BM25Document.id).filter(
+                BM25Document.collection_name == collection_name
+            )
+            if ids:
+                query = query.filter(BM25Document.id.in_([str(id) for id in ids]))
+
+            if filter:
+                filter = dict(filter)
+                # file_id and hash are the filters used by the routers, and are
+                # stored as indexed columns; anything else is matched on metadata.
+                for key in ("file_id", "hash"):
+                    if key in filter:
+                        query = query.filter(
+                            getattr(BM25Document, key) == filter.pop(key)
+                        )
+
+                if filter:
+                    document_ids = [
+                        id
+                        for id, meta in query.add_columns(BM25Document.meta).all()
+                        if _matches_filter(meta or {}, filter)
+                    ]
+                else:
+                    document_ids = [id for (id,) in query.all()]
+            else:
+                document_ids = [id for (id,) in query.all()]
+
+            self._delete_documents(db, collection_name, document_ids)
+            self._update_collection(db, collection_name)
+            db.commit()
+
+    def delete_collection(
+        self, collection_name: str, db: Optional[Session] = None
+    ) -> None:
+        with get_db_context(db) as db:
+            db.execute(
+                delete(BM25Posting).where(
+                    BM25Posting.collection_name == collection_name
+                )
+            )
+            db.execute(
+                delete(BM25Document).where(
+                    BM25Document.collection_name == collection_name
+                )
+            )
+            db.execute(
+                delete(BM25Collection).where(BM25Collection.name == collection_name)
+            )
+            db.commit()
+
+    def reset(self, db: Optional[Session] = None) -> None:
+        with get_db_context(db) as db:
+            db.execute(delete(BM25Posting))
+            db.execute(delete(BM25Document))
+            db.execute(delete(BM25Collection))
+            db.commit()
+
+    def search(
+        self,
+        collection_name: str,
+        query: str,
+        k: int,
+        enable_enriched_texts: bool = False,
+        db: Optional[Session] = None,
+    ) -> list[tuple[str, str, dict, float]]:
+        """
+        Score the collection against the query with Okapi BM25.
+
+        Returns up to k (id, text, metadata, score) tuples, best first.
+        """
+        terms = list(set(tokenize(query)))
+        if not terms:
+            return []
+
+        with get_db_context(db) as db:
+            collection = db.get(BM25Collection, collection_name)
+            if collection is None or not collection.doc_count:
+                return []
+
+            if enable_enriched_texts:
+                tf_column = BM25Posting.enriched_tf
+                length_column = BM25Document.enriched_length
+                total_length = collection.total_enriched_length
+            else:
+                tf_column = BM25Posting.tf
+                length_column = BM25Document.length
+                total_length = collection.total_length
+
+            doc_count = collection.doc_count
+            avg_length = (total_length / doc_count) or 1.0
+
+            postings = []
+            for i in range(0, len(terms), BATCH_SIZE):
+                postings.extend(
+                    db.query(
+                        BM25Posting.term,
+                        BM25Posting.document_id,
+                        tf_column,
+                        length_column,
+                    )
+                    .join(
+                        BM25Document,
+                        and_(
+                            BM25Document.collection_name == BM25Posting.collection_name,
+                            BM25Document.id == BM25Posting.document_id,
+                        ),
+                    )
+                    .filter(
+                        BM25Posting.collection_name == collection_name,
+                        BM25Posting.term.in_(terms[i : i + BATCH_SIZE]),
+                        tf_column > 0,
+                    )
+                    .all()
+                )
+
+            document_frequencies = Counter(term for term, *_ in postings)
+            idf = {
+                term: math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+                for term, df in document_frequencies.items()
+            }
+
+            scores = {}
+            for term, document_id, tf, length in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * (length or 0) / avg_length)
+                scores[document_id] = scores.get(document_id, 0.0) + idf[term] * (
+                    tf * (BM25_K1 + 1) / (tf + norm)
+                )
+
+            top = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k]
+            if not top:
+                return []
+
+            documents = {
+                document.id: document
+                for document in db.query(BM25Document)
+                .filter(
+                    BM25Document.collection_name == collection_name,
+                    BM25Document.id.in_([id for id, _ in top]),
+                )
+                .all()
+            }
+
+            return [
+                (id, documents[id].text, dict(documents[id].meta or {}), score)
+                for id, score in top
+                if id in documents
+            ]
+
+    def _ensure_collection(self, db: Session, collection_name: str) -> None:
+        # INSERT ... ON CONFLICT DO NOTHING, so concurrent first writers to a
+        # collection don't fail on the primary key
+        if db.bind.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+        db.execute(
+            dialect_insert(BM25Collection)
+            .values(
+                name=collection_name,
+                doc_count=0,
+                total_length=0,
+                total_enriched_length=0,
+                updated_at=int(time.time()),
+            )
+            .on_conflict_do_nothing(index_elements=[BM25Collection.name])
+        )
+
+    def _update_collection(
+        self,
+        db: Session,
+        collection_name: str,
+        doc_count: int = 0,
+        total_length: int = 0,
+        total_enriched_length: int = 0,
+    ) -> None:
+        # Apply the deltas in SQL rather than read-modify-write on the ORM row,
+        # so concurrent writers to the same collection don't lose updates
+        db.execute(
+            update(BM25Collection)
+            .where(BM25Collection.name == collection_name)
+            .values(
+                doc_count=BM25Collection.doc_count + doc_count,
+                total_length=BM25Collection.total_length + total_length,
+                total_enriched_length=BM25Collection.total_enriched_length
+                + total_enriched_length,
+                updated_at=int(time.time()),
+            )
+        )
+
+    def _delete_documents(
+        self, db: Session, collection_name: str, document_ids: list[str]
+    ) -> None:
+        for i in range(0, len(document_ids), BATCH_SIZE):
+            batch = document_ids[i : i + BATCH_SIZE]
+
+            count, length, enriched_length = (
+                db.query(
+                    func.count(BM25Document.id),
+                    func.coalesce(func.sum(BM25Document.length), 0),
+                    func.coalesce(func.sum(BM25Document.enriched_length), 0),
+                )
+                .filter(
+                    BM25Document.collection_name == collection_name,
+                    BM25Document.id.in_(batch),
+                )
+                .one()
+            )
+            if not count:
+                continue
+
+            db.execute(
+                delete(BM25Posting).where(
+                    BM25Posting.collection_name == collection_name,
+                    BM25Posting.document_id.in_(batch),
+                )
+            )
+            db.execute(
+                delete(BM25Document).where(
+                    BM25Document.collection_name == collection_name,
+                    BM25Document.id.in_(batch),
+                )
+            )
+
+            self._update_collection(
+                db, collection_name, -count, -length, -enriched_length
+            )
+
+
+BM25Index = BM25IndexTable()
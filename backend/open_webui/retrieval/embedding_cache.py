@@ -0,0 +1,219 @@
+import hashlib
+import logging
+import time
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import BigInteger, Column, Index, Integer, LargeBinary, Text, delete
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from open_webui.internal.db import Base, get_db_context
+from open_webui.env import RAG_EMBEDDING_CACHE_MAX_ENTRIES
+
+log = logging.getLogger(__name__)
+
+# Keep IN (...) clauses well below the SQLite bound parameter limit
+BATCH_SIZE = 500
+
+
+####################
+# Embedding Cache DB Schema
+####################
+
+
+class EmbeddingCacheEntry(Base):
+    __tablename__ = "embedding_cache"
+
+    # sha256 over (engine, model, prefix, sha256(text))
+    id = Column(Text, primary_key=True)
+    engine = Column(Text, nullable=False)
+    model = Column(Text, nullable=False)
+    dimensions = Column(Integer, nullable=False)
+    # float32 little-endian vector
+    embedding = Column(LargeBinary, nullable=False)
+    last_used_at = Column(BigInteger, nullable=False)
+    created_at = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index("embedding_cache_last_used_at_idx", "last_used_at"),
+        Index("embedding_cache_engine_model_idx", "engine", "model"),
+    )
+
+
+def get_cache_key(engine: str, model: str, prefix: Optional[str], text: str) -> str:
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return hashlib.sha256(
+        "\x00".join([engine or "", model or "", prefix or "", text_hash]).encode(
+            "utf-8"
+        )
+    ).hexdigest()
+
+
+####################
+# Embedding Cache
+####################
+
+
+class EmbeddingCacheTable:
+    """
+    Persistent embedding cache keyed by embedding engine, model, prefix and
+    content hash, so re-indexing unchanged chunks does not call the embedding
+    backend again. Entries are evicted least recently used first once the
+    cache grows past RAG_EMBEDDING_CACHE_MAX_ENTRIES.
+    """
+
+    def __init__(self, max_entries: int = RAG_EMBEDDING_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Approximate row count, refreshed from the database on first write
+        # and after every eviction.
+        self._count: Optional[int] = None
+
+    def get_many(self, ids: list[str], db: Optional[Session] = None) -> dict:
+        """Return {id: embedding} for the cached ids and mark them as used."""
+        unique_ids = list(dict.fromkeys(ids))
+        embeddings = {}
+
+        with get_db_context(db) as db:
+            for i in range(0, len(unique_ids), BATCH_SIZE):
+                batch = unique_ids[i : i + BATCH_SIZE]
+                for id, embedding in db.execute(
+                    select(EmbeddingCacheEntry.id, EmbeddingCacheEntry.embedding).where(
+                        EmbeddingCacheEntry.id.in_(batch)
+                    )
+                ).all():
+                    embeddings[id] = np.frombuffer(embedding, dtype="<f4").tolist()
+
+            if embeddings:
+                now = int(time.time())
+                hit_ids = list(embeddings.keys())
+                for i in range(0, len(hit_ids), BATCH_SIZE):
+                    db.execute(
+                        update(EmbeddingCacheEntry)
+                        .where(EmbeddingCacheEntry.id.in_(hit_ids[i : i + BATCH_SIZE]))
+                        .values(last_used_at=now)
+                    )
+                db.commit()
+
+        hits = sum(1 for id in ids if id in embeddings)
+        self.hits += hits
+        self.misses += len(ids) - hits
+        return embeddings
+
+    def set_many(
+        self,
+        engine: str,
+        model: str,
+        items: dict,
+        db: Optional[Session] = None,
+    ) -> None:
+        """Store {id: embedding} for an engine and model, then evict if needed."""
+        if not items or self.max_entries <= 0:
+            return
+
+        now = int(time.time())
+        with get_db_context(db) as db:
+            # INSERT ... ON CONFLICT DO NOTHING, so entries written concurrently
+            # by another worker are kept instead of failing the whole batch
+            if db.bind.dialect.name == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+            rows = [
+                {
+                    "id": id,
+                    "engine": engine or "",
+                    "model": model or "",
+                    "dimensions": len(embedding),
+                    "embedding": np.asarray(embedding, dtype="<f4").tobytes(),
+                    "last_used_at": now,
+                    "created_at": now,
+                }
+                for id, embedding in items.items()
+                if embedding
+            ]
+            statement = dialect_insert(EmbeddingCacheEntry).on_conflict_do_nothing(
+                index_elements=[EmbeddingCacheEntry.id]
+            )
+            for i in range(0, len(rows), BATCH_SIZE):
+                db.execute(statement, rows[i : i + BATCH_SIZE])
+
+            if self._count is None:
+                db.flush()
+                self._count = db.scalar(select(func.count(EmbeddingCacheEntry.id)))
+            else:
+                # Already cached ids are counted too, the count is recomputed
+                # exactly on eviction
+                self._count += len(rows)
+
+            if self._count > self.max_entries:
+                self._evict(db)
+            db.commit()
+
+    def _evict(self, db: Session) -> None:
+        # Trim to 90% of the limit so eviction runs once per batch of inserts
+        # instead of on every write near the limit.
+        target = int(self.max_entries * 0.9)
+        count = db.scalar(select(func.count(EmbeddingCacheEntry.id)))
+        excess = count - target
+        if excess > 0:
+            oldest = (
+                select(EmbeddingCacheEntry.id)
+                .order_by(EmbeddingCacheEntry.last_used_at.asc())
+                .limit(excess)
+                .scalar_subquery()
+            )
+            db.execute(
+                delete(EmbeddingCacheEntry).where(EmbeddingCacheEntry.id.in_(oldest))
+            )
+            count -= excess
+            log.debug(f"Evicted {excess} embedding cache entries")
+        self._count = count
+
+    def purge(
+        self,
+        engine: Optional[str] = None,
+        model: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> int:
+        """Delete cached embeddings, optionally only those of an engine/model."""
+        with get_db_context(db) as db:
+            statement = delete(EmbeddingCacheEntry)
+            if engine is not None:
+                statement = statement.where(EmbeddingCacheEntry.engine == engine)
+            if model is not None:
+                statement = statement.where(EmbeddingCacheEntry.model == model)
+
+            result = db.execute(statement)
+            db.commit()
+            self._count = None
+            return result.rowcount or 0
+
+    def get_stats(self, db: Optional[Session] = None) -> dict:
+        with get_db_context(db) as db:
+            models = [
+                {"engine": engine, "model": model, "entries": count}
+                for engine, model, count in db.execute(
+                    select(
+                        EmbeddingCacheEntry.engine,
+                        EmbeddingCacheEntry.model,
+                        func.count(EmbeddingCacheEntry.id),
+                    ).group_by(EmbeddingCacheEntry.engine, EmbeddingCacheEntry.model)
+                ).all()
+            ]
+
+        lookups = self.hits + self.misses
+        return {
+            "entries": sum(item["entries"] for item in models),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "models": models,
+        }
+
+
+EmbeddingCache = EmbeddingCacheTable()
@@ -3,10 +3,8 @@ import os
 from typing import Awaitable, Optional, Union
 
 import requests
-import aiohttp
 import asyncio
 import hashlib
-from concurrent.futures import ThreadPoolExecutor
 import time
 import re
 
@@ -32,17 +30,21 @@ from open_webui.models.notes import Notes
 from open_webui.models.access_grants import AccessGrants
 
 from open_webui.retrieval.vector.main import GetResult
+from open_webui.retrieval.bm25 import BM25Index, get_enriched_text
+from open_webui.retrieval.embedding_cache import EmbeddingCache, get_cache_key
 from open_webui.utils.headers import include_user_info_headers
 from open_webui.utils.misc import get_message_list
+from open_webui.utils.session_pool import get_client_session
 
 from open_webui.retrieval.web.utils import get_web_loader
 from open_webui.retrieval.loaders.youtube import YoutubeLoader
 
 
 from open_webui.env import (
-    AIOHTTP_CLIENT_TIMEOUT,
     OFFLINE_MODE,
     ENABLE_FORWARD_USER_INFO_HEADERS,
+    ENABLE_RAG_BM25_INDEX,
+    ENABLE_RAG_EMBEDDING_CACHE,
     AIOHTTP_CLIENT_SESSION_SSL,
 )
 from open_webui.config import (
@@ -89,6 +91,8 @@ def get_content_from_url(request, url: str) -> str:
 
 
 CHUNK_HASH_KEY = "_chunk_hash"
+# Vector DB item ID, used to look up stored vectors when reranking
+CHUNK_ID_KEY = "_chunk_id"
 
 
 def _content_hash(text: str) -> str:
@@ -100,6 +104,7 @@ class VectorSearchRetriever(BaseRetriever):
     collection_name: Any
     embedding_function: Any
     top_k: int
+    query_embedding: Optional[list] = None
 
     def _get_relevant_documents(
         self, query: str, *, run_manager: CallbackManagerForRetrieverRun
@@ -121,8 +126,10 @@ class VectorSearchRetriever(BaseRetriever):
         *,
         run_manager: CallbackManagerForRetrieverRun,
     ) -> list[Document]:
-        embedding = await self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
-        result = VECTOR_DB_CLIENT.search(
+        embedding = self.query_embedding
+        if embedding is None:
+            embedding = await self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
+        result = await VECTOR_DB_CLIENT.asearch(
             collection_name=self.collection_name,
             vectors=[embedding],
             limit=self.top_k,
@@ -136,6 +143,7 @@ class VectorSearchRetriever(BaseRetriever):
         for idx in range(len(ids)):
             metadata = metadatas[idx]
             metadata[CHUNK_HASH_KEY] = _content_hash(documents[idx])
+            metadata[CHUNK_ID_KEY] = ids[idx]
             results.append(
                 Document(
                     metadata=metadata,
@@ -145,6 +153,72 @@ class VectorSearchRetriever(BaseRetriever):
         return results
 
 
+class BM25IndexRetriever(BaseRetriever):
+    collection_name: Any
+    k: int
+    enable_enriched_texts: bool = False
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        return [
+            Document(
+                metadata={
+                    **metadata,
+                    CHUNK_HASH_KEY: _content_hash(text),
+                    CHUNK_ID_KEY: id,
+                },
+                page_content=text,
+            )
+            for id, text, metadata, _ in BM25Index.search(
+                collection_name=self.collection_name,
+                query=query,
+                k=self.k,
+                enable_enriched_texts=self.enable_enriched_texts,
+            )
+        ]
+
+    async def _aget_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> list[Document]:
+        return await asyncio.to_thread(
+            self._get_relevant_documents, query, run_manager=run_manager
+        )
+
+
+def get_bm25_indexed_collection(collection_name: str) -> bool:
+    """
+    Make sure the persistent BM25 index covers the collection.
+
+    Collections created before the index existed are indexed once from the
+    vector DB contents; afterwards the index is kept up to date incrementally
+    on insert and delete.
+    """
+    if BM25Index.has_collection(collection_name):
+        return True
+
+    result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+    if not result or not result.ids or not result.ids[0]:
+        return False
+
+    log.info(f"building bm25 index for collection {collection_name}")
+    BM25Index.upsert_documents(
+        collection_name,
+        [
+            {
+                "id": id,
+                "text": result.documents[0][idx],
+                "metadata": result.metadatas[0][idx],
+            }
+            for idx, id in enumerate(result.ids[0])
+        ],
+    )
+    return True
+
+
 def query_doc(
     collection_name: str, query_embedding: list[float], k: int, user: UserModel = None
 ):
@@ -165,6 +239,26 @@ def query_doc(
         raise e
 
 
+async def aquery_doc(
+    collection_name: str, query_embedding: list[float], k: int, user: UserModel = None
+):
+    try:
+        log.debug(f"aquery_doc:doc {collection_name}")
+        result = await VECTOR_DB_CLIENT.asearch(
+            collection_name=collection_name,
+            vectors=[query_embedding],
+            limit=k,
+        )
+
+        if result:
+            log.info(f"query_doc:result {result.ids} {result.metadatas}")
+
+        return result
+    except Exception as e:
+        log.exception(f"Error querying doc {collection_name} with limit {k}: {e}")
+        raise e
+
+
 def get_doc(collection_name: str, user: UserModel = None):
     try:
         log.debug(f"get_doc:doc {collection_name}")
@@ -180,41 +274,10 @@ def get_doc(collection_name: str, user: UserModel = None):
 
 
 def get_enriched_texts(collection_result: GetResult) -> list[str]:
-    enriched_texts = []
-    for idx, text in enumerate(collection_result.documents[0]):
-        metadata = collection_result.metadatas[0][idx]
-        metadata_parts = [text]
-
-        # Add filename (repeat twice for extra weight in BM25 scoring)
-        if metadata.get("name"):
-            filename = metadata["name"]
-            filename_tokens = (
-                filename.replace("_", " ").replace("-", " ").replace(".", " ")
-            )
-            metadata_parts.append(
-                f"Filename: {filename} {filename_tokens} {filename_tokens}"
-            )
-
-        # Add title if available
-        if metadata.get("title"):
-            metadata_parts.append(f"Title: {metadata['title']}")
-
-        # Add document section headings if available (from markdown splitter)
-        if metadata.get("headings") and isinstance(metadata["headings"], list):
-            headings = " > ".join(str(h) for h in metadata["headings"])
-            metadata_parts.append(f"Section: {headings}")
-
-        # Add source URL/path if available
-        if metadata.get("source"):
-            metadata_parts.append(f"Source: {metadata['source']}")
-
-        # Add snippet for web search results
-        if metadata.get("snippet"):
-            metadata_parts.append(f"Snippet: {metadata['snippet']}")
-
-        enriched_texts.append(" ".join(metadata_parts))
-
-    return enriched_texts
+    return [
+        get_enriched_text(text, collection_result.metadatas[0][idx])
+        for idx, text in enumerate(collection_result.documents[0])
+    ]
 
 
 async def query_doc_with_hybrid_search(
@@ -228,10 +291,18 @@ async def query_doc_with_hybrid_search(
     r: float,
     hybrid_bm25_weight: float,
     enable_enriched_texts: bool = False,
+    use_bm25_index: bool = False,
 ) -> dict:
     try:
+        if use_bm25_index:
+            # Postings are read from the persistent index, no collection_result needed
+            bm25_retriever = BM25IndexRetriever(
+                collection_name=collection_name,
+                k=k,
+                enable_enriched_texts=enable_enriched_texts,
+            )
         # First check if collection_result has the required attributes
-        if (
+        elif (
             not collection_result
             or not hasattr(collection_result, "documents")
             or not hasattr(collection_result, "metadatas")
@@ -240,38 +311,51 @@ async def query_doc_with_hybrid_search(
             return {"documents": [], "metadatas": [], "distances": []}
 
         # Now safely check the documents content after confirming attributes exist
-        if (
+        elif (
             not collection_result.documents
             or len(collection_result.documents) == 0
             or not collection_result.documents[0]
         ):
             log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
             return {"documents": [], "metadatas": [], "distances": []}
+        else:
+            original_texts = collection_result.documents[0]
+            bm25_metadatas = [
+                {
+                    **meta,
+                    CHUNK_HASH_KEY: _content_hash(original_texts[idx]),
+                    CHUNK_ID_KEY: collection_result.ids[0][idx],
+                }
+                for idx, meta in enumerate(collection_result.metadatas[0])
+            ]
 
-        log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
+            bm25_texts = (
+                get_enriched_texts(collection_result)
+                if enable_enriched_texts
+                else original_texts
+            )
 
-        original_texts = collection_result.documents[0]
-        bm25_metadatas = [
-            {**meta, CHUNK_HASH_KEY: _content_hash(original_texts[idx])}
-            for idx, meta in enumerate(collection_result.metadatas[0])
-        ]
+            bm25_retriever = BM25Retriever.from_texts(
+                texts=bm25_texts,
+                metadatas=bm25_metadatas,
+            )
+            bm25_retriever.k = k
 
-        bm25_texts = (
-            get_enriched_texts(collection_result)
-            if enable_enriched_texts
-            else original_texts
-        )
+        log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
 
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=bm25_texts,
-            metadatas=bm25_metadatas,
-        )
-        bm25_retriever.k = k
+        # Embed the query once; it is shared by vector search and, without a
+        # reranking model, by the cosine rerank against stored vectors
+        query_embedding = None
+        if hybrid_bm25_weight < 1 or reranking_function is None:
+            query_embedding = await embedding_function(
+                query, RAG_EMBEDDING_QUERY_PREFIX
+            )
 
         vector_search_retriever = VectorSearchRetriever(
             collection_name=collection_name,
             embedding_function=embedding_function,
             top_k=k,
+            query_embedding=query_embedding,
         )
 
         # Use CHUNK_HASH_KEY for dedup so enriched BM25 texts don't defeat RRF
@@ -299,6 +383,8 @@ async def query_doc_with_hybrid_search(
             top_n=k_reranker,
             reranking_function=reranking_function,
             r_score=r,
+            collection_name=collection_name,
+            query_embedding=query_embedding,
         )
 
         compression_retriever = ContextualCompressionRetriever(
@@ -433,10 +519,10 @@ async def query_collection(
     results = []
     error = False
 
-    def process_query_collection(collection_name, query_embedding):
+    async def process_query_collection(collection_name, query_embedding):
         try:
             if collection_name:
-                result = query_doc(
+                result = await aquery_doc(
                     collection_name=collection_name,
                     k=k,
                     query_embedding=query_embedding,
@@ -456,15 +542,13 @@ async def query_collection(
         f"query_collection: processing {len(queries)} queries across {len(collection_names)} collections"
     )
 
-    with ThreadPoolExecutor() as executor:
-        future_results = []
-        for query_embedding in query_embeddings:
-            for collection_name in collection_names:
-                result = executor.submit(
-                    process_query_collection, collection_name, query_embedding
-                )
-                future_results.append(result)
-        task_results = [future.result() for future in future_results]
+    task_results = await asyncio.gather(
+        *[
+            process_query_collection(collection_name, query_embedding)
+            for query_embedding in query_embeddings
+            for collection_name in collection_names
+        ]
+    )
 
     for result, err in task_results:
         if err is not None:
@@ -494,12 +578,25 @@ async def query_collection_with_hybrid_search(
     # Fetch collection data once per collection sequentially
     # Avoid fetching the same data multiple times later
     collection_results = {}
+    indexed_collections = set()
     for collection_name in collection_names:
+        if ENABLE_RAG_BM25_INDEX:
+            try:
+                if await asyncio.to_thread(
+                    get_bm25_indexed_collection, collection_name
+                ):
+                    indexed_collections.add(collection_name)
+                    continue
+            except Exception as e:
+                log.exception(
+                    f"Failed to use bm25 index for collection {collection_name}: {e}"
+                )
+
         try:
             log.debug(
                 f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
             )
-            collection_results[collection_name] = VECTOR_DB_CLIENT.get(
+            collection_results[collection_name] = await VECTOR_DB_CLIENT.aget(
                 collection_name=collection_name
             )
         except Exception as e:
@@ -514,7 +611,7 @@ async def query_collection_with_hybrid_search(
         try:
             result = await query_doc_with_hybrid_search(
                 collection_name=collection_name,
-                collection_result=collection_results[collection_name],
+                collection_result=collection_results.get(collection_name),
                 query=query,
                 embedding_function=embedding_function,
                 k=k,
@@ -523,6 +620,7 @@ async def query_collection_with_hybrid_search(
                 r=r,
                 hybrid_bm25_weight=hybrid_bm25_weight,
                 enable_enriched_texts=enable_enriched_texts,
+                use_bm25_index=collection_name in indexed_collections,
             )
             return result, None
         except Exception as e:
@@ -534,7 +632,8 @@ async def query_collection_with_hybrid_search(
     tasks = [
         (collection_name, query)
         for collection_name in collection_names
-        if collection_results[collection_name] is not None
+        if collection_name in indexed_collections
+        or collection_results[collection_name] is not None
         for query in queries
     ]
 
@@ -619,21 +718,19 @@ async def agenerate_openai_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        async with aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        ) as session:
-            async with session.post(
-                f"{url}/embeddings",
-                headers=headers,
-                json=form_data,
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as r:
-                r.raise_for_status()
-                data = await r.json()
-                if "data" in data:
-                    return [item["embedding"] for item in data["data"]]
-                else:
-                    raise Exception("Something went wrong :/")
+        session = get_client_session(url)
+        async with session.post(
+            f"{url}/embeddings",
+            headers=headers,
+            json=form_data,
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+        ) as r:
+            r.raise_for_status()
+            data = await r.json()
+            if "data" in data:
+                return [item["embedding"] for item in data["data"]]
+            else:
+                raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating openai batch embeddings: {e}")
         return None
@@ -713,21 +810,19 @@ async def agenerate_azure_openai_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        async with aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        ) as session:
-            async with session.post(
-                full_url,
-                headers=headers,
-                json=form_data,
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as r:
-                r.raise_for_status()
-                data = await r.json()
-                if "data" in data:
-                    return [item["embedding"] for item in data["data"]]
-                else:
-                    raise Exception("Something went wrong :/")
+        session = get_client_session(full_url)
+        async with session.post(
+            full_url,
+            headers=headers,
+            json=form_data,
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+        ) as r:
+            r.raise_for_status()
+            data = await r.json()
+            if "data" in data:
+                return [item["embedding"] for item in data["data"]]
+            else:
+                raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating azure openai batch embeddings: {e}")
         return None
@@ -796,26 +891,85 @@ async def agenerate_ollama_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        async with aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        ) as session:
-            async with session.post(
-                f"{url}/api/embed",
-                headers=headers,
-                json=form_data,
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as r:
-                r.raise_for_status()
-                data = await r.json()
-                if "embeddings" in data:
-                    return data["embeddings"]
-                else:
-                    raise Exception("Something went wrong :/")
+        session = get_client_session(url)
+        async with session.post(
+            f"{url}/api/embed",
+            headers=headers,
+            json=form_data,
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+        ) as r:
+            r.raise_for_status()
+            data = await r.json()
+            if "embeddings" in data:
+                return data["embeddings"]
+            else:
+                raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating ollama batch embeddings: {e}")
         return None
 
 
+def get_cached_embedding_function(
+    embedding_function, embedding_engine: str, embedding_model: str
+):
+    """
+    Wrap an embedding function with the persistent embedding cache, so only
+    texts not embedded before with the same engine, model and prefix are sent
+    to the embedding backend.
+    """
+    if not ENABLE_RAG_EMBEDDING_CACHE:
+        return embedding_function
+
+    async def cached_embedding_function(query, prefix=None, user=None):
+        texts = query if isinstance(query, list) else [query]
+        if not texts or not all(isinstance(text, str) for text in texts):
+            return await embedding_function(query, prefix, user)
+
+        keys = [
+            get_cache_key(embedding_engine, embedding_model, prefix, text)
+            for text in texts
+        ]
+        try:
+            cached = await asyncio.to_thread(EmbeddingCache.get_many, keys)
+        except Exception as e:
+            log.warning(f"Embedding cache lookup failed: {e}")
+            return await embedding_function(query, prefix, user)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            log.debug(
+                f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses"
+            )
+            embeddings = await embedding_function(list(missing.values()), prefix, user)
+            if not embeddings or len(embeddings) != len(missing):
+                # Failed or partial batches: without cache hits this is exactly
+                # what the backend returned, otherwise it cannot be merged.
+                if isinstance(query, list) and not cached:
+                    return embeddings
+                return None
+
+            computed = dict(zip(missing.keys(), embeddings))
+            try:
+                await asyncio.to_thread(
+                    EmbeddingCache.set_many,
+                    embedding_engine,
+                    embedding_model,
+                    computed,
+                )
+            except Exception as e:
+                log.warning(f"Embedding cache update failed: {e}")
+            cached.update(computed)
+
+        results = [cached[key] for key in keys]
+        return results if isinstance(query, list) else results[0]
+
+    return cached_embedding_function
+
+
 def get_embedding_function(
     embedding_engine,
     embedding_model,
@@ -842,7 +996,9 @@ def get_embedding_function(
                 prefix,
             )
 
-        return async_embedding_function
+        return get_cached_embedding_function(
+            async_embedding_function, embedding_engine, embedding_model
+        )
     elif embedding_engine in ["ollama", "openai", "azure_openai"]:
         embedding_function = lambda query, prefix=None, user=None: generate_embeddings(
             engine=embedding_engine,
@@ -910,7 +1066,9 @@ def get_embedding_function(
             else:
                 return await embedding_function(query, prefix, user)
 
-        return async_embedding_function
+        return get_cached_embedding_function(
+            async_embedding_function, embedding_engine, embedding_model
+        )
     else:
         raise ValueError(f"Unknown embedding engine: {embedding_engine}")
 
@@ -1312,15 +1470,36 @@ def get_model_path(model: str, update_model: bool = False):
 import operator
 from typing import Optional, Sequence
 
+import numpy as np
+
 from langchain_core.callbacks import Callbacks
 from langchain_core.documents import BaseDocumentCompressor, Document
 
 
+def cosine_similarities(
+    query_embedding: list[float], embeddings: list[list[float]]
+) -> list[float]:
+    """Cosine similarity of the query against each embedding, in one matrix product."""
+    query = np.asarray(query_embedding, dtype=np.float32)
+    matrix = np.asarray(embeddings, dtype=np.float32)
+
+    # Stored vectors may be zero-padded to a fixed width (e.g. pgvector)
+    if matrix.shape[1] != query.shape[0]:
+        width = max(matrix.shape[1], query.shape[0])
+        query = np.pad(query, (0, width - query.shape[0]))
+        matrix = np.pad(matrix, ((0, 0), (0, width - matrix.shape[1])))
+
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    return (matrix @ query / np.maximum(norms, 1e-12)).tolist()
+
+
 class RerankCompressor(BaseDocumentCompressor):
     embedding_function: Any
     top_n: int
     reranking_function: Any
     r_score: float
+    collection_name: Optional[str] = None
+    query_embedding: Optional[list] = None
 
     class Config:
         extra = "forbid"
@@ -1345,6 +1524,41 @@ class RerankCompressor(BaseDocumentCompressor):
         """
         return []
 
+    async def _get_document_embeddings(
+        self, documents: Sequence[Document]
+    ) -> list[list[float]]:
+        """
+        Use the vectors already stored for the documents, fetched by ID in one
+        call, and only embed the documents that have none.
+        """
+        ids = [doc.metadata.get(CHUNK_ID_KEY) for doc in documents]
+
+        stored = {}
+        if self.collection_name and any(id is not None for id in ids):
+            try:
+                stored = (
+                    await VECTOR_DB_CLIENT.aget_vectors(
+                        collection_name=self.collection_name,
+                        ids=[id for id in ids if id is not None],
+                    )
+                    or {}
+                )
+            except Exception as e:
+                log.debug(f"Failed to get stored vectors, re-embedding: {e}")
+
+        embeddings = [stored.get(id) if id is not None else None for id in ids]
+        missing = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            log.debug(f"RerankCompressor: embedding {len(missing)} documents")
+            missing_embeddings = await self.embedding_function(
+                [documents[idx].page_content for idx in missing],
+                RAG_EMBEDDING_CONTENT_PREFIX,
+            )
+            for idx, embedding in zip(missing, missing_embeddings):
+                embeddings[idx] = embedding
+
+        return embeddings
+
     async def acompress_documents(
         self,
         documents: Sequence[Document],
@@ -1356,16 +1570,16 @@ class RerankCompressor(BaseDocumentCompressor):
         scores = None
         if reranking:
             scores = await asyncio.to_thread(self.reranking_function, query, documents)
+        elif documents:
+            query_embedding = self.query_embedding
+            if query_embedding is None:
+                query_embedding = await self.embedding_function(
+                    query, RAG_EMBEDDING_QUERY_PREFIX
+                )
+            document_embeddings = await self._get_document_embeddings(documents)
+            scores = cosine_similarities(query_embedding, document_embeddings)
         else:
-            from sentence_transformers import util
-
-            query_embedding = await self.embedding_function(
-                query, RAG_EMBEDDING_QUERY_PREFIX
-            )
-            document_embedding = await self.embedding_function(
-                [doc.page_content for doc in documents], RAG_EMBEDDING_CONTENT_PREFIX
-            )
-            scores = util.cos_sim(query_embedding, document_embedding)[0]
+            scores = []
 
         if scores is not None:
             docs_with_scores = list(
@@ -1383,6 +1597,7 @@ class RerankCompressor(BaseDocumentCompressor):
             final_results = []
             for doc, doc_score in result[: self.top_n]:
                 metadata = doc.metadata
+                metadata.pop(CHUNK_ID_KEY, None)
                 metadata["score"] = doc_score
                 doc = Document(
                     page_content=doc.page_content,
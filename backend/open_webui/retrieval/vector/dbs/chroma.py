@@ -1,3 +1,4 @@
+import asyncio
 import chromadb
 import logging
 from chromadb import Settings
@@ -41,6 +42,10 @@ class ChromaClient(VectorDBBase):
                 CHROMA_CLIENT_AUTH_CREDENTIALS
             )
 
+        self.settings_dict = settings_dict
+        self._async_client = None
+        self._async_client_loop = None
+
         if CHROMA_HTTP_HOST != "":
             self.client = chromadb.HttpClient(
                 host=CHROMA_HTTP_HOST,
@@ -59,9 +64,66 @@ class ChromaClient(VectorDBBase):
                 database=CHROMA_DATABASE,
             )
 
+    async def _get_async_client(self):
+        # Only a remote server can be reached asynchronously; the embedded
+        # PersistentClient falls back to the thread-offload defaults.
+        if CHROMA_HTTP_HOST == "":
+            return None
+
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = await chromadb.AsyncHttpClient(
+                host=CHROMA_HTTP_HOST,
+                port=CHROMA_HTTP_PORT,
+                headers=CHROMA_HTTP_HEADERS,
+                ssl=CHROMA_HTTP_SSL,
+                tenant=CHROMA_TENANT,
+                database=CHROMA_DATABASE,
+                settings=Settings(**self.settings_dict),
+            )
+            self._async_client_loop = loop
+        return self._async_client
+
+    def _to_search_result(self, result) -> SearchResult:
+        # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
+        # https://docs.trychroma.com/docs/collections/configure cosine equation
+        distances: list = result["distances"][0]
+        distances = [2 - dist for dist in distances]
+        distances = [[dist / 2 for dist in distances]]
+
+        return SearchResult(
+            **{
+                "ids": result["ids"],
+                "distances": distances,
+                "documents": result["documents"],
+                "metadatas": result["metadatas"],
+            }
+        )
+
+    def _to_get_result(self, result) -> GetResult:
+        return GetResult(
+            **{
+                "ids": [result["ids"]],
+                "documents": [result["documents"]],
+                "metadatas": [result["metadatas"]],
+            }
+        )
+
+    def _get_columns(self, items: list[VectorItem]) -> dict:
+        return {
+            "ids": [item["id"] for item in items],
+            "documents": [item["text"] for item in items],
+            "embeddings": [item["vector"] for item in items],
+            "metadatas": [process_metadata(item["metadata"]) for item in items],
+        }
+
     def has_collection(self, collection_name: str) -> bool:
         # Check if the collection exists based on the collection name.
-        collection_names = self.client.list_collections()
+        # list_collections returns Collection objects on chromadb >= 1.0
+        collection_names = [
+            getattr(collection, "name", collection)
+            for collection in self.client.list_collections()
+        ]
         return collection_name in collection_names
 
     def delete_collection(self, collection_name: str):
@@ -84,21 +146,7 @@ class ChromaClient(VectorDBBase):
                     n_results=limit,
                     where=filter,
                 )
-
-                # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
-                # https://docs.trychroma.com/docs/collections/configure cosine equation
-                distances: list = result["distances"][0]
-                distances = [2 - dist for dist in distances]
-                distances = [[dist / 2 for dist in distances]]
-
-                return SearchResult(
-                    **{
-                        "ids": result["ids"],
-                        "distances": distances,
-                        "documents": result["documents"],
-                        "metadatas": result["metadatas"],
-                    }
-                )
+                return self._to_search_result(result)
             return None
         except Exception as e:
             return None
@@ -114,14 +162,7 @@ class ChromaClient(VectorDBBase):
                     where=filter,
                     limit=limit,
                 )
-
-                return GetResult(
-                    **{
-                        "ids": [result["ids"]],
-                        "documents": [result["documents"]],
-                        "metadatas": [result["metadatas"]],
-                    }
-                )
+                return self._to_get_result(result)
             return None
         except:
             return None
@@ -131,32 +172,33 @@ class ChromaClient(VectorDBBase):
         collection = self.client.get_collection(name=collection_name)
         if collection:
             result = collection.get()
-            return GetResult(
-                **{
-                    "ids": [result["ids"]],
-                    "documents": [result["documents"]],
-                    "metadatas": [result["metadatas"]],
-                }
-            )
+            return self._to_get_result(result)
         return None
 
+    def get_vectors(
+        self, collection_name: str, ids: list[str]
+    ) -> Optional[dict[str, list[float]]]:
+        try:
+            collection = self.client.get_collection(name=collection_name)
+            result = collection.get(ids=ids, include=["embeddings"])
+            return dict(zip(result["ids"], result["embeddings"]))
+        except Exception as e:
+            log.debug(f"Failed to get vectors from {collection_name}: {e}")
+            return None
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         collection = self.client.get_or_create_collection(
             name=collection_name, metadata={"hnsw:space": "cosine"}
         )
 
-        ids = [item["id"] for item in items]
-        documents = [item["text"] for item in items]
-        embeddings = [item["vector"] for item in items]
-        metadatas = [process_metadata(item["metadata"]) for item in items]
-
+        columns = self._get_columns(items)
         for batch in create_batches(
             api=self.client,
-            documents=documents,
-            embeddings=embeddings,
-            ids=ids,
-            metadatas=metadatas,
+            documents=columns["documents"],
+            embeddings=columns["embeddings"],
+            ids=columns["ids"],
+            metadatas=columns["metadatas"],
         ):
             collection.add(*batch)
 
@@ -166,14 +208,7 @@ class ChromaClient(VectorDBBase):
             name=collection_name, metadata={"hnsw:space": "cosine"}
         )
 
-        ids = [item["id"] for item in items]
-        documents = [item["text"] for item in items]
-        embeddings = [item["vector"] for item in items]
-        metadatas = [process_metadata(item["metadata"]) for item in items]
-
-        collection.upsert(
-            ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas
-        )
+        collection.upsert(**self._get_columns(items))
 
     def delete(
         self,
@@ -199,3 +234,118 @@ class ChromaClient(VectorDBBase):
     def reset(self):
         # Resets the database. This will delete all collections and item entries.
         return self.client.reset()
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        client = await self._get_async_client()
+        if client is None:
+            return await super().asearch(collection_name, vectors, filter, limit)
+
+        try:
+            collection = await client.get_collection(name=collection_name)
+            if collection:
+                result = await collection.query(
+                    query_embeddings=vectors,
+                    n_results=limit,
+                    where=filter,
+                )
+                return self._to_search_result(result)
+            return None
+        except Exception as e:
+            return None
+
+    async def aquery(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        client = await self._get_async_client()
+        if client is None:
+            return await super().aquery(collection_name, filter, limit)
+
+        try:
+            collection = await client.get_collection(name=collection_name)
+            if collection:
+                result = await collection.get(where=filter, limit=limit)
+                return self._to_get_result(result)
+            return None
+        except Exception:
+            return None
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        client = await self._get_async_client()
+        if client is None:
+            return await super().aget(collection_name)
+
+        collection = await client.get_collection(name=collection_name)
+        if collection:
+            result = await collection.get()
+            return self._to_get_result(result)
+        return None
+
+    async def aget_vectors(
+        self, collection_name: str, ids: list[str]
+    ) -> Optional[dict[str, list[float]]]:
+        client = await self._get_async_client()
+        if client is None:
+            return await super().aget_vectors(collection_name, ids)
+
+        try:
+            collection = await client.get_collection(name=collection_name)
+            result = await collection.get(ids=ids, include=["embeddings"])
+            return dict(zip(result["ids"], result["embeddings"]))
+        except Exception as e:
+            log.debug(f"Failed to get vectors from {collection_name}: {e}")
+            return None
+
+    async def ainsert(self, collection_name: str, items: list[VectorItem]):
+        client = await self._get_async_client()
+        if client is None:
+            return await super().ainsert(collection_name, items)
+
+        collection = await client.get_or_create_collection(
+            name=collection_name, metadata={"hnsw:space": "cosine"}
+        )
+
+        columns = self._get_columns(items)
+        batch_size = await client.get_max_batch_size()
+        for i in range(0, len(items), batch_size):
+            await collection.add(
+                **{key: value[i : i + batch_size] for key, value in columns.items()}
+            )
+
+    async def aupsert(self, collection_name: str, items: list[VectorItem]):
+        client = await self._get_async_client()
+        if client is None:
+            return await super().aupsert(collection_name, items)
+
+        collection = await client.get_or_create_collection(
+            name=collection_name, metadata={"hnsw:space": "cosine"}
+        )
+        await collection.upsert(**self._get_columns(items))
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        client = await self._get_async_client()
+        if client is None:
+            return await super().adelete(collection_name, ids, filter)
+
+        try:
+            collection = await client.get_collection(name=collection_name)
+            if collection:
+                if ids:
+                    await collection.delete(ids=ids)
+                elif filter:
+                    await collection.delete(where=filter)
+        except Exception as e:
+            # If collection doesn't exist, that's fine - nothing to delete
+            log.debug(
+                f"Attempted to delete from non-existent collection {collection_name}. Ignoring."
+            )
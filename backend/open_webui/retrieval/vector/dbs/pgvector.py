@@ -1,7 +1,9 @@
 from typing import Optional, List, Dict, Any, Tuple
+import asyncio
 import logging
 import json
 from sqlalchemy import (
+    bindparam,
     func,
     literal,
     cast,
@@ -21,7 +23,9 @@ from sqlalchemy.sql import true
 from sqlalchemy.pool import NullPool, QueuePool
 
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
-from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.dialects.postgresql import JSONB, array, insert as pg_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from pgvector.sqlalchemy import Vector, HALFVEC
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.exc import NoSuchTableError
@@ -50,6 +54,7 @@ from open_webui.config import (
     PGVECTOR_IVFFLAT_LISTS,
     PGVECTOR_USE_HALFVEC,
 )
+from open_webui.env import DATABASE_URL
 
 VECTOR_LENGTH = PGVECTOR_INITIALIZE_MAX_VECTOR_LENGTH
 USE_HALFVEC = PGVECTOR_USE_HALFVEC
@@ -61,6 +66,15 @@ Base = declarative_base()
 log = logging.getLogger(__name__)
 
 
+def vector_to_list(value) -> List[float]:
+    # vector columns load as numpy arrays, halfvec columns as HalfVector
+    if hasattr(value, "to_list"):
+        return value.to_list()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return list(value)
+
+
 def pgcrypto_encrypt(val, key):
     return func.pgp_sym_encrypt(val, literal(key))
 
@@ -69,6 +83,33 @@ def pgcrypto_decrypt(col, key, outtype="text"):
     return func.cast(func.pgp_sym_decrypt(col, literal(key)), outtype)
 
 
+PGCRYPTO_INSERT_SQL = """
+    INSERT INTO document_chunk
+    (id, vector, collection_name, text, vmetadata)
+    VALUES (
+        :id, :vector, :collection_name,
+        pgp_sym_encrypt(:text, :key),
+        pgp_sym_encrypt(:metadata_text, :key)
+    )
+    ON CONFLICT (id) DO NOTHING
+"""
+
+PGCRYPTO_UPSERT_SQL = """
+    INSERT INTO document_chunk
+    (id, vector, collection_name, text, vmetadata)
+    VALUES (
+        :id, :vector, :collection_name,
+        pgp_sym_encrypt(:text, :key),
+        pgp_sym_encrypt(:metadata_text, :key)
+    )
+    ON CONFLICT (id) DO UPDATE SET
+      vector = EXCLUDED.vector,
+      collection_name = EXCLUDED.collection_name,
+      text = EXCLUDED.text,
+      vmetadata = EXCLUDED.vmetadata
+"""
+
+
 class DocumentChunk(Base):
     __tablename__ = "document_chunk"
 
@@ -86,6 +127,12 @@ class DocumentChunk(Base):
 
 class PgvectorClient(VectorDBBase):
     def __init__(self) -> None:
+        # The async methods use a separate asyncpg engine on the same database,
+        # created lazily on first use (see _get_async_engine)
+        self.db_url = PGVECTOR_DB_URL or DATABASE_URL
+        self._async_engine: Optional[AsyncEngine] = None
+        self._async_engine_loop = None
+        self._async_engine_disabled = False
 
         # if no pgvector uri, use the existing database connection
         if not PGVECTOR_DB_URL:
@@ -299,16 +346,7 @@ class PgvectorClient(VectorDBBase):
                     # Ensure metadata is converted to its JSON text representation
                     json_metadata = json.dumps(item["metadata"])
                     self.session.execute(
-                        text("""
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO NOTHING
-                        """),
+                        text(PGCRYPTO_INSERT_SQL),
                         {
                             "id": item["id"],
                             "vector": vector,
@@ -350,20 +388,7 @@ class PgvectorClient(VectorDBBase):
                     vector = self.adjust_vector_length(item["vector"])
                     json_metadata = json.dumps(item["metadata"])
                     self.session.execute(
-                        text("""
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO UPDATE SET
-                              vector = EXCLUDED.vector,
-                              collection_name = EXCLUDED.collection_name,
-                              text = EXCLUDED.text,
-                              vmetadata = EXCLUDED.vmetadata
-                        """),
+                        text(PGCRYPTO_UPSERT_SQL),
                         {
                             "id": item["id"],
                             "vector": vector,
@@ -408,6 +433,114 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during upsert: {e}")
             raise
 
+    def _get_result_columns(self) -> list:
+        if PGVECTOR_PGCRYPTO:
+            return [
+                DocumentChunk.id,
+                pgcrypto_decrypt(DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text).label(
+                    "text"
+                ),
+                pgcrypto_decrypt(
+                    DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+                ).label("vmetadata"),
+            ]
+        return [DocumentChunk.id, DocumentChunk.text, DocumentChunk.vmetadata]
+
+    def _get_where_clauses(
+        self, collection_name: str, filter: Optional[Dict[str, Any]] = None
+    ) -> list:
+        where_clauses = [DocumentChunk.collection_name == collection_name]
+
+        # Apply metadata filter if provided
+        if filter:
+            if PGVECTOR_PGCRYPTO:
+                vmetadata = pgcrypto_decrypt(
+                    DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+                )
+            else:
+                vmetadata = DocumentChunk.vmetadata
+
+            for key, value in filter.items():
+                if isinstance(value, dict) and "$in" in value:
+                    # Handle $in operator: {"field": {"$in": [values]}}
+                    where_clauses.append(
+                        vmetadata[key].astext.in_([str(v) for v in value["$in"]])
+                    )
+                else:
+                    # Handle simple equality: {"field": "value"}
+                    where_clauses.append(vmetadata[key].astext == str(value))
+
+        return where_clauses
+
+    def _build_search_statement(
+        self,
+        collection_name: str,
+        vectors: List[List[float]],
+        filter: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = 10,
+    ):
+        def vector_expr(vector):
+            return cast(array(vector), VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
+
+        # Create the values for query vectors
+        qid_col = column("qid", Integer)
+        q_vector_col = column("q_vector", VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
+        query_vectors = (
+            values(qid_col, q_vector_col)
+            .data([(idx, vector_expr(vector)) for idx, vector in enumerate(vectors)])
+            .alias("query_vectors")
+        )
+
+        result_fields = [
+            *self._get_result_columns(),
+            (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)).label(
+                "distance"
+            ),
+        ]
+
+        # Build the lateral subquery for each query vector
+        subq = (
+            select(*result_fields)
+            .where(*self._get_where_clauses(collection_name, filter))
+            .order_by((DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)))
+        )
+        if limit is not None:
+            subq = subq.limit(limit)
+        subq = subq.lateral("result")
+
+        # Build the main query by joining query_vectors and the lateral subquery
+        return (
+            select(
+                query_vectors.c.qid,
+                subq.c.id,
+                subq.c.text,
+                subq.c.vmetadata,
+                subq.c.distance,
+            )
+            .select_from(query_vectors)
+            .join(subq, true())
+            .order_by(query_vectors.c.qid, subq.c.distance)
+        )
+
+    def _to_search_result(self, results, num_queries: int) -> SearchResult:
+        ids = [[] for _ in range(num_queries)]
+        distances = [[] for _ in range(num_queries)]
+        documents = [[] for _ in range(num_queries)]
+        metadatas = [[] for _ in range(num_queries)]
+
+        for row in results:
+            qid = int(row.qid)
+            ids[qid].append(row.id)
+            # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
+            # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
+            distances[qid].append((2.0 - row.distance) / 2.0)
+            documents[qid].append(row.text)
+            metadatas[qid].append(row.vmetadata)
+
+        return SearchResult(
+            ids=ids, distances=distances, documents=documents, metadatas=metadatas
+        )
+
     def search(
         self,
         collection_name: str,
@@ -421,141 +554,33 @@ class PgvectorClient(VectorDBBase):
 
             # Adjust query vectors to VECTOR_LENGTH
             vectors = [self.adjust_vector_length(vector) for vector in vectors]
-            num_queries = len(vectors)
-
-            def vector_expr(vector):
-                return cast(array(vector), VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
-
-            # Create the values for query vectors
-            qid_col = column("qid", Integer)
-            q_vector_col = column("q_vector", VECTOR_TYPE_FACTORY(VECTOR_LENGTH))
-            query_vectors = (
-                values(qid_col, q_vector_col)
-                .data(
-                    [(idx, vector_expr(vector)) for idx, vector in enumerate(vectors)]
-                )
-                .alias("query_vectors")
-            )
-
-            result_fields = [
-                DocumentChunk.id,
-            ]
-            if PGVECTOR_PGCRYPTO:
-                result_fields.append(
-                    pgcrypto_decrypt(
-                        DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
-                    ).label("text")
-                )
-                result_fields.append(
-                    pgcrypto_decrypt(
-                        DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
-                    ).label("vmetadata")
-                )
-            else:
-                result_fields.append(DocumentChunk.text)
-                result_fields.append(DocumentChunk.vmetadata)
-            result_fields.append(
-                (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector)).label(
-                    "distance"
-                )
-            )
-
-            # Build the lateral subquery for each query vector
-            where_clauses = [DocumentChunk.collection_name == collection_name]
-
-            # Apply metadata filter if provided
-            if filter:
-                for key, value in filter.items():
-                    if isinstance(value, dict) and "$in" in value:
-                        # Handle $in operator: {"field": {"$in": [values]}}
-                        in_values = value["$in"]
-                        if PGVECTOR_PGCRYPTO:
-                            where_clauses.append(
-                                pgcrypto_decrypt(
-                                    DocumentChunk.vmetadata,
-                                    PGVECTOR_PGCRYPTO_KEY,
-                                    JSONB,
-                                )[key].astext.in_([str(v) for v in in_values])
-                            )
-                        else:
-                            where_clauses.append(
-                                DocumentChunk.vmetadata[key].astext.in_(
-                                    [str(v) for v in in_values]
-                                )
-                            )
-                    else:
-                        # Handle simple equality: {"field": "value"}
-                        if PGVECTOR_PGCRYPTO:
-                            where_clauses.append(
-                                pgcrypto_decrypt(
-                                    DocumentChunk.vmetadata,
-                                    PGVECTOR_PGCRYPTO_KEY,
-                                    JSONB,
-                                )[key].astext
-                                == str(value)
-                            )
-                        else:
-                            where_clauses.append(
-                                DocumentChunk.vmetadata[key].astext == str(value)
-                            )
-
-            subq = (
-                select(*result_fields)
-                .where(*where_clauses)
-                .order_by(
-                    (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector))
-                )
-            )
-            if limit is not None:
-                subq = subq.limit(limit)
-            subq = subq.lateral("result")
-
-            # Build the main query by joining query_vectors and the lateral subquery
-            stmt = (
-                select(
-                    query_vectors.c.qid,
-                    subq.c.id,
-                    subq.c.text,
-                    subq.c.vmetadata,
-                    subq.c.distance,
-                )
-                .select_from(query_vectors)
-                .join(subq, true())
-                .order_by(query_vectors.c.qid, subq.c.distance)
-            )
+            stmt = self._build_search_statement(collection_name, vectors, filter, limit)
 
             result_proxy = self.session.execute(stmt)
             results = result_proxy.all()
 
-            ids = [[] for _ in range(num_queries)]
-            distances = [[] for _ in range(num_queries)]
-            documents = [[] for _ in range(num_queries)]
-            metadatas = [[] for _ in range(num_queries)]
+            self.session.rollback()  # read-only transaction
+            return self._to_search_result(results, len(vectors))
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during search: {e}")
+            return None
 
-            if not results:
-                return SearchResult(
-                    ids=ids,
-                    distances=distances,
-                    documents=documents,
-                    metadatas=metadatas,
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        try:
+            results = self.session.execute(
+                select(DocumentChunk.id, DocumentChunk.vector).where(
+                    DocumentChunk.collection_name == collection_name,
+                    DocumentChunk.id.in_(ids),
                 )
-
-            for row in results:
-                qid = int(row.qid)
-                ids[qid].append(row.id)
-                # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
-                # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
-                distances[qid].append((2.0 - row.distance) / 2.0)
-                documents[qid].append(row.text)
-                metadatas[qid].append(row.vmetadata)
-
+            ).all()
             self.session.rollback()  # read-only transaction
-            return SearchResult(
-                ids=ids, distances=distances, documents=documents, metadatas=metadatas
-            )
+            return {row.id: vector_to_list(row.vector) for row in results}
         except Exception as e:
             self.session.rollback()
-            log.exception(f"Error during search: {e}")
+            log.exception(f"Error during get_vectors: {e}")
             return None
 
     def query(
@@ -736,3 +761,273 @@ class PgvectorClient(VectorDBBase):
     def delete_collection(self, collection_name: str) -> None:
         self.delete(collection_name)
         log.info(f"Collection '{collection_name}' deleted.")
+
+    ####################
+    # Async interface
+    ####################
+
+    def _get_async_engine(self) -> Optional[AsyncEngine]:
+        """
+        Return an asyncpg engine bound to the running loop, or None to fall back
+        to the thread-offload defaults (asyncpg missing, or another loop).
+        """
+        if self._async_engine_disabled:
+            return None
+
+        loop = asyncio.get_running_loop()
+        if self._async_engine is not None:
+            return self._async_engine if self._async_engine_loop is loop else None
+
+        try:
+            url = make_url(self.db_url)
+            query = dict(url.query)
+            # asyncpg takes ssl instead of libpq's sslmode
+            if "sslmode" in query:
+                query["ssl"] = query.pop("sslmode")
+            url = url.set(drivername="postgresql+asyncpg", query=query)
+
+            if isinstance(PGVECTOR_POOL_SIZE, int):
+                if PGVECTOR_POOL_SIZE > 0:
+                    engine = create_async_engine(
+                        url,
+                        pool_size=PGVECTOR_POOL_SIZE,
+                        max_overflow=PGVECTOR_POOL_MAX_OVERFLOW,
+                        pool_timeout=PGVECTOR_POOL_TIMEOUT,
+                        pool_recycle=PGVECTOR_POOL_RECYCLE,
+                        pool_pre_ping=True,
+                    )
+                else:
+                    engine = create_async_engine(
+                        url, pool_pre_ping=True, poolclass=NullPool
+                    )
+            else:
+                engine = create_async_engine(url, pool_pre_ping=True)
+        except Exception as e:
+            log.warning(
+                f"Async pgvector engine unavailable, using worker threads instead: {e}"
+            )
+            self._async_engine_disabled = True
+            return None
+
+        self._async_engine = engine
+        self._async_engine_loop = loop
+        return engine
+
+    def _get_pgcrypto_params(self, collection_name: str, items: List[VectorItem]):
+        return [
+            {
+                "id": item["id"],
+                "vector": self.adjust_vector_length(item["vector"]),
+                "collection_name": collection_name,
+                "text": item["text"],
+                "metadata_text": json.dumps(item["metadata"]),
+                "key": PGVECTOR_PGCRYPTO_KEY,
+            }
+            for item in items
+        ]
+
+    def _get_rows(self, collection_name: str, items: List[VectorItem]):
+        return [
+            {
+                "id": item["id"],
+                "vector": self.adjust_vector_length(item["vector"]),
+                "collection_name": collection_name,
+                "text": item["text"],
+                "vmetadata": process_metadata(item["metadata"]),
+            }
+            for item in items
+        ]
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: List[List[float]],
+        filter: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        engine = self._get_async_engine()
+        if engine is None:
+            return await super().asearch(collection_name, vectors, filter, limit)
+
+        try:
+            if not vectors:
+                return None
+
+            vectors = [self.adjust_vector_length(vector) for vector in vectors]
+            stmt = self._build_search_statement(collection_name, vectors, filter, limit)
+            async with engine.connect() as conn:
+                results = (await conn.execute(stmt)).all()
+
+            return self._to_search_result(results, len(vectors))
+        except Exception as e:
+            log.exception(f"Error during search: {e}")
+            return None
+
+    async def aquery(
+        self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        engine = self._get_async_engine()
+        if engine is None:
+            return await super().aquery(collection_name, filter, limit)
+
+        try:
+            stmt = select(*self._get_result_columns()).where(
+                *self._get_where_clauses(collection_name, filter)
+            )
+            if limit is not None:
+                stmt = stmt.limit(limit)
+
+            async with engine.connect() as conn:
+                results = (await conn.execute(stmt)).all()
+
+            if not results:
+                return None
+
+            return GetResult(
+                ids=[[result.id for result in results]],
+                documents=[[result.text for result in results]],
+                metadatas=[[result.vmetadata for result in results]],
+            )
+        except Exception as e:
+            log.exception(f"Error during query: {e}")
+            return None
+
+    async def aget(
+        self, collection_name: str, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        engine = self._get_async_engine()
+        if engine is None:
+            return await asyncio.to_thread(self.get, collection_name, limit)
+
+        try:
+            stmt = select(*self._get_result_columns()).where(
+                DocumentChunk.collection_name == collection_name
+            )
+            if limit is not None:
+                stmt = stmt.limit(limit)
+
+            async with engine.connect() as conn:
+                results = (await conn.execute(stmt)).all()
+
+            if not results and not PGVECTOR_PGCRYPTO:
+                return None
+
+            return GetResult(
+                ids=[[row.id for row in results]],
+                documents=[[row.text for row in results]],
+                metadatas=[[row.vmetadata for row in results]],
+            )
+        except Exception as e:
+            log.exception(f"Error during get: {e}")
+            return None
+
+    async def aget_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        engine = self._get_async_engine()
+        if engine is None:
+            return await super().aget_vectors(collection_name, ids)
+
+        try:
+            async with engine.connect() as conn:
+                results = (
+                    await conn.execute(
+                        select(DocumentChunk.id, DocumentChunk.vector).where(
+                            DocumentChunk.collection_name == collection_name,
+                            DocumentChunk.id.in_(ids),
+                        )
+                    )
+                ).all()
+            return {row.id: vector_to_list(row.vector) for row in results}
+        except Exception as e:
+            log.exception(f"Error during get_vectors: {e}")
+            return None
+
+    async def ainsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        engine = self._get_async_engine()
+        if engine is None:
+            return await super().ainsert(collection_name, items)
+
+        try:
+            async with engine.begin() as conn:
+                if PGVECTOR_PGCRYPTO:
+                    await conn.execute(
+                        text(PGCRYPTO_INSERT_SQL).bindparams(
+                            bindparam(
+                                "vector", type_=VECTOR_TYPE_FACTORY(VECTOR_LENGTH)
+                            )
+                        ),
+                        self._get_pgcrypto_params(collection_name, items),
+                    )
+                else:
+                    await conn.execute(
+                        DocumentChunk.__table__.insert(),
+                        self._get_rows(collection_name, items),
+                    )
+            log.info(
+                f"Inserted {len(items)} items into collection '{collection_name}'."
+            )
+        except Exception as e:
+            log.exception(f"Error during insert: {e}")
+            raise
+
+    async def aupsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        engine = self._get_async_engine()
+        if engine is None:
+            return await super().aupsert(collection_name, items)
+
+        try:
+            async with engine.begin() as conn:
+                if PGVECTOR_PGCRYPTO:
+                    await conn.execute(
+                        text(PGCRYPTO_UPSERT_SQL).bindparams(
+                            bindparam(
+                                "vector", type_=VECTOR_TYPE_FACTORY(VECTOR_LENGTH)
+                            )
+                        ),
+                        self._get_pgcrypto_params(collection_name, items),
+                    )
+                else:
+                    stmt = pg_insert(DocumentChunk.__table__)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=[DocumentChunk.__table__.c.id],
+                        set_={
+                            "vector": stmt.excluded.vector,
+                            "collection_name": stmt.excluded.collection_name,
+                            "text": stmt.excluded.text,
+                            "vmetadata": stmt.excluded.vmetadata,
+                        },
+                    )
+                    await conn.execute(stmt, self._get_rows(collection_name, items))
+            log.info(
+                f"Upserted {len(items)} items into collection '{collection_name}'."
+            )
+        except Exception as e:
+            log.exception(f"Error during upsert: {e}")
+            raise
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        engine = self._get_async_engine()
+        if engine is None:
+            return await super().adelete(collection_name, ids, filter)
+
+        try:
+            wheres = self._get_where_clauses(collection_name, filter)
+            if ids:
+                wheres.append(DocumentChunk.id.in_(ids))
+
+            async with engine.begin() as conn:
+                result = await conn.execute(
+                    DocumentChunk.__table__.delete().where(*wheres)
+                )
+            log.info(
+                f"Deleted {result.rowcount} items from collection '{collection_name}'."
+            )
+        except Exception as e:
+            log.exception(f"Error during delete: {e}")
+            raise
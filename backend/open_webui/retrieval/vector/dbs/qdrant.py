@@ -1,8 +1,9 @@
 from typing import Optional
+import asyncio
 import logging
 from urllib.parse import urlparse
 
-from qdrant_client import QdrantClient as Qclient
+from qdrant_client import AsyncQdrantClient, QdrantClient as Qclient
 from qdrant_client.http.models import PointStruct
 from qdrant_client.models import models
 
@@ -39,30 +40,43 @@ class QdrantClient(VectorDBBase):
         self.QDRANT_TIMEOUT = QDRANT_TIMEOUT
         self.QDRANT_HNSW_M = QDRANT_HNSW_M
 
+        self._async_client = None
+        self._async_client_loop = None
+
         if not self.QDRANT_URI:
             self.client = None
             return
 
+        self.client = Qclient(**self._get_client_kwargs())
+
+    def _get_client_kwargs(self) -> dict:
         # Unified handling for either scheme
         parsed = urlparse(self.QDRANT_URI)
         host = parsed.hostname or self.QDRANT_URI
         http_port = parsed.port or 6333  # default REST port
 
         if self.PREFER_GRPC:
-            self.client = Qclient(
-                host=host,
-                port=http_port,
-                grpc_port=self.GRPC_PORT,
-                prefer_grpc=self.PREFER_GRPC,
-                api_key=self.QDRANT_API_KEY,
-                timeout=self.QDRANT_TIMEOUT,
-            )
-        else:
-            self.client = Qclient(
-                url=self.QDRANT_URI,
-                api_key=self.QDRANT_API_KEY,
-                timeout=QDRANT_TIMEOUT,
-            )
+            return {
+                "host": host,
+                "port": http_port,
+                "grpc_port": self.GRPC_PORT,
+                "prefer_grpc": self.PREFER_GRPC,
+                "api_key": self.QDRANT_API_KEY,
+                "timeout": self.QDRANT_TIMEOUT,
+            }
+        return {
+            "url": self.QDRANT_URI,
+            "api_key": self.QDRANT_API_KEY,
+            "timeout": self.QDRANT_TIMEOUT,
+        }
+
+    def _get_async_client(self) -> AsyncQdrantClient:
+        # Async clients (and their gRPC channels) are bound to the event loop
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = AsyncQdrantClient(**self._get_client_kwargs())
+            self._async_client_loop = loop
+        return self._async_client
 
     def _result_to_get_result(self, points) -> GetResult:
         ids = []
@@ -83,39 +97,39 @@ class QdrantClient(VectorDBBase):
             }
         )
 
-    def _create_collection(self, collection_name: str, dimension: int):
-        collection_name_with_prefix = f"{self.collection_prefix}_{collection_name}"
-        self.client.create_collection(
-            collection_name=collection_name_with_prefix,
-            vectors_config=models.VectorParams(
+    def _get_collection_config(self, dimension: int) -> dict:
+        return {
+            "vectors_config": models.VectorParams(
                 size=dimension,
                 distance=models.Distance.COSINE,
                 on_disk=self.QDRANT_ON_DISK,
             ),
-            hnsw_config=models.HnswConfigDiff(
+            "hnsw_config": models.HnswConfigDiff(
                 m=self.QDRANT_HNSW_M,
             ),
-        )
+        }
 
-        # Create payload indexes for efficient filtering
-        self.client.create_payload_index(
-            collection_name=collection_name_with_prefix,
-            field_name="metadata.hash",
-            field_schema=models.KeywordIndexParams(
-                type=models.KeywordIndexType.KEYWORD,
-                is_tenant=False,
-                on_disk=self.QDRANT_ON_DISK,
-            ),
+    def _get_payload_index_schema(self) -> models.KeywordIndexParams:
+        return models.KeywordIndexParams(
+            type=models.KeywordIndexType.KEYWORD,
+            is_tenant=False,
+            on_disk=self.QDRANT_ON_DISK,
         )
-        self.client.create_payload_index(
+
+    def _create_collection(self, collection_name: str, dimension: int):
+        collection_name_with_prefix = f"{self.collection_prefix}_{collection_name}"
+        self.client.create_collection(
             collection_name=collection_name_with_prefix,
-            field_name="metadata.file_id",
-            field_schema=models.KeywordIndexParams(
-                type=models.KeywordIndexType.KEYWORD,
-                is_tenant=False,
-                on_disk=self.QDRANT_ON_DISK,
-            ),
+            **self._get_collection_config(dimension),
         )
+
+        # Create payload indexes for efficient filtering
+        for field_name in ("metadata.hash", "metadata.file_id"):
+            self.client.create_payload_index(
+                collection_name=collection_name_with_prefix,
+                field_name=field_name,
+                field_schema=self._get_payload_index_schema(),
+            )
         log.info(f"collection {collection_name_with_prefix} successfully created!")
 
     def _create_collection_if_not_exists(self, collection_name, dimension):
@@ -124,6 +138,60 @@ class QdrantClient(VectorDBBase):
                 collection_name=collection_name, dimension=dimension
             )
 
+    async def _acreate_collection_if_not_exists(self, collection_name, dimension):
+        client = self._get_async_client()
+        collection_name_with_prefix = f"{self.collection_prefix}_{collection_name}"
+        if await client.collection_exists(collection_name_with_prefix):
+            return
+
+        await client.create_collection(
+            collection_name=collection_name_with_prefix,
+            **self._get_collection_config(dimension),
+        )
+        for field_name in ("metadata.hash", "metadata.file_id"):
+            await client.create_payload_index(
+                collection_name=collection_name_with_prefix,
+                field_name=field_name,
+                field_schema=self._get_payload_index_schema(),
+            )
+        log.info(f"collection {collection_name_with_prefix} successfully created!")
+
+    def _get_metadata_conditions(self, filter: dict) -> list:
+        return [
+            models.FieldCondition(
+                key=f"metadata.{key}", match=models.MatchValue(value=value)
+            )
+            for key, value in filter.items()
+        ]
+
+    def _get_delete_selector(
+        self, ids: Optional[list[str]] = None, filter: Optional[dict] = None
+    ) -> models.FilterSelector:
+        field_conditions = []
+
+        if ids:
+            for id_value in ids:
+                field_conditions.append(
+                    models.FieldCondition(
+                        key="metadata.id",
+                        match=models.MatchValue(value=id_value),
+                    ),
+                ),
+        elif filter:
+            field_conditions = self._get_metadata_conditions(filter)
+
+        return models.FilterSelector(filter=models.Filter(must=field_conditions))
+
+    def _to_search_result(self, points) -> SearchResult:
+        get_result = self._result_to_get_result(points)
+        return SearchResult(
+            ids=get_result.ids,
+            documents=get_result.documents,
+            metadatas=get_result.metadatas,
+            # qdrant distance is [-1, 1], normalize to [0, 1]
+            distances=[[(point.score + 1.0) / 2.0 for point in points]],
+        )
+
     def _create_points(self, items: list[VectorItem]):
         return [
             PointStruct(
@@ -160,14 +228,7 @@ class QdrantClient(VectorDBBase):
             query=vectors[0],
             limit=limit,
         )
-        get_result = self._result_to_get_result(query_response.points)
-        return SearchResult(
-            ids=get_result.ids,
-            documents=get_result.documents,
-            metadatas=get_result.metadatas,
-            # qdrant distance is [-1, 1], normalize to [0, 1]
-            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
-        )
+        return self._to_search_result(query_response.points)
 
     def query(self, collection_name: str, filter: dict, limit: Optional[int] = None):
         # Construct the filter string for querying
@@ -177,17 +238,11 @@ class QdrantClient(VectorDBBase):
             if limit is None:
                 limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
 
-            field_conditions = []
-            for key, value in filter.items():
-                field_conditions.append(
-                    models.FieldCondition(
-                        key=f"metadata.{key}", match=models.MatchValue(value=value)
-                    )
-                )
-
             points = self.client.scroll(
                 collection_name=f"{self.collection_prefix}_{collection_name}",
-                scroll_filter=models.Filter(should=field_conditions),
+                scroll_filter=models.Filter(
+                    should=self._get_metadata_conditions(filter)
+                ),
                 limit=limit,
             )
             return self._result_to_get_result(points[0])
@@ -203,6 +258,17 @@ class QdrantClient(VectorDBBase):
         )
         return self._result_to_get_result(points[0])
 
+    def get_vectors(
+        self, collection_name: str, ids: list[str]
+    ) -> Optional[dict[str, list[float]]]:
+        points = self.client.retrieve(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            ids=ids,
+            with_payload=False,
+            with_vectors=True,
+        )
+        return {str(point.id): point.vector for point in points}
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         self._create_collection_if_not_exists(collection_name, len(items[0]["vector"]))
@@ -222,30 +288,9 @@ class QdrantClient(VectorDBBase):
         filter: Optional[dict] = None,
     ):
         # Delete the items from the collection based on the ids.
-        field_conditions = []
-
-        if ids:
-            for id_value in ids:
-                field_conditions.append(
-                    models.FieldCondition(
-                        key="metadata.id",
-                        match=models.MatchValue(value=id_value),
-                    ),
-                ),
-        elif filter:
-            for key, value in filter.items():
-                field_conditions.append(
-                    models.FieldCondition(
-                        key=f"metadata.{key}",
-                        match=models.MatchValue(value=value),
-                    ),
-                ),
-
         return self.client.delete(
             collection_name=f"{self.collection_prefix}_{collection_name}",
-            points_selector=models.FilterSelector(
-                filter=models.Filter(must=field_conditions)
-            ),
+            points_selector=self._get_delete_selector(ids, filter),
         )
 
     def reset(self):
@@ -254,3 +299,91 @@ class QdrantClient(VectorDBBase):
         for collection_name in collection_names:
             if collection_name.name.startswith(self.collection_prefix):
                 self.client.delete_collection(collection_name=collection_name.name)
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        filter: Optional[dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        if limit is None:
+            limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
+
+        query_response = await self._get_async_client().query_points(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            query=vectors[0],
+            limit=limit,
+        )
+        return self._to_search_result(query_response.points)
+
+    async def aquery(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ):
+        client = self._get_async_client()
+        if not await client.collection_exists(
+            f"{self.collection_prefix}_{collection_name}"
+        ):
+            return None
+        try:
+            if limit is None:
+                limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
+
+            points = await client.scroll(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                scroll_filter=models.Filter(
+                    should=self._get_metadata_conditions(filter)
+                ),
+                limit=limit,
+            )
+            return self._result_to_get_result(points[0])
+        except Exception as e:
+            log.exception(f"Error querying a collection '{collection_name}': {e}")
+            return None
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        points = await self._get_async_client().scroll(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            limit=NO_LIMIT,  # otherwise qdrant would set limit to 10!
+        )
+        return self._result_to_get_result(points[0])
+
+    async def aget_vectors(
+        self, collection_name: str, ids: list[str]
+    ) -> Optional[dict[str, list[float]]]:
+        points = await self._get_async_client().retrieve(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            ids=ids,
+            with_payload=False,
+            with_vectors=True,
+        )
+        return {str(point.id): point.vector for point in points}
+
+    async def ainsert(self, collection_name: str, items: list[VectorItem]):
+        await self._acreate_collection_if_not_exists(
+            collection_name, len(items[0]["vector"])
+        )
+        points = self._create_points(items)
+        await self._get_async_client().upsert(
+            f"{self.collection_prefix}_{collection_name}", points
+        )
+
+    async def aupsert(self, collection_name: str, items: list[VectorItem]):
+        await self._acreate_collection_if_not_exists(
+            collection_name, len(items[0]["vector"])
+        )
+        points = self._create_points(items)
+        return await self._get_async_client().upsert(
+            f"{self.collection_prefix}_{collection_name}", points
+        )
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        return await self._get_async_client().delete(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            points_selector=self._get_delete_selector(ids, filter),
+        )
@@ -1,3 +1,4 @@
+import asyncio
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Union
@@ -29,6 +30,10 @@ class VectorDBBase(ABC):
 
     Any custom vector database integration must inherit from this class and
     implement all abstract methods.
+
+    The async methods (asearch, aquery, aget, ainsert, aupsert, adelete) run the
+    sync implementation in a worker thread by default; backends with a native
+    async client override them.
     """
 
     @abstractmethod
@@ -88,3 +93,73 @@ class VectorDBBase(ABC):
     def reset(self) -> None:
         """Reset the vector database by removing all collections or those matching a condition."""
         pass
+
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        """
+        Return the stored vectors of the given item IDs, keyed by ID.
+
+        Returns None if the backend cannot return stored vectors, in which case
+        callers re-embed the texts instead.
+        """
+        return None
+
+    async def aget_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        """Async variant of get_vectors."""
+        return await asyncio.to_thread(
+            self.get_vectors, collection_name=collection_name, ids=ids
+        )
+
+    async def asearch(
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        """Async variant of search."""
+        return await asyncio.to_thread(
+            self.search,
+            collection_name=collection_name,
+            vectors=vectors,
+            filter=filter,
+            limit=limit,
+        )
+
+    async def aquery(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        """Async variant of query."""
+        return await asyncio.to_thread(
+            self.query, collection_name=collection_name, filter=filter, limit=limit
+        )
+
+    async def aget(self, collection_name: str) -> Optional[GetResult]:
+        """Async variant of get."""
+        return await asyncio.to_thread(self.get, collection_name=collection_name)
+
+    async def ainsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        """Async variant of insert."""
+        return await asyncio.to_thread(
+            self.insert, collection_name=collection_name, items=items
+        )
+
+    async def aupsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        """Async variant of upsert."""
+        return await asyncio.to_thread(
+            self.upsert, collection_name=collection_name, items=items
+        )
+
+    async def adelete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        """Async variant of delete."""
+        return await asyncio.to_thread(
+            self.delete, collection_name=collection_name, ids=ids, filter=filter
+        )
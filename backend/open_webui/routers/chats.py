@@ -6,7 +6,7 @@ import asyncio
 from fastapi.responses import StreamingResponse
 
 
-from open_webui.utils.misc import get_message_list
+from open_webui.utils.misc import get_message_list, iterate_json_array
 from open_webui.socket.main import get_event_emitter
 from open_webui.models.chats import (
     ChatForm,
@@ -22,6 +22,7 @@ from open_webui.models.chats import (
     ChatBody,
     ChatHistoryStats,
     MessageStats,
+    get_chat_import_form,
 )
 from open_webui.models.tags import TagModel, Tags
 from open_webui.models.folders import Folders
@@ -29,7 +30,15 @@ from open_webui.internal.db import get_session
 
 from open_webui.config import ENABLE_ADMIN_CHAT_ACCESS, ENABLE_ADMIN_EXPORT
 from open_webui.constants import ERROR_MESSAGES
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Request,
+    UploadFile,
+    status,
+)
 from pydantic import BaseModel
 
 
@@ -628,6 +637,65 @@ async def import_chats(
         )
 
 
+@router.post("/import/file")
+async def import_chats_from_file(
+    file: UploadFile = File(...),
+    user=Depends(get_verified_user),
+):
+    """
+    Import a chat export file (a JSON array of exported or legacy chats),
+    parsed incrementally and inserted in batches. Nothing is imported if the
+    file turns out to be invalid part way through.
+    """
+
+    def import_file() -> int:
+        forms = (
+            get_chat_import_form(item)
+            for item in iterate_json_array(file.file)
+            if isinstance(item, dict)
+        )
+        return sum(
+            len(batch) for batch in Chats.import_chats_in_batches(user.id, forms)
+        )
+
+    try:
+        return {"imported": await asyncio.to_thread(import_file)}
+    except ValueError as e:
+        log.exception(e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(e),
+        )
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=ERROR_MESSAGES.DEFAULT()
+        )
+
+
+############################
+# BackfillChatMessages
+############################
+
+
+@router.post("/messages/backfill")
+async def backfill_chat_messages(user=Depends(get_admin_user)):
+    """
+    Rebuild the chat_message table from chat histories, streaming progress
+    as NDJSON ({"chats", "messages", "total"} per committed batch).
+    """
+
+    def generate():
+        try:
+            for progress in Chats.backfill_chat_messages():
+                yield json.dumps(progress) + "\n"
+        except Exception as e:
+            log.exception(f"Chat message backfill failed: {e}")
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 ############################
 # GetChats
 ############################
@@ -653,6 +721,14 @@ def search_user_chats(
         )
     ]
 
+    if chat_list:
+        snippets = Chats.get_chat_search_snippets_by_user_id(
+            user.id, [chat.id for chat in chat_list], text, db=db
+        )
+        for chat in chat_list:
+            if chat.id in snippets:
+                chat.snippet = snippets[chat.id]["snippet"]
+
     # Delete tag if no chat is found
     words = text.strip().split(" ")
     if page == 1 and len(words) == 1 and words[0].startswith("tag:"):
@@ -26,6 +26,7 @@ from open_webui.internal.db import get_session, SessionLocal
 
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25Index
 
 from open_webui.models.channels import Channels
 from open_webui.models.users import Users
@@ -427,6 +428,7 @@ async def delete_all_files(
         try:
             Storage.delete_all_files()
             VECTOR_DB_CLIENT.reset()
+            BM25Index.reset()
         except Exception as e:
             log.exception(e)
             log.error("Error deleting files")
@@ -472,6 +474,15 @@ async def get_file_by_id(
         )
 
 
+def get_ingestion_progress(data: dict) -> dict:
+    # Per-stage counters written by streaming ingestion, minus its checkpoint signature
+    return {
+        key: value
+        for key, value in (data.get("ingestion") or {}).items()
+        if key != "signature"
+    }
+
+
 @router.get("/{id}/process/status")
 async def get_file_process_status(
     id: str,
@@ -509,6 +520,8 @@ async def get_file_process_status(
                             event = {"status": status}
                             if status == "failed":
                                 event["error"] = data.get("error")
+                            if data.get("ingestion"):
+                                event["progress"] = get_ingestion_progress(data)
 
                             yield f"data: {json.dumps(event)}\n\n"
                             if status in ("completed", "failed"):
@@ -527,7 +540,15 @@ async def get_file_process_status(
                 media_type="text/event-stream",
             )
         else:
-            return {"status": file.data.get("status", "pending")}
+            data = file.data or {}
+            return {
+                "status": data.get("status", "pending"),
+                **(
+                    {"progress": get_ingestion_progress(data)}
+                    if data.get("ingestion")
+                    else {}
+                ),
+            }
     else:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -839,6 +860,11 @@ async def delete_file_by_id(
                     VECTOR_DB_CLIENT.delete(
                         collection_name=knowledge.id, filter={"hash": file.hash}
                     )
+                BM25Index.delete(collection_name=knowledge.id, filter={"file_id": id})
+                if file.hash:
+                    BM25Index.delete(
+                        collection_name=knowledge.id, filter={"hash": file.hash}
+                    )
             except Exception as e:
                 log.debug(f"KB embedding cleanup for {knowledge.id}: {e}")
 
@@ -847,6 +873,7 @@ async def delete_file_by_id(
             try:
                 Storage.delete_file(file.path)
                 VECTOR_DB_CLIENT.delete(collection_name=f"file-{id}")
+                BM25Index.delete_collection(collection_name=f"file-{id}")
             except Exception as e:
                 log.exception(e)
                 log.error("Error deleting files")
@@ -19,6 +19,7 @@ from open_webui.models.knowledge import (
 )
 from open_webui.models.files import Files, FileModel, FileMetadataResponse
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25Index
 from open_webui.routers.retrieval import (
     process_file,
     ProcessFileForm,
@@ -321,6 +322,7 @@ async def reindex_knowledge_files(
                     VECTOR_DB_CLIENT.delete_collection(
                         collection_name=knowledge_base.id
                     )
+                BM25Index.delete_collection(collection_name=knowledge_base.id)
             except Exception as e:
                 log.error(f"Error deleting collection {knowledge_base.id}: {str(e)}")
                 continue  # Skip, don't raise
@@ -768,6 +770,9 @@ def update_file_from_knowledge_by_id(
     VECTOR_DB_CLIENT.delete(
         collection_name=knowledge.id, filter={"file_id": form_data.file_id}
     )
+    BM25Index.delete(
+        collection_name=knowledge.id, filter={"file_id": form_data.file_id}
+    )
 
     # Add content to the vector database
     try:
@@ -851,6 +856,11 @@ def remove_file_from_knowledge_by_id(
         VECTOR_DB_CLIENT.delete(
             collection_name=knowledge.id, filter={"hash": file.hash}
         )  # Remove by hash as well in case of duplicates
+
+        BM25Index.delete(
+            collection_name=knowledge.id, filter={"file_id": form_data.file_id}
+        )
+        BM25Index.delete(collection_name=knowledge.id, filter={"hash": file.hash})
     except Exception as e:
         log.debug("This was most likely caused by bypassing embedding processing")
         log.debug(e)
@@ -862,6 +872,7 @@ def remove_file_from_knowledge_by_id(
             file_collection = f"file-{form_data.file_id}"
             if VECTOR_DB_CLIENT.has_collection(collection_name=file_collection):
                 VECTOR_DB_CLIENT.delete_collection(collection_name=file_collection)
+            BM25Index.delete_collection(collection_name=file_collection)
         except Exception as e:
             log.debug("This was most likely caused by bypassing embedding processing")
             log.debug(e)
@@ -946,6 +957,7 @@ async def delete_knowledge_by_id(
     # Clean up vector DB
     try:
         VECTOR_DB_CLIENT.delete_collection(collection_name=id)
+        BM25Index.delete_collection(collection_name=id)
     except Exception as e:
         log.debug(e)
         pass
@@ -991,6 +1003,7 @@ async def reset_knowledge_by_id(
 
     try:
         VECTOR_DB_CLIENT.delete_collection(collection_name=id)
+        BM25Index.delete_collection(collection_name=id)
     except Exception as e:
         log.debug(e)
         pass
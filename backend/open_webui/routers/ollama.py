@@ -1,12 +1,7 @@
-# TODO: Implement a more intelligent load balancing mechanism for distributing requests among multiple backend instances.
-# Current implementation uses a simple round-robin approach (random.choice). Consider incorporating algorithms like weighted round-robin,
-# least connections, or least response time for better resource utilization and performance optimization.
-
 import asyncio
 import json
 import logging
 import os
-import random
 import re
 import time
 from datetime import datetime
@@ -52,6 +47,8 @@ from open_webui.utils.misc import (
     cleanup_response,
     stream_wrapper,
 )
+from open_webui.utils.session_pool import get_client_session
+from open_webui.utils.balancer import select_url_idx, upstream_balancer
 from open_webui.utils.payload import (
     apply_model_params_to_body_ollama,
     apply_model_params_to_body_openai,
@@ -84,21 +81,22 @@ log = logging.getLogger(__name__)
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            headers = {
-                "Content-Type": "application/json",
-                **({"Authorization": f"Bearer {key}"} if key else {}),
-            }
+        session = get_client_session(url)
+        headers = {
+            "Content-Type": "application/json",
+            **({"Authorization": f"Bearer {key}"} if key else {}),
+        }
 
-            if ENABLE_FORWARD_USER_INFO_HEADERS and user:
-                headers = include_user_info_headers(headers, user)
+        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+            headers = include_user_info_headers(headers, user)
 
-            async with session.get(
-                url,
-                headers=headers,
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as response:
-                return await response.json()
+        async with session.get(
+            url,
+            headers=headers,
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=timeout,
+        ) as response:
+            return await response.json()
     except Exception as e:
         # Handle connection error here
         log.error(f"Connection error: {e}")
@@ -113,14 +111,18 @@ async def send_post_request(
     content_type: Optional[str] = None,
     user: UserModel = None,
     metadata: Optional[dict] = None,
+    upstream: Optional[str] = None,
 ):
+    """
+    upstream is the base URL the request is balanced across; in-flight
+    requests, latency and failures are tracked for it.
+    """
 
     r = None
     streaming = False
+    tracked = upstream_balancer.acquire(upstream) if upstream else None
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
+        session = get_client_session(url)
 
         headers = {
             "Content-Type": "application/json",
@@ -139,10 +141,13 @@ async def send_post_request(
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
         )
 
+        if tracked:
+            tracked.record(r.status < 500, f"HTTP {r.status}")
+
         if r.ok is False:
             try:
                 res = await r.json()
-                await cleanup_response(r, session)
+                await cleanup_response(r)
                 if "error" in res:
                     raise HTTPException(status_code=r.status, detail=res["error"])
             except HTTPException as e:
@@ -162,8 +167,12 @@ async def send_post_request(
                 response_headers["Content-Type"] = content_type
 
             streaming = True
+            stream = stream_wrapper(r)
+            if tracked:
+                stream = upstream_balancer.wrap_stream(stream, tracked)
+
             return StreamingResponse(
-                stream_wrapper(r, session),
+                stream,
                 status_code=r.status,
                 headers=response_headers,
             )
@@ -174,6 +183,9 @@ async def send_post_request(
     except HTTPException as e:
         raise e  # Re-raise HTTPException to be handled by FastAPI
     except Exception as e:
+        if tracked:
+            tracked.record(False, str(e))
+
         detail = f"Ollama: {e}"
 
         raise HTTPException(
@@ -182,7 +194,9 @@ async def send_post_request(
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
+            if tracked:
+                tracked.release()
 
 
 def get_api_key(idx, url, configs):
@@ -193,6 +207,15 @@ def get_api_key(idx, url, configs):
     )  # Legacy support
 
 
+def select_ollama_url_idx(request: Request, url_idxs: list[int]) -> int:
+    # Balance across the connections serving the model
+    return select_url_idx(
+        url_idxs,
+        request.app.state.config.OLLAMA_BASE_URLS,
+        request.app.state.config.OLLAMA_API_CONFIGS,
+    )
+
+
 ##########################################
 #
 # API routes
@@ -220,42 +243,40 @@ async def verify_connection(
     url = form_data.url
     key = form_data.key
 
-    async with aiohttp.ClientSession(
-        trust_env=True,
-        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
-    ) as session:
-        try:
-            headers = {
-                **({"Authorization": f"Bearer {key}"} if key else {}),
-            }
+    session = get_client_session(url)
+    try:
+        headers = {
+            **({"Authorization": f"Bearer {key}"} if key else {}),
+        }
 
-            if ENABLE_FORWARD_USER_INFO_HEADERS and user:
-                headers = include_user_info_headers(headers, user)
+        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+            headers = include_user_info_headers(headers, user)
 
-            async with session.get(
-                f"{url}/api/version",
-                headers=headers,
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as r:
-                if r.status != 200:
-                    detail = f"HTTP Error: {r.status}"
-                    res = await r.json()
+        async with session.get(
+            f"{url}/api/version",
+            headers=headers,
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
+        ) as r:
+            if r.status != 200:
+                detail = f"HTTP Error: {r.status}"
+                res = await r.json()
 
-                    if "error" in res:
-                        detail = f"External Error: {res['error']}"
-                    raise Exception(detail)
+                if "error" in res:
+                    detail = f"External Error: {res['error']}"
+                raise Exception(detail)
 
-                data = await r.json()
-                return data
-        except aiohttp.ClientError as e:
-            log.exception(f"Client error: {str(e)}")
-            raise HTTPException(
-                status_code=500, detail="Open WebUI: Server Connection Error"
-            )
-        except Exception as e:
-            log.exception(f"Unexpected error: {e}")
-            error_detail = f"Unexpected error: {str(e)}"
-            raise HTTPException(status_code=500, detail=error_detail)
+            data = await r.json()
+            return data
+    except aiohttp.ClientError as e:
+        log.exception(f"Client error: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail="Open WebUI: Server Connection Error"
+        )
+    except Exception as e:
+        log.exception(f"Unexpected error: {e}")
+        error_detail = f"Unexpected error: {str(e)}"
+        raise HTTPException(status_code=500, detail=error_detail)
 
 
 @router.get("/config")
@@ -961,7 +982,7 @@ async def show_model_info(
             detail=ERROR_MESSAGES.MODEL_NOT_FOUND(model),
         )
 
-    url_idx = random.choice(models[model]["urls"])
+    url_idx = select_ollama_url_idx(request, models[model]["urls"])
 
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     key = get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS)
@@ -1034,7 +1055,7 @@ async def embed(
             models = request.app.state.OLLAMA_MODELS
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = select_ollama_url_idx(request, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1052,6 +1073,7 @@ async def embed(
     if prefix_id:
         form_data.model = form_data.model.replace(f"{prefix_id}.", "")
 
+    tracked = upstream_balancer.acquire(url)
     try:
         headers = {
             "Content-Type": "application/json",
@@ -1067,11 +1089,13 @@ async def embed(
             headers=headers,
             data=form_data.model_dump_json(exclude_none=True).encode(),
         )
+        tracked.record(r.status_code < 500, f"HTTP {r.status_code}")
         r.raise_for_status()
 
         data = r.json()
         return data
     except Exception as e:
+        tracked.record(False, str(e))
         log.exception(e)
 
         detail = None
@@ -1087,6 +1111,8 @@ async def embed(
             status_code=r.status_code if r else 500,
             detail=detail if detail else "Open WebUI: Server Connection Error",
         )
+    finally:
+        tracked.release()
 
 
 class GenerateEmbeddingsForm(BaseModel):
@@ -1119,7 +1145,7 @@ async def embeddings(
             models = request.app.state.OLLAMA_MODELS
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = select_ollama_url_idx(request, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1137,6 +1163,7 @@ async def embeddings(
     if prefix_id:
         form_data.model = form_data.model.replace(f"{prefix_id}.", "")
 
+    tracked = upstream_balancer.acquire(url)
     try:
         headers = {
             "Content-Type": "application/json",
@@ -1152,11 +1179,13 @@ async def embeddings(
             headers=headers,
             data=form_data.model_dump_json(exclude_none=True).encode(),
         )
+        tracked.record(r.status_code < 500, f"HTTP {r.status_code}")
         r.raise_for_status()
 
         data = r.json()
         return data
     except Exception as e:
+        tracked.record(False, str(e))
         log.exception(e)
 
         detail = None
@@ -1172,6 +1201,8 @@ async def embeddings(
             status_code=r.status_code if r else 500,
             detail=detail if detail else "Open WebUI: Server Connection Error",
         )
+    finally:
+        tracked.release()
 
 
 class GenerateCompletionForm(BaseModel):
@@ -1206,7 +1237,7 @@ async def generate_completion(
 
         model = form_data.model
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = select_ollama_url_idx(request, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1228,6 +1259,7 @@ async def generate_completion(
         payload=form_data.model_dump_json(exclude_none=True).encode(),
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
+        upstream=url,
     )
 
 
@@ -1273,7 +1305,7 @@ async def get_ollama_url(request: Request, model: str, url_idx: Optional[int] =
                 status_code=400,
                 detail=ERROR_MESSAGES.MODEL_NOT_FOUND(model),
             )
-        url_idx = random.choice(models[model].get("urls", []))
+        url_idx = select_ollama_url_idx(request, models[model].get("urls", []))
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     return url, url_idx
 
@@ -1379,6 +1411,7 @@ async def generate_chat_completion(
         content_type="application/x-ndjson",
         user=user,
         metadata=metadata,
+        upstream=url,
     )
 
 
@@ -1490,6 +1523,7 @@ async def generate_openai_completion(
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
         metadata=metadata,
+        upstream=url,
     )
 
 
@@ -1577,6 +1611,7 @@ async def generate_openai_chat_completion(
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
         metadata=metadata,
+        upstream=url,
     )
 
 
@@ -38,12 +38,15 @@ from open_webui.env import (
     ENABLE_FORWARD_USER_INFO_HEADERS,
     FORWARD_SESSION_INFO_HEADER_CHAT_ID,
     BYPASS_MODEL_ACCESS_CONTROL,
+    ENABLE_OPENAI_API_BALANCING,
 )
 from open_webui.models.users import UserModel
 
 from open_webui.constants import ERROR_MESSAGES
 
 
+from open_webui.utils.session_pool import get_client_session
+from open_webui.utils.balancer import select_url_idx, upstream_balancer
 from open_webui.utils.payload import (
     apply_model_params_to_body_openai,
     apply_system_prompt_to_body,
@@ -72,20 +75,21 @@ log = logging.getLogger(__name__)
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            headers = {
-                **({"Authorization": f"Bearer {key}"} if key else {}),
-            }
+        session = get_client_session(url)
+        headers = {
+            **({"Authorization": f"Bearer {key}"} if key else {}),
+        }
 
-            if ENABLE_FORWARD_USER_INFO_HEADERS and user:
-                headers = include_user_info_headers(headers, user)
+        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+            headers = include_user_info_headers(headers, user)
 
-            async with session.get(
-                url,
-                headers=headers,
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as response:
-                return await response.json()
+        async with session.get(
+            url,
+            headers=headers,
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=timeout,
+        ) as response:
+            return await response.json()
     except Exception as e:
         # Handle connection error here
         log.error(f"Connection error: {e}")
@@ -119,6 +123,15 @@ def openai_reasoning_model_handler(payload):
     return payload
 
 
+def select_openai_url_idx(request: Request, model: dict) -> int:
+    # Balance across the connections serving the model
+    return select_url_idx(
+        model.get("urlIdxs", [model["urlIdx"]]),
+        request.app.state.config.OPENAI_API_BASE_URLS,
+        request.app.state.config.OPENAI_API_CONFIGS,
+    )
+
+
 async def get_headers_and_cookies(
     request: Request,
     url,
@@ -542,7 +555,17 @@ async def get_all_models(request: Request, user: UserModel) -> dict[str, list]:
                             "openai": model,
                             "connection_type": model.get("connection_type", "external"),
                             "urlIdx": idx,
+                            "urlIdxs": [idx],
                         }
+                    elif (
+                        model_id
+                        and ENABLE_OPENAI_API_BALANCING
+                        and idx not in models[model_id]["urlIdxs"]
+                    ):
+                        # Served by several connections, balanced per request.
+                        # Otherwise the first connection serving it wins, they
+                        # may be unrelated providers or accounts.
+                        models[model_id]["urlIdxs"].append(idx)
 
         return models
 
@@ -577,71 +600,71 @@ async def get_models(
         )
 
         r = None
-        async with aiohttp.ClientSession(
-            trust_env=True,
-            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
-        ) as session:
-            try:
-                headers, cookies = await get_headers_and_cookies(
-                    request, url, key, api_config, user=user
-                )
+        session = get_client_session(url)
+        try:
+            headers, cookies = await get_headers_and_cookies(
+                request, url, key, api_config, user=user
+            )
 
-                if api_config.get("azure", False):
-                    models = {
-                        "data": api_config.get("model_ids", []) or [],
-                        "object": "list",
-                    }
-                elif is_anthropic_url(url):
-                    models = await get_anthropic_models(url, key, user=user)
-                    if models is None:
-                        raise Exception("Failed to connect to Anthropic API")
-                else:
-                    async with session.get(
-                        f"{url}/models",
-                        headers=headers,
-                        cookies=cookies,
-                        ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                    ) as r:
-                        if r.status != 200:
-                            error_detail = f"HTTP Error: {r.status}"
-                            try:
-                                res = await r.json()
-                                if "error" in res:
-                                    error_detail = f"External Error: {res['error']}"
-                            except Exception:
-                                pass
-                            raise Exception(error_detail)
-
-                        response_data = await r.json()
-
-                        if "api.openai.com" in url:
-                            response_data["data"] = [
-                                model
-                                for model in response_data.get("data", [])
-                                if not any(
-                                    name in model["id"]
-                                    for name in [
-                                        "babbage",
-                                        "dall-e",
-                                        "davinci",
-                                        "embedding",
-                                        "tts",
-                                        "whisper",
-                                    ]
-                                )
-                            ]
-
-                        models = response_data
-            except aiohttp.ClientError as e:
-                # ClientError covers all aiohttp requests issues
-                log.exception(f"Client error: {str(e)}")
-                raise HTTPException(
-                    status_code=500, detail="Open WebUI: Server Connection Error"
-                )
-            except Exception as e:
-                log.exception(f"Unexpected error: {e}")
-                error_detail = f"Unexpected error: {str(e)}"
-                raise HTTPException(status_code=500, detail=error_detail)
+            if api_config.get("azure", False):
+                models = {
+                    "data": api_config.get("model_ids", []) or [],
+                    "object": "list",
+                }
+            elif is_anthropic_url(url):
+                models = await get_anthropic_models(url, key, user=user)
+                if models is None:
+                    raise Exception("Failed to connect to Anthropic API")
+            else:
+                async with session.get(
+                    f"{url}/models",
+                    headers=headers,
+                    cookies=cookies,
+                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                    timeout=aiohttp.ClientTimeout(
+                        total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST
+                    ),
+                ) as r:
+                    if r.status != 200:
+                        error_detail = f"HTTP Error: {r.status}"
+                        try:
+                            res = await r.json()
+                            if "error" in res:
+                                error_detail = f"External Error: {res['error']}"
+                        except Exception:
+                            pass
+                        raise Exception(error_detail)
+
+                    response_data = await r.json()
+
+                    if "api.openai.com" in url:
+                        response_data["data"] = [
+                            model
+                            for model in response_data.get("data", [])
+                            if not any(
+                                name in model["id"]
+                                for name in [
+                                    "babbage",
+                                    "dall-e",
+                                    "davinci",
+                                    "embedding",
+                                    "tts",
+                                    "whisper",
+                                ]
+                            )
+                        ]
+
+                    models = response_data
+        except aiohttp.ClientError as e:
+            # ClientError covers all aiohttp requests issues
+            log.exception(f"Client error: {str(e)}")
+            raise HTTPException(
+                status_code=500, detail="Open WebUI: Server Connection Error"
+            )
+        except Exception as e:
+            log.exception(f"Unexpected error: {e}")
+            error_detail = f"Unexpected error: {str(e)}"
+            raise HTTPException(status_code=500, detail=error_detail)
 
     if user.role == "user" and not BYPASS_MODEL_ACCESS_CONTROL:
         models["data"] = await get_filtered_models(models, user)
@@ -667,88 +690,83 @@ async def verify_connection(
 
     api_config = form_data.config or {}
 
-    async with aiohttp.ClientSession(
-        trust_env=True,
-        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
-    ) as session:
-        try:
-            headers, cookies = await get_headers_and_cookies(
-                request, url, key, api_config, user=user
-            )
-
-            if api_config.get("azure", False):
-                # Only set api-key header if not using Azure Entra ID authentication
-                auth_type = api_config.get("auth_type", "bearer")
-                if auth_type not in ("azure_ad", "microsoft_entra_id"):
-                    headers["api-key"] = key
-
-                api_version = api_config.get("api_version", "") or "2023-03-15-preview"
-                async with session.get(
-                    url=f"{url}/openai/models?api-version={api_version}",
-                    headers=headers,
-                    cookies=cookies,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    try:
-                        response_data = await r.json()
-                    except Exception:
-                        response_data = await r.text()
+    session = get_client_session(url)
+    try:
+        headers, cookies = await get_headers_and_cookies(
+            request, url, key, api_config, user=user
+        )
 
-                    if r.status != 200:
-                        if isinstance(response_data, (dict, list)):
-                            return JSONResponse(
-                                status_code=r.status, content=response_data
-                            )
-                        else:
-                            return PlainTextResponse(
-                                status_code=r.status, content=response_data
-                            )
+        if api_config.get("azure", False):
+            # Only set api-key header if not using Azure Entra ID authentication
+            auth_type = api_config.get("auth_type", "bearer")
+            if auth_type not in ("azure_ad", "microsoft_entra_id"):
+                headers["api-key"] = key
 
-                    return response_data
-            elif is_anthropic_url(url):
-                result = await get_anthropic_models(url, key)
-                if result is None:
-                    raise HTTPException(
-                        status_code=500, detail="Failed to connect to Anthropic API"
-                    )
-                if "error" in result:
-                    raise HTTPException(status_code=500, detail=result["error"])
-                return result
-            else:
-                async with session.get(
-                    f"{url}/models",
-                    headers=headers,
-                    cookies=cookies,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    try:
-                        response_data = await r.json()
-                    except Exception:
-                        response_data = await r.text()
+            api_version = api_config.get("api_version", "") or "2023-03-15-preview"
+            async with session.get(
+                url=f"{url}/openai/models?api-version={api_version}",
+                headers=headers,
+                cookies=cookies,
+                ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
+            ) as r:
+                try:
+                    response_data = await r.json()
+                except Exception:
+                    response_data = await r.text()
+
+                if r.status != 200:
+                    if isinstance(response_data, (dict, list)):
+                        return JSONResponse(status_code=r.status, content=response_data)
+                    else:
+                        return PlainTextResponse(
+                            status_code=r.status, content=response_data
+                        )
+
+                return response_data
+        elif is_anthropic_url(url):
+            result = await get_anthropic_models(url, key)
+            if result is None:
+                raise HTTPException(
+                    status_code=500, detail="Failed to connect to Anthropic API"
+                )
+            if "error" in result:
+                raise HTTPException(status_code=500, detail=result["error"])
+            return result
+        else:
+            async with session.get(
+                f"{url}/models",
+                headers=headers,
+                cookies=cookies,
+                ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST),
+            ) as r:
+                try:
+                    response_data = await r.json()
+                except Exception:
+                    response_data = await r.text()
 
-                    if r.status != 200:
-                        if isinstance(response_data, (dict, list)):
-                            return JSONResponse(
-                                status_code=r.status, content=response_data
-                            )
-                        else:
-                            return PlainTextResponse(
-                                status_code=r.status, content=response_data
-                            )
+                if r.status != 200:
+                    if isinstance(response_data, (dict, list)):
+                        return JSONResponse(status_code=r.status, content=response_data)
+                    else:
+                        return PlainTextResponse(
+                            status_code=r.status, content=response_data
+                        )
 
-                    return response_data
+                return response_data
 
-        except aiohttp.ClientError as e:
-            # ClientError covers all aiohttp requests issues
-            log.exception(f"Client error: {str(e)}")
-            raise HTTPException(
-                status_code=500, detail="Open WebUI: Server Connection Error"
-            )
-        except Exception as e:
-            log.exception(f"Unexpected error: {e}")
-            raise HTTPException(
-                status_code=500, detail="Open WebUI: Server Connection Error"
-            )
+    except aiohttp.ClientError as e:
+        # ClientError covers all aiohttp requests issues
+        log.exception(f"Client error: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail="Open WebUI: Server Connection Error"
+        )
+    except Exception as e:
+        log.exception(f"Unexpected error: {e}")
+        raise HTTPException(
+            status_code=500, detail="Open WebUI: Server Connection Error"
+        )
 
 
 def get_azure_allowed_params(api_version: str) -> set[str]:
@@ -1010,7 +1028,7 @@ async def generate_chat_completion(
     model = models.get(model_id)
 
     if model:
-        idx = model["urlIdx"]
+        idx = select_openai_url_idx(request, model)
     else:
         raise HTTPException(
             status_code=404,
@@ -1092,14 +1110,12 @@ async def generate_chat_completion(
     payload = json.dumps(payload)
 
     r = None
-    session = None
     streaming = False
     response = None
+    tracked = upstream_balancer.acquire(url)
 
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
+        session = get_client_session(request_url)
 
         r = await session.request(
             method="POST",
@@ -1109,12 +1125,16 @@ async def generate_chat_completion(
             cookies=cookies,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
         )
+        tracked.record(r.status < 500, f"HTTP {r.status}")
 
         # Check if response is SSE
         if "text/event-stream" in r.headers.get("Content-Type", ""):
             streaming = True
             return StreamingResponse(
-                stream_wrapper(r, session, stream_chunks_handler),
+                upstream_balancer.wrap_stream(
+                    stream_wrapper(r, content_handler=stream_chunks_handler),
+                    tracked,
+                ),
                 status_code=r.status,
                 headers=dict(r.headers),
             )
@@ -1137,6 +1157,7 @@ async def generate_chat_completion(
 
             return response
     except Exception as e:
+        tracked.record(False, str(e))
         log.exception(e)
 
         raise HTTPException(
@@ -1145,7 +1166,8 @@ async def generate_chat_completion(
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
+            tracked.release()
 
 
 async def embeddings(request: Request, form_data: dict, user):
@@ -1171,7 +1193,7 @@ async def embeddings(request: Request, form_data: dict, user):
         await get_all_models(request, user=user)
         models = request.app.state.OPENAI_MODELS
     if model_id in models:
-        idx = models[model_id]["urlIdx"]
+        idx = select_openai_url_idx(request, models[model_id])
 
     url = request.app.state.config.OPENAI_API_BASE_URLS[idx]
     key = request.app.state.config.OPENAI_API_KEYS[idx]
@@ -1181,17 +1203,14 @@ async def embeddings(request: Request, form_data: dict, user):
     )
 
     r = None
-    session = None
     streaming = False
 
     headers, cookies = await get_headers_and_cookies(
         request, url, key, api_config, user=user
     )
+    tracked = upstream_balancer.acquire(url)
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True,
-            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
-        )
+        session = get_client_session(url)
         r = await session.request(
             method="POST",
             url=f"{url}/embeddings",
@@ -1199,11 +1218,12 @@ async def embeddings(request: Request, form_data: dict, user):
             headers=headers,
             cookies=cookies,
         )
+        tracked.record(r.status < 500, f"HTTP {r.status}")
 
         if "text/event-stream" in r.headers.get("Content-Type", ""):
             streaming = True
             return StreamingResponse(
-                stream_wrapper(r, session),
+                upstream_balancer.wrap_stream(stream_wrapper(r), tracked),
                 status_code=r.status,
                 headers=dict(r.headers),
             )
@@ -1223,6 +1243,7 @@ async def embeddings(request: Request, form_data: dict, user):
 
             return response_data
     except Exception as e:
+        tracked.record(False, str(e))
         log.exception(e)
         raise HTTPException(
             status_code=r.status if r else 500,
@@ -1230,7 +1251,8 @@ async def embeddings(request: Request, form_data: dict, user):
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
+            tracked.release()
 
 
 class ResponsesForm(BaseModel):
@@ -1274,7 +1296,7 @@ async def responses(
             await get_all_models(request, user=user)
             models = request.app.state.OPENAI_MODELS
         if model_id in models:
-            idx = models[model_id]["urlIdx"]
+            idx = select_openai_url_idx(request, models[model_id])
 
     url = request.app.state.config.OPENAI_API_BASE_URLS[idx]
     key = request.app.state.config.OPENAI_API_KEYS[idx]
@@ -1284,8 +1306,8 @@ async def responses(
     )
 
     r = None
-    session = None
     streaming = False
+    tracked = upstream_balancer.acquire(url)
 
     try:
         headers, cookies = await get_headers_and_cookies(
@@ -1308,10 +1330,7 @@ async def responses(
         else:
             request_url = f"{url}/responses"
 
-        session = aiohttp.ClientSession(
-            trust_env=True,
-            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
-        )
+        session = get_client_session(request_url)
         r = await session.request(
             method="POST",
             url=request_url,
@@ -1320,12 +1339,13 @@ async def responses(
             cookies=cookies,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
         )
+        tracked.record(r.status < 500, f"HTTP {r.status}")
 
         # Check if response is SSE
         if "text/event-stream" in r.headers.get("Content-Type", ""):
             streaming = True
             return StreamingResponse(
-                stream_wrapper(r, session),
+                upstream_balancer.wrap_stream(stream_wrapper(r), tracked),
                 status_code=r.status,
                 headers=dict(r.headers),
             )
@@ -1346,6 +1366,7 @@ async def responses(
             return response_data
 
     except Exception as e:
+        tracked.record(False, str(e))
         log.exception(e)
         raise HTTPException(
             status_code=r.status if r else 500,
@@ -1353,7 +1374,8 @@ async def responses(
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
+            tracked.release()
 
 
 @router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
@@ -1380,7 +1402,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
             await get_all_models(request, user=user)
             models = request.app.state.OPENAI_MODELS
         if model_id in models:
-            idx = models[model_id]["urlIdx"]
+            idx = select_openai_url_idx(request, models[model_id])
 
     url = request.app.state.config.OPENAI_API_BASE_URLS[idx]
     key = request.app.state.config.OPENAI_API_KEYS[idx]
@@ -1392,8 +1414,8 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
     )
 
     r = None
-    session = None
     streaming = False
+    tracked = upstream_balancer.acquire(url)
 
     try:
         headers, cookies = await get_headers_and_cookies(
@@ -1418,10 +1440,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
         else:
             request_url = f"{url}/{path}"
 
-        session = aiohttp.ClientSession(
-            trust_env=True,
-            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
-        )
+        session = get_client_session(request_url)
         r = await session.request(
             method=request.method,
             url=request_url,
@@ -1430,12 +1449,13 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
             cookies=cookies,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
         )
+        tracked.record(r.status < 500, f"HTTP {r.status}")
 
         # Check if response is SSE
         if "text/event-stream" in r.headers.get("Content-Type", ""):
             streaming = True
             return StreamingResponse(
-                stream_wrapper(r, session),
+                upstream_balancer.wrap_stream(stream_wrapper(r), tracked),
                 status_code=r.status,
                 headers=dict(r.headers),
             )
@@ -1456,6 +1476,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
             return response_data
 
     except Exception as e:
+        tracked.record(False, str(e))
         log.exception(e)
         raise HTTPException(
             status_code=r.status if r else 500,
@@ -1463,4 +1484,5 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r)
+            tracked.release()
@@ -44,6 +44,8 @@ from sqlalchemy.orm import Session
 
 
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25Index
+from open_webui.retrieval.embedding_cache import EmbeddingCache
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
@@ -80,6 +82,7 @@ from open_webui.retrieval.web.yandex import search_yandex
 from open_webui.retrieval.web.ydc import search_youcom
 
 from open_webui.retrieval.utils import (
+    get_bm25_indexed_collection,
     get_content_from_url,
     get_embedding_function,
     get_reranking_function,
@@ -91,7 +94,9 @@ from open_webui.retrieval.utils import (
 )
 from open_webui.retrieval.vector.utils import filter_metadata
 from open_webui.utils.misc import (
+    calculate_sha256,
     calculate_sha256_string,
+    iterate_in_thread,
     sanitize_text_for_db,
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
@@ -111,7 +116,12 @@ from open_webui.config import (
 from open_webui.env import (
     DEVICE_TYPE,
     DOCKER,
+    ENABLE_RAG_BM25_INDEX,
+    ENABLE_RAG_EMBEDDING_CACHE,
+    ENABLE_RAG_STREAMING_INGESTION,
     RAG_EMBEDDING_TIMEOUT,
+    RAG_STREAMING_INGESTION_BATCH_SIZE,
+    RAG_STREAMING_INGESTION_QUEUE_SIZE,
     SENTENCE_TRANSFORMERS_BACKEND,
     SENTENCE_TRANSFORMERS_MODEL_KWARGS,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_BACKEND,
@@ -123,6 +133,9 @@ from open_webui.constants import ERROR_MESSAGES
 
 log = logging.getLogger(__name__)
 
+# Attempts per embedding batch in streaming ingestion before the file fails
+STREAMING_INGESTION_EMBEDDING_ATTEMPTS = 3
+
 ##########################################
 #
 # Utility functions
@@ -461,6 +474,40 @@ async def update_embedding_config(
         )
 
 
+@router.get("/embedding/cache")
+async def get_embedding_cache_stats(user=Depends(get_admin_user)):
+    return {
+        "status": True,
+        "ENABLE_RAG_EMBEDDING_CACHE": ENABLE_RAG_EMBEDDING_CACHE,
+        **(await asyncio.to_thread(EmbeddingCache.get_stats)),
+    }
+
+
+class EmbeddingCachePurgeForm(BaseModel):
+    engine: Optional[str] = None
+    model: Optional[str] = None
+
+
+@router.post("/embedding/cache/purge")
+async def purge_embedding_cache(
+    form_data: EmbeddingCachePurgeForm, user=Depends(get_admin_user)
+):
+    try:
+        deleted = await asyncio.to_thread(
+            EmbeddingCache.purge, form_data.engine, form_data.model
+        )
+        log.info(
+            f"Purged {deleted} embedding cache entries (engine={form_data.engine}, model={form_data.model})"
+        )
+        return {"status": True, "deleted": deleted}
+    except Exception as e:
+        log.exception(f"Problem purging embedding cache: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ERROR_MESSAGES.DEFAULT(e),
+        )
+
+
 @router.get("/config")
 async def get_rag_config(request: Request, user=Depends(get_admin_user)):
     return {
@@ -1435,6 +1482,99 @@ def merge_docs_to_target_size(
     return processed_chunks
 
 
+def get_configured_embedding_function(request: Request):
+    """Embedding function for the currently configured RAG embedding engine."""
+    return get_embedding_function(
+        request.app.state.config.RAG_EMBEDDING_ENGINE,
+        request.app.state.config.RAG_EMBEDDING_MODEL,
+        request.app.state.ef,
+        (
+            request.app.state.config.RAG_OPENAI_API_BASE_URL
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+            else (
+                request.app.state.config.RAG_OLLAMA_BASE_URL
+                if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
+            )
+        ),
+        (
+            request.app.state.config.RAG_OPENAI_API_KEY
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+            else (
+                request.app.state.config.RAG_OLLAMA_API_KEY
+                if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
+            )
+        ),
+        request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+        azure_api_version=(
+            request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
+            else None
+        ),
+        enable_async=request.app.state.config.ENABLE_ASYNC_EMBEDDING,
+        concurrent_requests=request.app.state.config.RAG_EMBEDDING_CONCURRENT_REQUESTS,
+    )
+
+
+def split_docs(request: Request, docs: list[Document]) -> list[Document]:
+    if request.app.state.config.ENABLE_MARKDOWN_HEADER_TEXT_SPLITTER:
+        log.info("Using markdown header text splitter")
+        # Define headers to split on - covering most common markdown header levels
+        markdown_splitter = MarkdownHeaderTextSplitter(
+            headers_to_split_on=[
+                ("#", "Header 1"),
+                ("##", "Header 2"),
+                ("###", "Header 3"),
+                ("####", "Header 4"),
+                ("#####", "Header 5"),
+                ("######", "Header 6"),
+            ],
+            strip_headers=False,  # Keep headers in content for context
+        )
+
+        header_docs = []
+        for doc in docs:
+            header_docs.extend(
+                [
+                    Document(
+                        page_content=split_chunk.page_content,
+                        metadata={**doc.metadata},
+                    )
+                    for split_chunk in markdown_splitter.split_text(doc.page_content)
+                ]
+            )
+
+        docs = header_docs
+        if request.app.state.config.CHUNK_MIN_SIZE_TARGET > 0:
+            docs = merge_docs_to_target_size(request, docs)
+
+    if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        docs = text_splitter.split_documents(docs)
+    elif request.app.state.config.TEXT_SPLITTER == "token":
+        log.info(
+            f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
+        )
+
+        tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
+        text_splitter = TokenTextSplitter(
+            encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        docs = text_splitter.split_documents(docs)
+    else:
+        raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+
+    return docs
+
+
 def save_docs_to_vector_db(
     request: Request,
     docs,
@@ -1487,61 +1627,7 @@ def save_docs_to_vector_db(
                     raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
 
     if split:
-        if request.app.state.config.ENABLE_MARKDOWN_HEADER_TEXT_SPLITTER:
-            log.info("Using markdown header text splitter")
-            # Define headers to split on - covering most common markdown header levels
-            markdown_splitter = MarkdownHeaderTextSplitter(
-                headers_to_split_on=[
-                    ("#", "Header 1"),
-                    ("##", "Header 2"),
-                    ("###", "Header 3"),
-                    ("####", "Header 4"),
-                    ("#####", "Header 5"),
-                    ("######", "Header 6"),
-                ],
-                strip_headers=False,  # Keep headers in content for context
-            )
-
-            split_docs = []
-            for doc in docs:
-                split_docs.extend(
-                    [
-                        Document(
-                            page_content=split_chunk.page_content,
-                            metadata={**doc.metadata},
-                        )
-                        for split_chunk in markdown_splitter.split_text(
-                            doc.page_content
-                        )
-                    ]
-                )
-
-            docs = split_docs
-            if request.app.state.config.CHUNK_MIN_SIZE_TARGET > 0:
-                docs = merge_docs_to_target_size(request, docs)
-
-        if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "token":
-            log.info(
-                f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
-            )
-
-            tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
-            text_splitter = TokenTextSplitter(
-                encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        else:
-            raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+        docs = split_docs(request, docs)
 
     if len(docs) == 0:
         raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
@@ -1565,6 +1651,7 @@ def save_docs_to_vector_db(
 
             if overwrite:
                 VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                BM25Index.delete_collection(collection_name=collection_name)
                 log.info(f"deleting existing collection {collection_name}")
             elif add is False:
                 log.info(
@@ -1573,37 +1660,7 @@ def save_docs_to_vector_db(
                 return True
 
         log.info(f"generating embeddings for {collection_name}")
-        embedding_function = get_embedding_function(
-            request.app.state.config.RAG_EMBEDDING_ENGINE,
-            request.app.state.config.RAG_EMBEDDING_MODEL,
-            request.app.state.ef,
-            (
-                request.app.state.config.RAG_OPENAI_API_BASE_URL
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_BASE_URL
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
-                )
-            ),
-            (
-                request.app.state.config.RAG_OPENAI_API_KEY
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_API_KEY
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
-                )
-            ),
-            request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
-            azure_api_version=(
-                request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
-                else None
-            ),
-            enable_async=request.app.state.config.ENABLE_ASYNC_EMBEDDING,
-            concurrent_requests=request.app.state.config.RAG_EMBEDDING_CONCURRENT_REQUESTS,
-        )
+        embedding_function = get_configured_embedding_function(request)
 
         # Run async embedding in sync context using the main event loop
         # This allows the main loop to stay responsive to health checks during long operations
@@ -1636,6 +1693,14 @@ def save_docs_to_vector_db(
             items=items,
         )
 
+        if ENABLE_RAG_BM25_INDEX:
+            try:
+                BM25Index.upsert_documents(collection_name=collection_name, items=items)
+            except Exception as e:
+                # Drop the partial index, it is rebuilt from the vector DB on next query
+                log.exception(f"Failed to update bm25 index for {collection_name}: {e}")
+                BM25Index.delete_collection(collection_name=collection_name)
+
         log.info(f"added {len(items)} items to collection {collection_name}")
         return True
     except Exception as e:
@@ -1643,6 +1708,210 @@ def save_docs_to_vector_db(
         raise e
 
 
+def get_streaming_ingestion_signature(request: Request, file: FileModel) -> str:
+    """
+    Identify everything that determines the chunks and vectors of a file, so
+    a checkpoint is only resumed with the settings it was written with.
+    """
+    config = request.app.state.config
+    return calculate_sha256_string(
+        json.dumps(
+            {
+                "file": [file.id, file.path, (file.meta or {}).get("size")],
+                "loader": config.CONTENT_EXTRACTION_ENGINE,
+                "splitter": [
+                    config.TEXT_SPLITTER,
+                    config.CHUNK_SIZE,
+                    config.CHUNK_OVERLAP,
+                    config.CHUNK_MIN_SIZE_TARGET,
+                    config.ENABLE_MARKDOWN_HEADER_TEXT_SPLITTER,
+                    config.TIKTOKEN_ENCODING_NAME,
+                ],
+                "embedding": [
+                    config.RAG_EMBEDDING_ENGINE,
+                    config.RAG_EMBEDDING_MODEL,
+                    RAG_EMBEDDING_CONTENT_PREFIX,
+                ],
+            },
+            sort_keys=True,
+            default=str,
+        )
+    )
+
+
+def save_file_to_vector_db_streaming(
+    request: Request,
+    file: FileModel,
+    pages: Iterator[Document],
+    collection_name: str,
+    hash: str,
+    user=None,
+) -> str:
+    """
+    Streaming variant of save_docs_to_vector_db for uploaded files.
+
+    Pages are loaded lazily and split, embedded and inserted batch by batch.
+    Loading and splitting run in one background thread, embedding in
+    another, and inserts in the calling thread, connected by bounded queues,
+    so pages, chunks and embeddings in memory stay bounded by
+    RAG_STREAMING_INGESTION_QUEUE_SIZE batches instead of the whole document.
+    Only the text of each page is kept, for the returned content. Chunks
+    carry hash as metadata; the text is not known until the end, so the
+    caller passes the hash of the file itself and stores it as the file hash.
+    Chunk IDs are derived from the file and chunk index, and the number of
+    inserted chunks is checkpointed in file.data["ingestion"] after every
+    batch, so a retry with the same settings skips the chunks already stored.
+
+    Returns the extracted text content of the file.
+    """
+    signature = get_streaming_ingestion_signature(request, file)
+    checkpoint = (file.data or {}).get("ingestion") or {}
+
+    resume_from = 0
+    if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+        if checkpoint.get("signature") == signature:
+            resume_from = checkpoint.get("chunks_inserted", 0)
+            log.info(f"resuming ingestion of {file.id} from chunk {resume_from}")
+        else:
+            VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+            BM25Index.delete_collection(collection_name=collection_name)
+
+    progress = {
+        "signature": signature,
+        "stage": "loading",
+        "pages_loaded": 0,
+        "chunks_split": 0,
+        "chunks_embedded": resume_from,
+        "chunks_inserted": resume_from,
+        "resumed_from": resume_from,
+    }
+    Files.update_file_data_by_id(file.id, {"ingestion": dict(progress)})
+
+    metadata = {
+        "file_id": file.id,
+        "name": file.filename,
+        "embedding_config": {
+            "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+            "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+        },
+        "hash": hash,
+    }
+    page_contents = []
+
+    def split_batches(pages):
+        batch = []
+        for page in pages:
+            page_contents.append(page.page_content)
+            progress["pages_loaded"] += 1
+            for chunk in split_docs(request, [page]):
+                index = progress["chunks_split"]
+                progress["chunks_split"] += 1
+                if index < resume_from:
+                    continue
+
+                batch.append((index, chunk))
+                if len(batch) >= RAG_STREAMING_INGESTION_BATCH_SIZE:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    embedding_function = get_configured_embedding_function(request)
+
+    def embed_batches(batches):
+        for batch in batches:
+            texts = [sanitize_text_for_db(chunk.page_content) for _, chunk in batch]
+
+            # Each batch gets its own RAG_EMBEDDING_TIMEOUT and a few attempts,
+            # so one slow request does not fail the whole file.
+            for attempt in range(STREAMING_INGESTION_EMBEDDING_ATTEMPTS):
+                future = asyncio.run_coroutine_threadsafe(
+                    embedding_function(
+                        [text.replace("\n", " ") for text in texts],
+                        prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+                        user=user,
+                    ),
+                    request.app.state.main_loop,
+                )
+                try:
+                    embeddings = future.result(timeout=RAG_EMBEDDING_TIMEOUT)
+                    if embeddings and len(embeddings) == len(texts):
+                        break
+                    error = ValueError(
+                        f"expected {len(texts)} embeddings, got {len(embeddings or [])}"
+                    )
+                except Exception as e:
+                    future.cancel()
+                    error = e
+
+                log.warning(
+                    f"embedding batch of {file.id} failed (attempt {attempt + 1}): {error}"
+                )
+            else:
+                raise error
+
+            progress["chunks_embedded"] += len(batch)
+            yield [
+                {
+                    "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"{file.id}/{index}")),
+                    "text": text,
+                    "vector": embedding,
+                    "metadata": {**chunk.metadata, **metadata},
+                }
+                for (index, chunk), text, embedding in zip(batch, texts, embeddings)
+            ]
+
+    progress["stage"] = "processing"
+    batches = iterate_in_thread(
+        embed_batches(
+            iterate_in_thread(
+                split_batches(pages),
+                maxsize=RAG_STREAMING_INGESTION_QUEUE_SIZE,
+            )
+        ),
+        maxsize=RAG_STREAMING_INGESTION_QUEUE_SIZE,
+    )
+
+    # A resumed run whose earlier BM25 indexing failed must not add the rest
+    bm25_enabled = ENABLE_RAG_BM25_INDEX and (
+        resume_from == 0 or BM25Index.has_collection(collection_name=collection_name)
+    )
+    try:
+        for items in batches:
+            # Upsert with deterministic IDs keeps a batch that was stored but
+            # not checkpointed before a failure from being duplicated.
+            VECTOR_DB_CLIENT.upsert(collection_name=collection_name, items=items)
+            if bm25_enabled:
+                try:
+                    BM25Index.upsert_documents(
+                        collection_name=collection_name, items=items
+                    )
+                except Exception as e:
+                    log.exception(
+                        f"Failed to update bm25 index for {collection_name}: {e}"
+                    )
+                    # Drop the index and stop adding to it, a partial index
+                    # would hide the chunks it misses from hybrid search
+                    BM25Index.delete_collection(collection_name=collection_name)
+                    bm25_enabled = False
+
+            progress["chunks_inserted"] += len(items)
+            Files.update_file_data_by_id(file.id, {"ingestion": dict(progress)})
+    finally:
+        batches.close()
+
+    if progress["chunks_split"] == 0:
+        raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+
+    progress["stage"] = "completed"
+    Files.update_file_data_by_id(file.id, {"ingestion": dict(progress)})
+    log.info(
+        f"added {progress['chunks_inserted'] - resume_from} items to collection {collection_name}"
+    )
+
+    return " ".join(page_contents)
+
+
 class ProcessFileForm(BaseModel):
     file_id: str
     content: Optional[str] = None
@@ -1668,6 +1937,7 @@ def process_file(
         file = Files.get_file_by_id_and_user_id(form_data.file_id, user.id, db=db)
 
     if file:
+        streaming = False
         try:
             collection_name = form_data.collection_name
 
@@ -1683,6 +1953,7 @@ def process_file(
                     VECTOR_DB_CLIENT.delete_collection(
                         collection_name=f"file-{file.id}"
                     )
+                    BM25Index.delete_collection(collection_name=f"file-{file.id}")
                 except:
                     # Audio file upload pipeline
                     pass
@@ -1771,11 +2042,13 @@ def process_file(
                         MINERU_API_TIMEOUT=request.app.state.config.MINERU_API_TIMEOUT,
                         MINERU_PARAMS=request.app.state.config.MINERU_PARAMS,
                     )
-                    docs = loader.load(
-                        file.filename, file.meta.get("content_type"), file_path
+                    streaming = (
+                        ENABLE_RAG_STREAMING_INGESTION
+                        and not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
                     )
+                    load = loader.lazy_load if streaming else loader.load
 
-                    docs = [
+                    docs = (
                         Document(
                             page_content=doc.page_content,
                             metadata={
@@ -1786,8 +2059,30 @@ def process_file(
                                 "source": file.filename,
                             },
                         )
-                        for doc in docs
-                    ]
+                        for doc in load(
+                            file.filename, file.meta.get("content_type"), file_path
+                        )
+                    )
+
+                    if streaming:
+                        # Chunks are stored before the whole text is known,
+                        # so they carry the hash of the file instead
+                        file_hash = calculate_sha256(file_path, 1024 * 1024)
+
+                        # Commit pending changes before the slow pipeline,
+                        # like before save_docs_to_vector_db below.
+                        db.commit()
+                        text_content = save_file_to_vector_db_streaming(
+                            request,
+                            file,
+                            docs,
+                            collection_name=collection_name,
+                            hash=file_hash,
+                            user=user,
+                        )
+                    else:
+                        docs = list(docs)
+                        text_content = " ".join([doc.page_content for doc in docs])
                 else:
                     docs = [
                         Document(
@@ -1801,7 +2096,7 @@ def process_file(
                             },
                         )
                     ]
-                text_content = " ".join([doc.page_content for doc in docs])
+                    text_content = " ".join([doc.page_content for doc in docs])
 
             log.debug(f"text_content: {text_content}")
             Files.update_file_data_by_id(
@@ -1809,7 +2104,7 @@ def process_file(
                 {"content": text_content},
                 db=db,
             )
-            hash = calculate_sha256_string(text_content)
+            hash = file_hash if streaming else calculate_sha256_string(text_content)
 
             if request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL:
                 Files.update_file_data_by_id(file.id, {"status": "completed"}, db=db)
@@ -1828,19 +2123,25 @@ def process_file(
 
                     # External embedding API takes time (5-60s+).
                     # Subsequent updates use fresh sessions via get_db().
-                    result = save_docs_to_vector_db(
-                        request,
-                        docs=docs,
-                        collection_name=collection_name,
-                        metadata={
-                            "file_id": file.id,
-                            "name": file.filename,
-                            "hash": hash,
-                        },
-                        add=(True if form_data.collection_name else False),
-                        user=user,
-                    )
-                    log.info(f"added {len(docs)} items to collection {collection_name}")
+                    if streaming:
+                        # Already embedded and stored page by page
+                        result = True
+                    else:
+                        result = save_docs_to_vector_db(
+                            request,
+                            docs=docs,
+                            collection_name=collection_name,
+                            metadata={
+                                "file_id": file.id,
+                                "name": file.filename,
+                                "hash": hash,
+                            },
+                            add=(True if form_data.collection_name else False),
+                            user=user,
+                        )
+                        log.info(
+                            f"added {len(docs)} items to collection {collection_name}"
+                        )
 
                     if result:
                         # Fresh session for the final update.
@@ -2507,16 +2808,21 @@ async def query_doc_handler(
         if request.app.state.config.ENABLE_RAG_HYBRID_SEARCH and (
             form_data.hybrid is None or form_data.hybrid
         ):
+            use_bm25_index = ENABLE_RAG_BM25_INDEX and await asyncio.to_thread(
+                get_bm25_indexed_collection, form_data.collection_name
+            )
+
             collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=form_data.collection_name
+            collection_results[form_data.collection_name] = (
+                VECTOR_DB_CLIENT.get(collection_name=form_data.collection_name)
+                if not use_bm25_index
+                else None
             )
             return await query_doc_with_hybrid_search(
                 collection_name=form_data.collection_name,
                 collection_result=collection_results[form_data.collection_name],
                 query=form_data.query,
-                embedding_function=lambda query,
-                prefix: request.app.state.EMBEDDING_FUNCTION(
+                embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
                     query, prefix=prefix, user=user
                 ),
                 k=form_data.k if form_data.k else request.app.state.config.TOP_K,
@@ -2541,6 +2847,7 @@ async def query_doc_handler(
                     if form_data.hybrid_bm25_weight
                     else request.app.state.config.HYBRID_BM25_WEIGHT
                 ),
+                use_bm25_index=use_bm25_index,
                 user=user,
             )
         else:
@@ -2585,8 +2892,7 @@ async def query_collection_handler(
             return await query_collection_with_hybrid_search(
                 collection_names=form_data.collection_names,
                 queries=[form_data.query],
-                embedding_function=lambda query,
-                prefix: request.app.state.EMBEDDING_FUNCTION(
+                embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
                     query, prefix=prefix, user=user
                 ),
                 k=form_data.k if form_data.k else request.app.state.config.TOP_K,
@@ -2621,8 +2927,7 @@ async def query_collection_handler(
             return await query_collection(
                 collection_names=form_data.collection_names,
                 queries=[form_data.query],
-                embedding_function=lambda query,
-                prefix: request.app.state.EMBEDDING_FUNCTION(
+                embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
                     query, prefix=prefix, user=user
                 ),
                 k=form_data.k if form_data.k else request.app.state.config.TOP_K,
@@ -2668,6 +2973,10 @@ def delete_entries_from_collection(
                 collection_name=form_data.collection_name,
                 metadata={"hash": hash},
             )
+            BM25Index.delete(
+                collection_name=form_data.collection_name,
+                filter={"hash": hash},
+            )
             return {"status": True}
         else:
             return {"status": False}
@@ -2679,6 +2988,7 @@ def delete_entries_from_collection(
 @router.post("/reset/db")
 def reset_vector_db(user=Depends(get_admin_user), db: Session = Depends(get_session)):
     VECTOR_DB_CLIENT.reset()
+    BM25Index.reset(db=db)
     Knowledges.delete_all_knowledge(db=db)
 
 
@@ -4,10 +4,8 @@ import random
 import socketio
 import logging
 import sys
-import time
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 from redis import asyncio as aioredis
-import pycrdt as Y
 
 from open_webui.models.users import Users, UserNameResponse
 from open_webui.models.channels import Channels
@@ -37,10 +35,19 @@ from open_webui.env import (
     WEBSOCKET_SERVER_PING_INTERVAL,
     WEBSOCKET_SERVER_LOGGING,
     WEBSOCKET_SERVER_ENGINEIO_LOGGING,
+    YDOC_SNAPSHOT_INTERVAL,
+    YDOC_SAVE_DEBOUNCE_INTERVAL,
+    YDOC_SAVE_MAX_WAIT,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock, YdocManager
-from open_webui.tasks import create_task, stop_item_tasks
+from open_webui.socket.utils import (
+    DocumentSaveCoalescer,
+    ModelRegistry,
+    RedisLock,
+    SessionPool,
+    UsagePool,
+    YdocManager,
+)
 from open_webui.utils.redis import get_redis_connection
 from open_webui.utils.access_control import has_permission
 from open_webui.models.access_grants import AccessGrants
@@ -118,21 +125,25 @@ if WEBSOCKET_MANAGER == "redis":
         WEBSOCKET_SENTINEL_HOSTS, WEBSOCKET_SENTINEL_PORT
     )
 
-    MODELS = RedisDict(
+    MODELS = ModelRegistry(
         f"{REDIS_KEY_PREFIX}:models",
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
     )
 
-    SESSION_POOL = RedisDict(
+    SESSION_POOL = SessionPool(
         f"{REDIS_KEY_PREFIX}:session_pool",
+        timeout=SESSION_POOL_TIMEOUT,
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
     )
-    USAGE_POOL = RedisDict(
-        f"{REDIS_KEY_PREFIX}:usage_pool",
+    # Not ":usage_pool", which earlier versions (and replicas still running
+    # them during an upgrade) use as a hash
+    USAGE_POOL = UsagePool(
+        f"{REDIS_KEY_PREFIX}:usage_pool:z",
+        timeout=TIMEOUT_DURATION,
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
@@ -162,16 +173,25 @@ if WEBSOCKET_MANAGER == "redis":
 else:
     MODELS = {}
 
-    SESSION_POOL = {}
-    USAGE_POOL = {}
+    SESSION_POOL = SessionPool(
+        f"{REDIS_KEY_PREFIX}:session_pool", timeout=SESSION_POOL_TIMEOUT
+    )
+    USAGE_POOL = UsagePool(f"{REDIS_KEY_PREFIX}:usage_pool:z", timeout=TIMEOUT_DURATION)
 
     aquire_func = release_func = renew_func = lambda: True
     session_aquire_func = session_release_func = session_renew_func = lambda: True
 
 
+async def document_snapshot_handler(document_id: str, state: bytes):
+    # Document ids are passed with ":" replaced by "_"
+    if document_id.startswith("note_"):
+        Notes.update_note_ydoc_state_by_id(document_id[len("note_") :], state)
+
+
 YDOC_MANAGER = YdocManager(
     redis=REDIS,
     redis_key_prefix=f"{REDIS_KEY_PREFIX}:ydoc:documents",
+    snapshot_handler=document_snapshot_handler,
 )
 
 
@@ -182,19 +202,19 @@ async def periodic_session_pool_cleanup():
         return
 
     try:
+        # Sessions stored by earlier versions have no last-seen score yet
+        if seeded := await SESSION_POOL.seed_last_seen():
+            log.info(f"Scored {seeded} sessions without a last-seen time")
+
         while True:
             if not session_renew_func():
                 log.error("Unable to renew session cleanup lock. Exiting.")
                 return
 
-            now = int(time.time())
-            for sid in list(SESSION_POOL.keys()):
-                entry = SESSION_POOL.get(sid)
-                if entry and now - entry.get("last_seen_at", 0) > SESSION_POOL_TIMEOUT:
-                    log.warning(
-                        f"Reaping orphaned session {sid} (user {entry.get('id')})"
-                    )
-                    del SESSION_POOL[sid]
+            for sid, entry in await SESSION_POOL.reap():
+                log.warning(
+                    f"Reaping orphaned session {sid} (user {(entry or {}).get('id')})"
+                )
             await asyncio.sleep(SESSION_POOL_TIMEOUT)
     finally:
         session_release_func()
@@ -227,26 +247,8 @@ async def periodic_usage_pool_cleanup():
                 log.error(f"Unable to renew cleanup lock. Exiting usage pool cleanup.")
                 raise Exception("Unable to renew usage pool cleanup lock.")
 
-            now = int(time.time())
-            send_usage = False
-            for model_id, connections in list(USAGE_POOL.items()):
-                # Creating a list of sids to remove if they have timed out
-                expired_sids = [
-                    sid
-                    for sid, details in connections.items()
-                    if now - details["updated_at"] > TIMEOUT_DURATION
-                ]
-
-                for sid in expired_sids:
-                    del connections[sid]
-
-                if not connections:
-                    log.debug(f"Cleaning up model {model_id} from usage pool")
-                    del USAGE_POOL[model_id]
-                else:
-                    USAGE_POOL[model_id] = connections
-
-                send_usage = True
+            # Reads already skip expired usage, this only frees it up
+            await USAGE_POOL.reap()
             await asyncio.sleep(TIMEOUT_DURATION)
     finally:
         release_func()
@@ -258,14 +260,14 @@ app = socketio.ASGIApp(
 )
 
 
-def get_models_in_use():
+async def get_models_in_use():
     # List models that are currently in use
-    models_in_use = list(USAGE_POOL.keys())
+    models_in_use = await USAGE_POOL.get_model_ids()
     return models_in_use
 
 
 def get_user_id_from_session_pool(sid):
-    user = SESSION_POOL.get(sid)
+    user = SESSION_POOL.get_sync(sid)
     if user:
         return user["id"]
     return None
@@ -280,15 +282,15 @@ def get_session_ids_from_room(room):
     return [session_id[0] for session_id in active_session_ids]
 
 
-def get_user_ids_from_room(room):
+async def get_user_ids_from_room(room):
     active_session_ids = get_session_ids_from_room(room)
 
     active_user_ids = list(
         set(
             [
-                SESSION_POOL.get(session_id)["id"]
-                for session_id in active_session_ids
-                if SESSION_POOL.get(session_id) is not None
+                user["id"]
+                for user in await SESSION_POOL.get_many(active_session_ids)
+                if user is not None
             ]
         )
     )
@@ -329,16 +331,9 @@ async def enter_room_for_users(room: str, user_ids: list[str]):
 
 @sio.on("usage")
 async def usage(sid, data):
-    if sid in SESSION_POOL:
-        model_id = data["model"]
+    if await SESSION_POOL.contains(sid):
         # Record the timestamp for the last update
-        current_time = int(time.time())
-
-        # Store the new usage data and task
-        USAGE_POOL[model_id] = {
-            **(USAGE_POOL[model_id] if model_id in USAGE_POOL else {}),
-            sid: {"updated_at": current_time},
-        }
+        await USAGE_POOL.touch(sid, data["model"])
 
 
 @sio.event
@@ -351,8 +346,9 @@ async def connect(sid, environ, auth):
             user = Users.get_user_by_id(data["id"])
 
         if user:
-            SESSION_POOL[sid] = {
-                **user.model_dump(
+            await SESSION_POOL.set(
+                sid,
+                user.model_dump(
                     exclude=[
                         "profile_image_url",
                         "profile_banner_image_url",
@@ -361,8 +357,7 @@ async def connect(sid, environ, auth):
                         "gender",
                     ]
                 ),
-                "last_seen_at": int(time.time()),
-            }
+            )
             await sio.enter_room(sid, f"user:{user.id}")
 
 
@@ -380,8 +375,9 @@ async def user_join(sid, data):
     if not user:
         return
 
-    SESSION_POOL[sid] = {
-        **user.model_dump(
+    await SESSION_POOL.set(
+        sid,
+        user.model_dump(
             exclude=[
                 "profile_image_url",
                 "profile_banner_image_url",
@@ -390,8 +386,7 @@ async def user_join(sid, data):
                 "gender",
             ]
         ),
-        "last_seen_at": int(time.time()),
-    }
+    )
 
     await sio.enter_room(sid, f"user:{user.id}")
 
@@ -407,9 +402,9 @@ async def user_join(sid, data):
 
 @sio.on("heartbeat")
 async def heartbeat(sid, data):
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
     if user:
-        SESSION_POOL[sid] = {**user, "last_seen_at": int(time.time())}
+        await SESSION_POOL.touch(sid)
         Users.update_last_active_by_id(user["id"])
 
 
@@ -486,7 +481,7 @@ async def channel_events(sid, data):
     event_data = data["data"]
     event_type = event_data["type"]
 
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
 
     if not user:
         return
@@ -509,7 +504,7 @@ async def channel_events(sid, data):
 @sio.on("ydoc:document:join")
 async def ydoc_document_join(sid, data):
     """Handle user joining a document"""
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
     if not user:
         return
 
@@ -523,16 +518,9 @@ async def ydoc_document_join(sid, data):
                 log.error(f"Note {note_id} not found")
                 return
 
-            if (
-                user.get("role") != "admin"
-                and user.get("id") != note.user_id
-                and not AccessGrants.has_access(
-                    user_id=user.get("id"),
-                    resource_type="note",
-                    resource_id=note.id,
-                    permission="read",
-                )
-            ):
+            has_access = has_note_access(user, note)
+            DOCUMENT_SAVE_COALESCER.set_access(sid, document_id, has_access)
+            if not has_access:
                 log.error(
                     f"User {user.get('id')} does not have access to note {note_id}"
                 )
@@ -543,29 +531,22 @@ async def ydoc_document_join(sid, data):
         user_color = data.get("user_color", "#000000")
 
         log.info(f"User {user_id} joining document {document_id}")
+
+        if document_id.startswith("note:") and not await YDOC_MANAGER.document_exists(
+            document_id
+        ):
+            # Resume from the persisted snapshot, if the note wasn't changed since
+            ydoc_state = Notes.get_note_ydoc_state_by_id(note_id)
+            if ydoc_state:
+                await YDOC_MANAGER.append_to_updates(document_id, ydoc_state)
+
         await YDOC_MANAGER.add_user(document_id=document_id, user_id=sid)
 
         # Join Socket.IO room
         await sio.enter_room(sid, f"doc_{document_id}")
 
-        active_session_ids = get_session_ids_from_room(f"doc_{document_id}")
-
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
-        # Encode the entire document state as an update
-        state_update = ydoc.get_update()
-        await sio.emit(
-            "ydoc:document:state",
-            {
-                "document_id": document_id,
-                "state": list(state_update),  # Convert bytes to list for JSON
-                "sessions": active_session_ids,
-            },
-            room=sid,
+        await emit_document_state(
+            sid, document_id, data.get("state_vector"), f"doc_{document_id}"
         )
 
         # Notify other users about the new user
@@ -588,28 +569,87 @@ async def ydoc_document_join(sid, data):
         await sio.emit("error", {"message": "Failed to join document"}, room=sid)
 
 
+async def emit_document_state(
+    sid, document_id: str, state_vector: Optional[list], room: str
+):
+    """
+    Send the document state to a session: only what is missing from its state
+    vector if it sent one (e.g. when reconnecting), else the full state.
+    """
+    state = await YDOC_MANAGER.get_state(
+        document_id, bytes(state_vector) if state_vector else None
+    )
+
+    await sio.emit(
+        "ydoc:document:state",
+        {
+            "document_id": document_id,
+            "state": list(state),  # Convert bytes to list for JSON
+            "sessions": get_session_ids_from_room(room),
+            **(
+                {
+                    "diff": True,
+                    # Lets the client send back what the server is missing
+                    "state_vector": list(
+                        await YDOC_MANAGER.get_state_vector(document_id)
+                    ),
+                }
+                if state_vector
+                else {}
+            ),
+        },
+        room=sid,
+    )
+
+
+def has_note_access(user, note) -> bool:
+    return (
+        user.get("role") == "admin"
+        or user.get("id") == note.user_id
+        or AccessGrants.has_access(
+            user_id=user.get("id"),
+            resource_type="note",
+            resource_id=note.id,
+            permission="read",
+        )
+    )
+
+
+def has_document_save_access(sid, document_id, user) -> bool:
+    """Access check for saving a document, cached for the session."""
+    if not document_id.startswith("note:"):
+        return False
+
+    has_access = DOCUMENT_SAVE_COALESCER.get_access(sid, document_id)
+    if has_access is None:
+        note = Notes.get_note_by_id(document_id.split(":")[1])
+        has_access = note is not None and has_note_access(user, note)
+        DOCUMENT_SAVE_COALESCER.set_access(sid, document_id, has_access)
+
+    return has_access
+
+
 async def document_save_handler(document_id, data, user):
     if document_id.startswith("note:"):
         note_id = document_id.split(":")[1]
-        note = Notes.get_note_by_id(note_id)
-        if not note:
-            log.error(f"Note {note_id} not found")
-            return
 
-        if (
-            user.get("role") != "admin"
-            and user.get("id") != note.user_id
-            and not AccessGrants.has_access(
-                user_id=user.get("id"),
-                resource_type="note",
-                resource_id=note.id,
-                permission="read",
-            )
+        ydoc_state = None
+        if YDOC_MANAGER.is_snapshot_due(document_id, YDOC_SNAPSHOT_INTERVAL):
+            ydoc_state = await YDOC_MANAGER.get_state(document_id)
+
+        if not Notes.update_note_by_id(
+            note_id, NoteUpdateForm(data=data), ydoc_state=ydoc_state
         ):
-            log.error(f"User {user.get('id')} does not have access to note {note_id}")
-            return
+            log.error(f"Note {note_id} not found")
+
 
-        Notes.update_note_by_id(note_id, NoteUpdateForm(data=data))
+# Access is checked when an update is scheduled, saves only write the latest
+# content of each document
+DOCUMENT_SAVE_COALESCER = DocumentSaveCoalescer(
+    save_handler=document_save_handler,
+    debounce_interval=YDOC_SAVE_DEBOUNCE_INTERVAL,
+    max_wait=YDOC_SAVE_MAX_WAIT,
+)
 
 
 @sio.on("ydoc:document:state")
@@ -629,24 +669,7 @@ async def yjs_document_state(sid, data):
             log.warning(f"Document {document_id} not found")
             return
 
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
-        # Encode the entire document state as an update
-        state_update = ydoc.get_update()
-
-        await sio.emit(
-            "ydoc:document:state",
-            {
-                "document_id": document_id,
-                "state": list(state_update),  # Convert bytes to list for JSON
-                "sessions": active_session_ids,
-            },
-            room=sid,
-        )
+        await emit_document_state(sid, document_id, data.get("state_vector"), room)
     except Exception as e:
         log.error(f"Error in yjs_document_state: {e}")
 
@@ -657,11 +680,6 @@ async def yjs_document_update(sid, data):
     try:
         document_id = data["document_id"]
 
-        try:
-            await stop_item_tasks(REDIS, document_id)
-        except:
-            pass
-
         user_id = data.get("user_id", sid)
 
         update = data["update"]  # List of bytes from frontend
@@ -684,16 +702,18 @@ async def yjs_document_update(sid, data):
             skip_sid=sid,
         )
 
-        user = SESSION_POOL.get(sid)
+        user = await SESSION_POOL.get(sid)
         if not user:
             return
 
-        async def debounced_save():
-            await asyncio.sleep(0.5)
-            await document_save_handler(document_id, data.get("data", {}), user)
-
         if data.get("data"):
-            await create_task(REDIS, debounced_save(), document_id)
+            if not has_document_save_access(sid, document_id, user):
+                log.error(
+                    f"User {user.get('id')} does not have access to document {document_id}"
+                )
+                return
+
+            DOCUMENT_SAVE_COALESCER.schedule(document_id, data["data"], user)
 
     except Exception as e:
         log.error(f"Error in yjs_document_update: {e}")
@@ -710,6 +730,7 @@ async def yjs_document_leave(sid, data):
 
         # Remove user from the document
         await YDOC_MANAGER.remove_user(document_id=document_id, user_id=sid)
+        DOCUMENT_SAVE_COALESCER.forget_access(sid, document_id)
 
         # Leave Socket.IO room
         await sio.leave_room(sid, f"doc_{document_id}")
@@ -726,6 +747,8 @@ async def yjs_document_leave(sid, data):
             and len(await YDOC_MANAGER.get_users(document_id)) == 0
         ):
             log.info(f"Cleaning up document {document_id} as no users are left")
+            # Write the content first, so the snapshot taken on clearing matches
+            await DOCUMENT_SAVE_COALESCER.flush(document_id)
             await YDOC_MANAGER.clear_document(document_id)
 
     except Exception as e:
@@ -754,19 +777,17 @@ async def yjs_awareness_update(sid, data):
 
 @sio.event
 async def disconnect(sid):
-    if sid in SESSION_POOL:
-        user = SESSION_POOL[sid]
-        del SESSION_POOL[sid]
+    user = await SESSION_POOL.get(sid)
+    if user:
+        await SESSION_POOL.delete(sid)
 
         # Clean up USAGE_POOL entries for this session
-        for model_id in list(USAGE_POOL.keys()):
-            connections = USAGE_POOL.get(model_id)
-            if connections and sid in connections:
-                del connections[sid]
-                if not connections:
-                    del USAGE_POOL[model_id]
-                else:
-                    USAGE_POOL[model_id] = connections
+        await USAGE_POOL.remove_session(sid)
+
+        # Write pending saves of the documents the session edited before they
+        # are cleared along with it
+        for document_id in DOCUMENT_SAVE_COALESCER.forget_access(sid):
+            await DOCUMENT_SAVE_COALESCER.flush(document_id)
 
         await YDOC_MANAGER.remove_user_from_all_documents(sid)
     else:
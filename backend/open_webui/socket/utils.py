@@ -1,10 +1,17 @@
+import asyncio
+import base64
 import json
+import logging
+import threading
+import time
 import uuid
 from open_webui.utils.redis import get_redis_connection
-from open_webui.env import REDIS_KEY_PREFIX
-from typing import Optional, List, Tuple
+from open_webui.env import REDIS_CONFIG_SYNC_INTERVAL, REDIS_KEY_PREFIX
+from typing import Any, Awaitable, Callable, Optional, List, Tuple
 import pycrdt as Y
 
+log = logging.getLogger(__name__)
+
 
 class RedisLock:
     def __init__(
@@ -46,8 +53,64 @@ class RedisLock:
             self.redis.delete(self.lock_name)
 
 
+_MISSING = object()
+
+
+class _RedisDictCache:
+    """Local read cache of RedisDict/AsyncRedisDict values, with a TTL."""
+
+    def __init__(self, ttl: float = 0):
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, Any]] = {}
+
+    def get(self, key):
+        if self.ttl <= 0:
+            return _MISSING
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        if entry[0] < time.monotonic():
+            self._entries.pop(key, None)
+            return _MISSING
+        return entry[1]
+
+    def set(self, key, value):
+        if self.ttl > 0:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def delete(self, *keys):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+def _loads(key, value):
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        log.error(f"Invalid JSON format in Redis for key {key}")
+        return None
+
+
 class RedisDict:
-    def __init__(self, name, redis_url, redis_sentinels=[], redis_cluster=False):
+    """
+    A Redis hash of JSON values with a blocking, dict-like interface.
+
+    Kept for call sites that can't await; async code should use
+    AsyncRedisDict (its `sync` attribute is a RedisDict on the same hash).
+    """
+
+    def __init__(
+        self,
+        name,
+        redis_url,
+        redis_sentinels=[],
+        redis_cluster=False,
+        cache_ttl: float = 0,
+    ):
         self.name = name
         self.redis = get_redis_connection(
             redis_url,
@@ -55,23 +118,35 @@ class RedisDict:
             redis_cluster=redis_cluster,
             decode_responses=True,
         )
+        self._cache = _RedisDictCache(cache_ttl)
 
     def __setitem__(self, key, value):
         serialized_value = json.dumps(value)
         self.redis.hset(self.name, key, serialized_value)
+        self._cache.set(key, value)
 
     def __getitem__(self, key):
+        value = self._cache.get(key)
+        if value is not _MISSING:
+            return value
+
         value = self.redis.hget(self.name, key)
         if value is None:
             raise KeyError(key)
-        return json.loads(value)
+
+        value = json.loads(value)
+        self._cache.set(key, value)
+        return value
 
     def __delitem__(self, key):
+        self._cache.delete(key)
         result = self.redis.hdel(self.name, key)
         if result == 0:
             raise KeyError(key)
 
     def __contains__(self, key):
+        if self._cache.get(key) is not _MISSING:
+            return True
         return self.redis.hexists(self.name, key)
 
     def __len__(self):
@@ -81,10 +156,45 @@ class RedisDict:
         return self.redis.hkeys(self.name)
 
     def values(self):
-        return [json.loads(v) for v in self.redis.hvals(self.name)]
+        return [_loads(None, v) for v in self.redis.hvals(self.name)]
 
     def items(self):
-        return [(k, json.loads(v)) for k, v in self.redis.hgetall(self.name).items()]
+        return [(k, _loads(k, v)) for k, v in self.redis.hgetall(self.name).items()]
+
+    def mget(self, keys: List[str]) -> dict:
+        """The values of the given keys that exist, in one round trip."""
+        values = {}
+        remote_keys = []
+        for key in keys:
+            value = self._cache.get(key)
+            if value is _MISSING:
+                remote_keys.append(key)
+            else:
+                values[key] = value
+
+        if remote_keys:
+            remote_values = self.redis.hmget(self.name, remote_keys)
+            for key, value in zip(remote_keys, remote_values):
+                if value is not None:
+                    values[key] = _loads(key, value)
+                    self._cache.set(key, values[key])
+
+        return values
+
+    def mset(self, mapping: dict):
+        if not mapping:
+            return
+        self.redis.hset(
+            self.name, mapping={k: json.dumps(v) for k, v in mapping.items()}
+        )
+        for key, value in mapping.items():
+            self._cache.set(key, value)
+
+    def mdelete(self, keys: List[str]) -> int:
+        if not keys:
+            return 0
+        self._cache.delete(*keys)
+        return self.redis.hdel(self.name, *keys)
 
     def set(self, mapping: dict):
         pipe = self.redis.pipeline()
@@ -95,6 +205,10 @@ class RedisDict:
 
         pipe.execute()
 
+        self._cache.clear()
+        for key, value in mapping.items():
+            self._cache.set(key, value)
+
     def get(self, key, default=None):
         try:
             return self[key]
@@ -102,14 +216,15 @@ class RedisDict:
             return default
 
     def clear(self):
+        self._cache.clear()
         self.redis.delete(self.name)
 
     def update(self, other=None, **kwargs):
+        mapping = {}
         if other is not None:
-            for k, v in other.items() if hasattr(other, "items") else other:
-                self[k] = v
-        for k, v in kwargs.items():
-            self[k] = v
+            mapping.update(other)
+        mapping.update(kwargs)
+        self.mset(mapping)
 
     def setdefault(self, key, default=None):
         if key not in self:
@@ -117,25 +232,575 @@ class RedisDict:
         return self[key]
 
 
+class AsyncRedisDict:
+    """
+    A Redis hash of JSON values for async code, on the asyncio Redis client
+    so lookups don't block the event loop.
+
+    Batch methods (mget, mset, mdelete, replace) take one round trip. With
+    cache_ttl, values read or written by this process are served from memory
+    for that many seconds, so changes by other processes show up after at
+    most cache_ttl. `sync` is a blocking RedisDict on the same hash, sharing
+    the cache, for call sites that can't await.
+    """
+
+    def __init__(
+        self,
+        name,
+        redis_url,
+        redis_sentinels=[],
+        redis_cluster=False,
+        cache_ttl: float = 0,
+    ):
+        self.name = name
+        self.redis = get_redis_connection(
+            redis_url,
+            redis_sentinels,
+            redis_cluster=redis_cluster,
+            async_mode=True,
+            decode_responses=True,
+        )
+
+        self.sync = RedisDict(
+            name,
+            redis_url,
+            redis_sentinels=redis_sentinels,
+            redis_cluster=redis_cluster,
+        )
+        self._cache = self.sync._cache = _RedisDictCache(cache_ttl)
+
+    async def get(self, key, default=None):
+        value = self._cache.get(key)
+        if value is not _MISSING:
+            return value
+
+        value = await self.redis.hget(self.name, key)
+        if value is None:
+            return default
+
+        value = _loads(key, value)
+        self._cache.set(key, value)
+        return value
+
+    async def set(self, key, value):
+        await self.redis.hset(self.name, key, json.dumps(value))
+        self._cache.set(key, value)
+
+    async def delete(self, key) -> bool:
+        self._cache.delete(key)
+        return await self.redis.hdel(self.name, key) > 0
+
+    async def contains(self, key) -> bool:
+        if self._cache.get(key) is not _MISSING:
+            return True
+        return bool(await self.redis.hexists(self.name, key))
+
+    async def length(self) -> int:
+        return await self.redis.hlen(self.name)
+
+    async def keys(self) -> List[str]:
+        return await self.redis.hkeys(self.name)
+
+    async def items(self) -> List[Tuple[str, Any]]:
+        values = await self.redis.hgetall(self.name)
+        return [(k, _loads(k, v)) for k, v in values.items()]
+
+    async def mget(self, keys: List[str]) -> dict:
+        """The values of the given keys that exist, in one round trip."""
+        values = {}
+        remote_keys = []
+        for key in keys:
+            value = self._cache.get(key)
+            if value is _MISSING:
+                remote_keys.append(key)
+            else:
+                values[key] = value
+
+        if remote_keys:
+            remote_values = await self.redis.hmget(self.name, remote_keys)
+            for key, value in zip(remote_keys, remote_values):
+                if value is not None:
+                    values[key] = _loads(key, value)
+                    self._cache.set(key, values[key])
+
+        return values
+
+    async def mset(self, mapping: dict):
+        if not mapping:
+            return
+        await self.redis.hset(
+            self.name, mapping={k: json.dumps(v) for k, v in mapping.items()}
+        )
+        for key, value in mapping.items():
+            self._cache.set(key, value)
+
+    async def mdelete(self, keys: List[str]) -> int:
+        if not keys:
+            return 0
+        self._cache.delete(*keys)
+        return await self.redis.hdel(self.name, *keys)
+
+    async def replace(self, mapping: dict):
+        """Replace the whole hash, atomically."""
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(self.name)
+        if mapping:
+            pipe.hset(self.name, mapping={k: json.dumps(v) for k, v in mapping.items()})
+        await pipe.execute()
+
+        self._cache.clear()
+        for key, value in mapping.items():
+            self._cache.set(key, value)
+
+    async def clear(self):
+        self._cache.clear()
+        await self.redis.delete(self.name)
+
+
+class SessionPool:
+    """
+    The users of connected sessions (sid -> user) and when each session was
+    last seen, for reaping the sessions of crashed instances.
+
+    With Redis, users are stored in a hash (an AsyncRedisDict) written once
+    per connection and last-seen times in a sorted set scored by time, so
+    heartbeats only update a score and expired sessions are found with one
+    ZRANGEBYSCORE. Sessions connected to this process are also kept in
+    memory and looked up there.
+    """
+
+    def __init__(
+        self,
+        name,
+        timeout: float,
+        redis_url=None,
+        redis_sentinels=[],
+        redis_cluster=False,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.users = (
+            AsyncRedisDict(
+                name,
+                redis_url,
+                redis_sentinels=redis_sentinels,
+                redis_cluster=redis_cluster,
+            )
+            if redis_url
+            else None
+        )
+        self.redis = self.users.redis if self.users else None
+
+        self._users: dict[str, dict] = {}
+        self._last_seen: dict[str, float] = {}
+
+    def _get_last_seen_key(self) -> str:
+        return f"{self.name}:last_seen"
+
+    async def set(self, sid, user: dict):
+        self._users[sid] = user
+        now = time.time()
+
+        if self.redis:
+            pipe = self.redis.pipeline()
+            pipe.hset(self.name, sid, json.dumps(user))
+            pipe.zadd(self._get_last_seen_key(), {sid: now})
+            await pipe.execute()
+        else:
+            self._last_seen[sid] = now
+
+    async def delete(self, sid) -> bool:
+        removed = self._users.pop(sid, None) is not None
+        self._last_seen.pop(sid, None)
+
+        if self.redis:
+            pipe = self.redis.pipeline()
+            pipe.hdel(self.name, sid)
+            pipe.zrem(self._get_last_seen_key(), sid)
+            removed = (await pipe.execute())[0] > 0 or removed
+
+        return removed
+
+    async def contains(self, sid) -> bool:
+        if sid in self._users:
+            return True
+        return bool(self.users and await self.users.contains(sid))
+
+    async def get(self, sid, default=None) -> Optional[dict]:
+        if sid in self._users:
+            return self._users[sid]
+
+        if self.users:
+            return await self.users.get(sid, default)
+        return default
+
+    def get_sync(self, sid, default=None) -> Optional[dict]:
+        """Blocking get(), for call sites that can't await."""
+        if sid in self._users:
+            return self._users[sid]
+
+        if self.users:
+            return self.users.sync.get(sid, default)
+        return default
+
+    async def get_many(self, sids: List[str]) -> List[Optional[dict]]:
+        """The users of several sessions (None if unknown), in one round trip."""
+        users = {sid: self._users[sid] for sid in sids if sid in self._users}
+
+        remote_sids = [sid for sid in sids if sid not in users]
+        if self.users and remote_sids:
+            users.update(await self.users.mget(remote_sids))
+
+        return [users.get(sid) for sid in sids]
+
+    async def touch(self, sid):
+        """Mark a session as seen now (a heartbeat)."""
+        now = time.time()
+
+        if not self.redis:
+            if sid in self._users:
+                self._last_seen[sid] = now
+            return
+
+        if not await self.redis.zadd(
+            self._get_last_seen_key(), {sid: now}, xx=True, ch=True
+        ):
+            # Reaped while this process was unresponsive, store it again
+            if sid in self._users:
+                await self.set(sid, self._users[sid])
+
+    async def seed_last_seen(self) -> int:
+        """
+        Score the sessions stored without a last-seen time (by versions that
+        kept it in the user entry as "last_seen_at"), so reap() expires them
+        too. Returns how many were scored.
+        """
+        if not self.redis:
+            return 0
+
+        scored = set(await self.redis.zrange(self._get_last_seen_key(), 0, -1))
+        now = time.time()
+        scores = {}
+        for sid, value in (await self.redis.hgetall(self.name)).items():
+            if sid not in scored:
+                user = _loads(sid, value)
+                scores[sid] = (
+                    user.get("last_seen_at") if isinstance(user, dict) else None
+                ) or now
+
+        if scores:
+            await self.redis.zadd(self._get_last_seen_key(), scores, nx=True)
+        return len(scores)
+
+    async def reap(self) -> List[Tuple[str, Optional[dict]]]:
+        """Remove the sessions not seen within the timeout, return them."""
+        cutoff = time.time() - self.timeout
+
+        if not self.redis:
+            sids = [sid for sid, at in self._last_seen.items() if at < cutoff]
+            reaped = [(sid, self._users.get(sid)) for sid in sids]
+            for sid in sids:
+                self._users.pop(sid, None)
+                self._last_seen.pop(sid, None)
+            return reaped
+
+        sids = await self.redis.zrangebyscore(
+            self._get_last_seen_key(), "-inf", f"({cutoff}"
+        )
+        if not sids:
+            return []
+
+        pipe = self.redis.pipeline()
+        pipe.hmget(self.name, sids)
+        pipe.hdel(self.name, *sids)
+        pipe.zrem(self._get_last_seen_key(), *sids)
+        values = (await pipe.execute())[0]
+
+        for sid in sids:
+            self._users.pop(sid, None)
+
+        return [
+            (sid, _loads(sid, value) if value is not None else None)
+            for sid, value in zip(sids, values)
+        ]
+
+
+class UsagePool:
+    """
+    Which sessions used which model, and when they last did.
+
+    With Redis, one sorted set holds a "<sid>:<model_id>" member per session
+    and model, scored by the time of its last usage event, so each event is
+    one ZADD, the models in use are read with one ZRANGEBYSCORE and expired
+    usage is removed with one ZREMRANGEBYSCORE.
+    """
+
+    def __init__(
+        self,
+        name,
+        timeout: float,
+        redis_url=None,
+        redis_sentinels=[],
+        redis_cluster=False,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.redis = (
+            get_redis_connection(
+                redis_url,
+                redis_sentinels,
+                redis_cluster=redis_cluster,
+                async_mode=True,
+                decode_responses=True,
+            )
+            if redis_url
+            else None
+        )
+
+        self._usage: dict[str, float] = {}
+        # Models used by the sessions of this process, for clean up on disconnect
+        self._session_models: dict[str, set[str]] = {}
+
+    @staticmethod
+    def _get_member(sid: str, model_id: str) -> str:
+        # Session ids never contain ":", model ids might
+        return f"{sid}:{model_id}"
+
+    async def touch(self, sid: str, model_id: str):
+        member = self._get_member(sid, model_id)
+        self._session_models.setdefault(sid, set()).add(model_id)
+
+        if self.redis:
+            await self.redis.zadd(self.name, {member: time.time()})
+        else:
+            self._usage[member] = time.time()
+
+    async def get_model_ids(self) -> List[str]:
+        """The models used by any session within the timeout."""
+        cutoff = time.time() - self.timeout
+
+        if self.redis:
+            members = await self.redis.zrangebyscore(self.name, cutoff, "+inf")
+        else:
+            members = [member for member, at in self._usage.items() if at >= cutoff]
+
+        return list(dict.fromkeys(member.split(":", 1)[1] for member in members))
+
+    async def remove_session(self, sid: str):
+        members = [
+            self._get_member(sid, model_id)
+            for model_id in self._session_models.pop(sid, set())
+        ]
+        if not members:
+            return
+
+        if self.redis:
+            await self.redis.zrem(self.name, *members)
+        else:
+            for member in members:
+                self._usage.pop(member, None)
+
+    async def reap(self) -> int:
+        """Remove usage older than the timeout, return how much was removed."""
+        cutoff = time.time() - self.timeout
+
+        if self.redis:
+            return await self.redis.zremrangebyscore(self.name, "-inf", f"({cutoff}")
+
+        members = [member for member, at in self._usage.items() if at < cutoff]
+        for member in members:
+            del self._usage[member]
+        return len(members)
+
+
+class ModelRegistry:
+    """
+    The models built by get_all_models, shared between replicas through Redis.
+
+    Reads are served from an in-process snapshot, so lookups per request are
+    plain dict lookups that never wait on Redis. set() stores the models in
+    an AsyncRedisDict together with a new version from a counter, in one
+    transaction, and publishes the version. A listener thread reloads the
+    snapshot with the blocking client, off the event loop, whenever any
+    replica publishes, the stored version changes or it reconnects. Only the
+    first read, if it comes before the listener loaded anything, goes to
+    Redis itself.
+    """
+
+    VERSION_FIELD = "__version__"
+
+    def __init__(self, name, redis_url, redis_sentinels=[], redis_cluster=False):
+        self.name = name
+        self.models = AsyncRedisDict(
+            name,
+            redis_url,
+            redis_sentinels=redis_sentinels,
+            redis_cluster=redis_cluster,
+        )
+
+        self._models = {}
+        self._version = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+        threading.Thread(
+            target=self._listen_for_updates,
+            name="models-redis-listener",
+            daemon=True,
+        ).start()
+
+    def _get_channel(self) -> str:
+        return f"{self.name}:updates"
+
+    def _get_version_key(self) -> str:
+        return f"{self.name}:version"
+
+    def _get_redis_version(self) -> Optional[str]:
+        return self.models.sync.get(self.VERSION_FIELD)
+
+    def _listen_for_updates(self):
+        while True:
+            pubsub = None
+            try:
+                pubsub = self.models.sync.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._get_channel())
+
+                # Models may have been rebuilt before we were subscribed
+                self._load()
+
+                last_check = time.monotonic()
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        if message["data"] != self._version:
+                            self._load()
+
+                    if time.monotonic() - last_check >= REDIS_CONFIG_SYNC_INTERVAL:
+                        last_check = time.monotonic()
+                        if self._get_redis_version() != self._version:
+                            self._load()
+            except Exception as e:
+                log.warning(f"Model registry listener disconnected from Redis: {e}")
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+            time.sleep(max(REDIS_CONFIG_SYNC_INTERVAL / 10, 1))
+
+    def _load(self):
+        models = dict(self.models.sync.items())
+        version = models.pop(self.VERSION_FIELD, None)
+        models = {
+            model_id: model for model_id, model in models.items() if model is not None
+        }
+
+        with self._lock:
+            # Never replace a newer snapshot stored by set() during the read
+            if (
+                self._loaded
+                and version is not None
+                and self._version is not None
+                and int(version) < int(self._version)
+            ):
+                return
+
+            self._models = models
+            self._version = version
+            self._loaded = True
+
+    def _get_models(self) -> dict:
+        if not self._loaded:
+            try:
+                self._load()
+            except Exception as e:
+                log.warning(f"Failed to load models from Redis: {e}")
+        return self._models
+
+    async def set(self, mapping: dict):
+        version = str(await self.models.redis.incr(self._get_version_key()))
+        await self.models.replace({**mapping, self.VERSION_FIELD: version})
+
+        with self._lock:
+            self._models = dict(mapping)
+            self._version = version
+            self._loaded = True
+
+        await self.models.redis.publish(self._get_channel(), version)
+
+    def __getitem__(self, key):
+        return self._get_models()[key]
+
+    def __contains__(self, key):
+        return key in self._get_models()
+
+    def __iter__(self):
+        return iter(list(self._get_models()))
+
+    def __len__(self):
+        return len(self._get_models())
+
+    def get(self, key, default=None):
+        return self._get_models().get(key, default)
+
+    def keys(self):
+        return list(self._get_models().keys())
+
+    def values(self):
+        return list(self._get_models().values())
+
+    def items(self):
+        return list(self._get_models().items())
+
+
 class YdocManager:
+    """
+    Yjs update logs and users of collaboratively edited documents.
+
+    Updates are stored as base64 encoded bytes (in a Redis list, or in memory)
+    and squashed into one full-state update every COMPACTION_THRESHOLD
+    updates. snapshot_handler(document_id, state), if given, is called with
+    the full state before a document is cleared, so it can be persisted.
+    """
+
     COMPACTION_THRESHOLD = 500
 
     def __init__(
         self,
         redis=None,
         redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:ydoc:documents",
+        snapshot_handler: Optional[Callable[[str, bytes], Awaitable[None]]] = None,
     ):
         self._updates = {}
         self._users = {}
+        self._snapshot_at = {}
         self._redis = redis
         self._redis_key_prefix = redis_key_prefix
+        self._snapshot_handler = snapshot_handler
+
+    @staticmethod
+    def _encode_update(update: bytes) -> str:
+        return base64.b64encode(update).decode("ascii")
+
+    @staticmethod
+    def _decode_update(raw) -> bytes:
+        if isinstance(raw, bytes):
+            raw = raw.decode("ascii")
+        if raw.startswith("["):
+            # Legacy JSON array of ints
+            return bytes(json.loads(raw))
+        return base64.b64decode(raw)
 
     async def append_to_updates(self, document_id: str, update: bytes):
         document_id = document_id.replace(":", "_")
+        update = bytes(update)
+
         if self._redis:
             redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.rpush(redis_key, json.dumps(list(update)))
-            list_len = await self._redis.llen(redis_key)
+            # RPUSH returns the new length, no separate LLEN round trip
+            list_len = await self._redis.rpush(redis_key, self._encode_update(update))
             if list_len >= self.COMPACTION_THRESHOLD:
                 await self._compact_updates_redis(document_id)
         else:
@@ -146,31 +811,41 @@ class YdocManager:
                 self._compact_updates_memory(document_id)
 
     async def _compact_updates_redis(self, document_id: str):
-        """Rolling compaction: squash oldest half into one snapshot."""
+        """Squash the update log into one full-state update."""
         redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-        all_updates = await self._redis.lrange(redis_key, 0, -1)
-        if len(all_updates) <= 1:
+        lock_key = f"{self._redis_key_prefix}:{document_id}:compacting"
+
+        # One compaction per document at a time, across replicas
+        if not await self._redis.set(lock_key, "1", nx=True, ex=30):
             return
-        mid = len(all_updates) // 2
-        ydoc = Y.Doc()
-        for raw in all_updates[:mid]:
-            ydoc.apply_update(bytes(json.loads(raw)))
-        snapshot = json.dumps(list(ydoc.get_update()))
-        pipe = self._redis.pipeline()
-        pipe.delete(redis_key)
-        pipe.rpush(redis_key, snapshot, *all_updates[mid:])
-        await pipe.execute()
+
+        try:
+            all_updates = await self._redis.lrange(redis_key, 0, -1)
+            if len(all_updates) <= 1:
+                return
+
+            ydoc = Y.Doc()
+            for raw in all_updates:
+                ydoc.apply_update(self._decode_update(raw))
+            snapshot = self._encode_update(ydoc.get_update())
+
+            # Keep whatever was appended in the meantime
+            pipe = self._redis.pipeline()
+            pipe.ltrim(redis_key, len(all_updates), -1)
+            pipe.lpush(redis_key, snapshot)
+            await pipe.execute()
+        finally:
+            await self._redis.delete(lock_key)
 
     def _compact_updates_memory(self, document_id: str):
-        """Rolling compaction: squash oldest half into one snapshot."""
+        """Squash the update log into one full-state update."""
         updates = self._updates.get(document_id, [])
         if len(updates) <= 1:
             return
-        mid = len(updates) // 2
         ydoc = Y.Doc()
-        for update in updates[:mid]:
+        for update in updates:
             ydoc.apply_update(bytes(update))
-        self._updates[document_id] = [ydoc.get_update()] + updates[mid:]
+        self._updates[document_id] = [ydoc.get_update()]
 
     async def get_updates(self, document_id: str) -> List[bytes]:
         document_id = document_id.replace(":", "_")
@@ -178,10 +853,45 @@ class YdocManager:
         if self._redis:
             redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
             updates = await self._redis.lrange(redis_key, 0, -1)
-            return [bytes(json.loads(update)) for update in updates]
+            return [self._decode_update(update) for update in updates]
         else:
             return self._updates.get(document_id, [])
 
+    async def get_state(
+        self, document_id: str, state_vector: Optional[bytes] = None
+    ) -> bytes:
+        """
+        The document as a single update, or only what is missing from a
+        client's state vector.
+        """
+        ydoc = Y.Doc()
+        for update in await self.get_updates(document_id):
+            ydoc.apply_update(bytes(update))
+
+        if state_vector:
+            return ydoc.get_update(bytes(state_vector))
+        return ydoc.get_update()
+
+    async def get_state_vector(self, document_id: str) -> bytes:
+        ydoc = Y.Doc()
+        for update in await self.get_updates(document_id):
+            ydoc.apply_update(bytes(update))
+        return ydoc.get_state()
+
+    def is_snapshot_due(self, document_id: str, interval: float) -> bool:
+        """
+        Whether a snapshot of the document should be persisted now, at most
+        every interval seconds (per process).
+        """
+        document_id = document_id.replace(":", "_")
+
+        now = time.monotonic()
+        if now - self._snapshot_at.get(document_id, 0.0) < interval:
+            return False
+
+        self._snapshot_at[document_id] = now
+        return True
+
     async def document_exists(self, document_id: str) -> bool:
         document_id = document_id.replace(":", "_")
 
@@ -249,6 +959,15 @@ class YdocManager:
     async def clear_document(self, document_id: str):
         document_id = document_id.replace(":", "_")
 
+        if self._snapshot_handler:
+            try:
+                if await self.document_exists(document_id):
+                    await self._snapshot_handler(
+                        document_id, await self.get_state(document_id)
+                    )
+            except Exception as e:
+                log.error(f"Error persisting snapshot of document {document_id}: {e}")
+
         if self._redis:
             redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
             await self._redis.delete(redis_key)
@@ -259,3 +978,113 @@ class YdocManager:
                 del self._updates[document_id]
             if document_id in self._users:
                 del self._users[document_id]
+        self._snapshot_at.pop(document_id, None)
+
+
+class DocumentSaveCoalescer:
+    """
+    Debounced writes of collaboratively edited documents.
+
+    Each document keeps only the latest (data, user) scheduled for it and is
+    saved with save_handler(document_id, data, user) once no update arrived
+    for debounce_interval seconds, or max_wait seconds after the first
+    unsaved update. Saves of a document never overlap.
+
+    Also caches access decisions per (session, document) until the session
+    leaves the document or disconnects.
+
+    State is per process.
+    """
+
+    def __init__(
+        self,
+        save_handler: Callable[[str, dict, dict], Awaitable[None]],
+        debounce_interval: float = 1.0,
+        max_wait: float = 10.0,
+    ):
+        self.debounce_interval = debounce_interval
+        self.max_wait = max_wait
+        self._save_handler = save_handler
+        self._pending: dict[str, tuple[dict, dict]] = {}
+        self._first_scheduled_at: dict[str, float] = {}
+        self._deadlines: dict[str, float] = {}
+        self._timers: dict[str, asyncio.Task] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        # Flushes holding or waiting for each lock, dropped with the last one
+        self._lock_users: dict[str, int] = {}
+        self._access: dict[tuple[str, str], bool] = {}
+
+    def get_access(self, sid: str, document_id: str) -> Optional[bool]:
+        return self._access.get((sid, document_id))
+
+    def set_access(self, sid: str, document_id: str, allowed: bool):
+        self._access[(sid, document_id)] = allowed
+
+    def forget_access(self, sid: str, document_id: Optional[str] = None) -> List[str]:
+        """
+        Drop the cached access of a session (to one document, or to all of
+        them) and return the ids of the documents it was cached for.
+        """
+        keys = [
+            key
+            for key in self._access
+            if key[0] == sid and (document_id is None or key[1] == document_id)
+        ]
+        for key in keys:
+            del self._access[key]
+        return [key[1] for key in keys]
+
+    def schedule(self, document_id: str, data: dict, user: dict):
+        now = time.monotonic()
+        self._pending[document_id] = (data, user)
+
+        first_scheduled_at = self._first_scheduled_at.setdefault(document_id, now)
+        self._deadlines[document_id] = min(
+            now + self.debounce_interval, first_scheduled_at + self.max_wait
+        )
+
+        # One timer per document, pushed back by later updates
+        if document_id not in self._timers:
+            self._timers[document_id] = asyncio.create_task(
+                self._run_timer(document_id)
+            )
+
+    async def _run_timer(self, document_id: str):
+        while True:
+            delay = self._deadlines.get(document_id, 0.0) - time.monotonic()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+
+        self._timers.pop(document_id, None)
+        await self.flush(document_id)
+
+    async def flush(self, document_id: str):
+        """Save the latest scheduled state of a document now, if any."""
+        timer = self._timers.pop(document_id, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+
+        self._first_scheduled_at.pop(document_id, None)
+        self._deadlines.pop(document_id, None)
+        entry = self._pending.pop(document_id, None)
+        if entry is None:
+            return
+
+        lock = self._locks.setdefault(document_id, asyncio.Lock())
+        self._lock_users[document_id] = self._lock_users.get(document_id, 0) + 1
+        try:
+            async with lock:
+                try:
+                    await self._save_handler(document_id, *entry)
+                except Exception as e:
+                    log.exception(f"Failed to save document {document_id}: {e}")
+        finally:
+            self._lock_users[document_id] -= 1
+            if not self._lock_users[document_id]:
+                del self._lock_users[document_id]
+                del self._locks[document_id]
+
+    async def flush_all(self):
+        for document_id in list(self._pending.keys()):
+            await self.flush(document_id)
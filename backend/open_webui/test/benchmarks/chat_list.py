@@ -0,0 +1,175 @@
+"""
+Benchmark chat list queries against full-row loading.
+
+Seeds a throwaway SQLite database with one user owning many chats, each with
+a large chat blob (an inline base64 image and a long history), then times
+the sidebar/folder/search list queries and measures peak Python memory,
+comparing full ChatModel rows with the projected ChatListItemModel rows.
+
+Usage (from backend/):
+
+    DATA_DIR=/tmp/chat-list-bench PYTHONPATH=. \\
+        python -m open_webui.test.benchmarks.chat_list --chats 3000
+"""
+
+import argparse
+import base64
+import os
+import statistics
+import time
+import tracemalloc
+import uuid
+
+
+def get_chat_blob(index: int, messages: int, image_size: int) -> dict:
+    image = base64.b64encode(os.urandom(image_size)).decode()
+    history = {}
+    parent_id = None
+    for i in range(messages):
+        message_id = str(uuid.uuid4())
+        history[message_id] = {
+            "id": message_id,
+            "parentId": parent_id,
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": f"Message {i} of chat {index}. " * 40,
+            "files": (
+                [{"type": "image", "url": f"data:image/png;base64,{image}"}]
+                if i == 0
+                else []
+            ),
+        }
+        parent_id = message_id
+    return {
+        "title": f"Chat {index}",
+        "history": {"messages": history, "currentId": parent_id},
+    }
+
+
+def measure(fn, repeat: int) -> tuple[float, float]:
+    """Median wall time (ms) and peak traced memory (MiB) of fn()."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--chats", type=int, default=3000)
+    parser.add_argument("--messages", type=int, default=10)
+    parser.add_argument("--image-size", type=int, default=64 * 1024)
+    parser.add_argument("--limit", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    import open_webui.config  # runs the database migrations
+    from sqlalchemy import insert, text
+
+    from open_webui.internal.db import get_db_context
+    from open_webui.models.chats import Chat, ChatModel, Chats
+
+    user_id = str(uuid.uuid4())
+    folder_id = str(uuid.uuid4())
+    now = int(time.time())
+
+    print(
+        f"Seeding {args.chats} chats ({args.messages} messages, "
+        f"{args.image_size // 1024} KiB image each)..."
+    )
+    with get_db_context() as db:
+        rows = []
+        for index in range(args.chats):
+            rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "title": f"Chat {index}",
+                    "chat": get_chat_blob(index, args.messages, args.image_size),
+                    "created_at": now - index,
+                    "updated_at": now - index,
+                    "archived": False,
+                    "pinned": index % 50 == 0,
+                    "meta": {"tags": ["bench"] if index % 2 == 0 else []},
+                    "folder_id": folder_id if index % 3 == 0 else None,
+                }
+            )
+            if len(rows) == 500:
+                db.execute(insert(Chat), rows)
+                rows = []
+        if rows:
+            db.execute(insert(Chat), rows)
+        db.commit()
+
+    def full_rows(query):
+        with get_db_context() as db:
+            return [ChatModel.model_validate(chat) for chat in query(db).all()]
+
+    cases = [
+        (
+            "list by user (all)",
+            lambda: full_rows(
+                lambda db: db.query(Chat)
+                .filter_by(user_id=user_id, archived=False)
+                .order_by(Chat.updated_at.desc())
+            ),
+            lambda: Chats.get_chat_list_by_user_id(user_id, limit=None),
+        ),
+        (
+            f"list by user (page of {args.limit})",
+            lambda: full_rows(
+                lambda db: db.query(Chat)
+                .filter_by(user_id=user_id, archived=False)
+                .order_by(Chat.updated_at.desc())
+                .limit(args.limit)
+            ),
+            lambda: Chats.get_chat_list_by_user_id(user_id, limit=args.limit),
+        ),
+        (
+            "folder (all)",
+            lambda: full_rows(
+                lambda db: db.query(Chat)
+                .filter_by(user_id=user_id, folder_id=folder_id, archived=False)
+                .order_by(Chat.updated_at.desc())
+            ),
+            lambda: Chats.get_chats_by_folder_id_and_user_id(
+                folder_id, user_id, limit=None
+            ),
+        ),
+        (
+            "tag",
+            lambda: full_rows(
+                lambda db: db.query(Chat)
+                .filter_by(user_id=user_id)
+                .filter(
+                    text(
+                        "EXISTS (SELECT 1 FROM json_each(Chat.meta, '$.tags') "
+                        "WHERE json_each.value = 'bench')"
+                    )
+                )
+            ),
+            lambda: Chats.get_chat_list_by_user_id_and_tag_name(user_id, "bench"),
+        ),
+    ]
+
+    print(
+        f"\n{'query':<28} {'full ms':>9} {'list ms':>9} "
+        f"{'full MiB':>9} {'list MiB':>9} {'speedup':>8}"
+    )
+    for name, full, projected in cases:
+        full_ms, full_mib = measure(full, args.repeat)
+        list_ms, list_mib = measure(projected, args.repeat)
+        print(
+            f"{name:<28} {full_ms:>9.1f} {list_ms:>9.1f} "
+            f"{full_mib:>9.1f} {list_mib:>9.1f} {full_ms / list_ms:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+from pgvector import HalfVector
+
+from open_webui.retrieval.utils import cosine_similarities
+from open_webui.retrieval.vector.dbs.pgvector import PgvectorClient, vector_to_list
+
+
+def make_client(rows):
+    client = PgvectorClient.__new__(PgvectorClient)
+    client.session = MagicMock()
+    client.session.execute.return_value.all.return_value = rows
+    return client
+
+
+class TestGetVectors:
+    """Stored vectors are returned as plain float lists for both column types"""
+
+    def test_vector_to_list(self):
+        assert vector_to_list(HalfVector([1.0, 2.0])) == [1.0, 2.0]
+        assert vector_to_list(np.array([1.0, 2.0], dtype=np.float32)) == [1.0, 2.0]
+        assert vector_to_list([1.0, 2.0]) == [1.0, 2.0]
+
+    def test_get_vectors_halfvec(self):
+        client = make_client(
+            [SimpleNamespace(id="a", vector=HalfVector([1.0, 0.0, 0.0]))]
+        )
+
+        vectors = client.get_vectors("collection", ["a"])
+
+        assert vectors == {"a": [1.0, 0.0, 0.0]}
+        assert cosine_similarities([1.0, 0.0], list(vectors.values())) == [1.0]
+
+    def test_get_vectors_vector(self):
+        client = make_client(
+            [SimpleNamespace(id="a", vector=np.array([0.0, 1.0], dtype=np.float32))]
+        )
+
+        assert client.get_vectors("collection", ["a"]) == {"a": [0.0, 1.0]}
+
+    def test_aget_vectors_halfvec(self):
+        client = PgvectorClient.__new__(PgvectorClient)
+        result = MagicMock()
+        result.all.return_value = [
+            SimpleNamespace(id="a", vector=HalfVector([0.5, 0.5]))
+        ]
+        conn = MagicMock()
+        conn.execute = AsyncMock(return_value=result)
+        engine = MagicMock()
+        engine.connect.return_value.__aenter__ = AsyncMock(return_value=conn)
+        engine.connect.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch.object(client, "_get_async_engine", return_value=engine):
+            vectors = asyncio.run(client.aget_vectors("collection", ["a"]))
+
+        assert vectors == {"a": [0.5, 0.5]}
+        assert cosine_similarities([1.0, 1.0], list(vectors.values())) == [
+            pytest.approx(1.0)
+        ]
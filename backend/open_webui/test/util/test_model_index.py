@@ -0,0 +1,66 @@
+import asyncio
+import itertools
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from open_webui.socket.utils import ModelRegistry
+from open_webui.utils import models as models_utils
+
+
+def make_request(registry):
+    config = SimpleNamespace(
+        ENABLE_BASE_MODELS_CACHE=False,
+        ENABLE_EVALUATION_ARENA_MODELS=False,
+        DEFAULT_MODEL_METADATA={},
+    )
+    return SimpleNamespace(
+        app=SimpleNamespace(
+            state=SimpleNamespace(
+                config=config, MODELS=registry, BASE_MODELS=None, FUNCTIONS={}
+            )
+        )
+    )
+
+
+class TestGetAllModels:
+    """Unchanged models are neither rebuilt nor republished"""
+
+    def test_no_republish_when_only_created_changes(self):
+        clock = itertools.count(1000)
+
+        async def get_all_base_models(request, user=None):
+            # Like fetch_ollama_models, stamps every model with the fetch time
+            return [
+                {
+                    "id": "llama3:latest",
+                    "name": "llama3:latest",
+                    "object": "model",
+                    "created": next(clock),
+                    "owned_by": "ollama",
+                }
+            ]
+
+        registry = MagicMock(spec=ModelRegistry)
+        registry.__len__.return_value = 0
+
+        async def set_models(mapping):
+            registry.__len__.return_value = len(mapping)
+
+        registry.set = AsyncMock(side_effect=set_models)
+        request = make_request(registry)
+
+        with (
+            patch.object(models_utils, "model_index", models_utils.ModelIndex()),
+            patch.object(models_utils, "get_all_base_models", get_all_base_models),
+            patch.object(models_utils.Models, "get_all_models", return_value=[]),
+            patch.object(models_utils.Functions, "get_functions", return_value=[]),
+        ):
+            first = asyncio.run(models_utils.get_all_models(request))
+            second = asyncio.run(models_utils.get_all_models(request))
+
+            assert models_utils.model_index.stats["rebuilt"] == 0
+            assert models_utils.model_index.stats["reused"] == 1
+
+        assert [model["id"] for model in first] == ["llama3:latest"]
+        assert second == first
+        registry.set.assert_awaited_once()
@@ -1019,21 +1019,44 @@ async def search_chats(
             limit=count * 3,  # Fetch more for filtering
         )
 
+        # Ranked snippets from the full-text index, when available
+        snippets = Chats.get_chat_search_snippets_by_user_id(
+            user_id, [chat.id for chat in chats], query
+        )
+
+        # Skip the current chat to avoid showing it in search results, and
+        # apply date filters (updated_at is in seconds)
+        chats = [
+            chat
+            for chat in chats
+            if not (__chat_id__ and chat.id == __chat_id__)
+            and not (start_timestamp and chat.updated_at < start_timestamp)
+            and not (end_timestamp and chat.updated_at > end_timestamp)
+        ]
+
+        # Messages of the chats without an indexed snippet, in one query
+        chat_messages = Chats.get_chat_messages_by_chat_ids_and_user_id(
+            [chat.id for chat in chats if chat.id not in snippets], user_id
+        )
+
         results = []
         for chat in chats:
-            # Skip the current chat to avoid showing it in search results
-            if __chat_id__ and chat.id == __chat_id__:
-                continue
-
-            # Apply date filters (updated_at is in seconds)
-            if start_timestamp and chat.updated_at < start_timestamp:
-                continue
-            if end_timestamp and chat.updated_at > end_timestamp:
+            if chat.id in snippets:
+                results.append(
+                    {
+                        "id": chat.id,
+                        "title": chat.title,
+                        "snippet": snippets[chat.id]["snippet"],
+                        "updated_at": chat.updated_at,
+                    }
+                )
+                if len(results) >= count:
+                    break
                 continue
 
             # Find a matching message snippet
             snippet = ""
-            messages = chat.chat.get("history", {}).get("messages", {})
+            messages = chat_messages.get(chat.id, {})
             lower_query = query.lower()
 
             for msg_id, msg in messages.items():
@@ -4,7 +4,11 @@ from open_webui.models.groups import Groups
 
 
 from open_webui.config import DEFAULT_USER_PERMISSIONS
-import json
+from open_webui.utils.permission_cache import (
+    copy_permissions,
+    get_permission_paths,
+    permission_cache,
+)
 
 
 def fill_missing_permissions(
@@ -25,6 +29,40 @@ def fill_missing_permissions(
     return permissions
 
 
+def combine_permissions(
+    permissions: Dict[str, Any], group_permissions: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Combine permissions from multiple groups by taking the most permissive value."""
+    for key, value in group_permissions.items():
+        if isinstance(value, dict):
+            if key not in permissions:
+                permissions[key] = {}
+            permissions[key] = combine_permissions(permissions[key], value)
+        else:
+            if key not in permissions:
+                permissions[key] = value
+            else:
+                permissions[key] = (
+                    permissions[key] or value
+                )  # Use the most permissive value (True > False)
+    return permissions
+
+
+def get_group_permissions(user_id: str, db: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Get the permissions of all groups the user is a member of, merged into one
+    tree, from the permission cache.
+    """
+    entry = permission_cache.get(user_id)
+    if entry is None:
+        permissions = {}
+        for group in Groups.get_groups_by_member_id(user_id, db=db):
+            permissions = combine_permissions(permissions, group.permissions or {})
+        entry = permission_cache.set(user_id, permissions)
+
+    return entry
+
+
 def get_permissions(
     user_id: str,
     default_permissions: Dict[str, Any],
@@ -35,38 +73,23 @@ def get_permissions(
     If a permission is defined in multiple groups, the most permissive value is used (True > False).
     Permissions are nested in a dict with the permission key as the key and a boolean as the value.
     """
+    entry = get_group_permissions(user_id, db=db)
 
-    def combine_permissions(
-        permissions: Dict[str, Any], group_permissions: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Combine permissions from multiple groups by taking the most permissive value."""
-        for key, value in group_permissions.items():
-            if isinstance(value, dict):
-                if key not in permissions:
-                    permissions[key] = {}
-                permissions[key] = combine_permissions(permissions[key], value)
-            else:
-                if key not in permissions:
-                    permissions[key] = value
-                else:
-                    permissions[key] = (
-                        permissions[key] or value
-                    )  # Use the most permissive value (True > False)
-        return permissions
-
-    user_groups = Groups.get_groups_by_member_id(user_id, db=db)
+    effective = entry["effective"]
+    if effective is None or effective[0] is not default_permissions:
+        # Copy default permissions to avoid modifying the original dict
+        permissions = copy_permissions(default_permissions)
 
-    # Deep copy default permissions to avoid modifying the original dict
-    permissions = json.loads(json.dumps(default_permissions))
+        # Combine permissions from all user groups
+        permissions = combine_permissions(permissions, entry["permissions"])
 
-    # Combine permissions from all user groups
-    for group in user_groups:
-        permissions = combine_permissions(permissions, group.permissions or {})
+        # Ensure all fields from default_permissions are present and filled in
+        permissions = fill_missing_permissions(permissions, default_permissions)
 
-    # Ensure all fields from default_permissions are present and filled in
-    permissions = fill_missing_permissions(permissions, default_permissions)
+        effective = (default_permissions, permissions)
+        entry["effective"] = effective
 
-    return permissions
+    return copy_permissions(effective[1])
 
 
 def has_permission(
@@ -81,30 +104,21 @@ def has_permission(
 
     Permission keys can be hierarchical and separated by dots ('.').
     """
-
-    def get_permission(permissions: Dict[str, Any], keys: List[str]) -> bool:
-        """Traverse permissions dict using a list of keys (from dot-split permission_key)."""
-        for key in keys:
-            if key not in permissions:
-                return False  # If any part of the hierarchy is missing, deny access
-            permissions = permissions[key]  # Traverse one level deeper
-
-        return bool(permissions)  # Return the boolean at the final level
-
-    permission_hierarchy = permission_key.split(".")
-
     # Retrieve user group permissions
-    user_groups = Groups.get_groups_by_member_id(user_id, db=db)
-
-    for group in user_groups:
-        if get_permission(group.permissions or {}, permission_hierarchy):
-            return True
+    if get_group_permissions(user_id, db=db)["paths"].get(permission_key):
+        return True
 
     # Check default permissions afterward if the group permissions don't allow it
-    default_permissions = fill_missing_permissions(
-        default_permissions, DEFAULT_USER_PERMISSIONS
-    )
-    return get_permission(default_permissions, permission_hierarchy)
+    default_paths = permission_cache.get_default_paths(default_permissions)
+    if default_paths is None:
+        default_paths = permission_cache.set_default_paths(
+            default_permissions,
+            get_permission_paths(
+                fill_missing_permissions(default_permissions, DEFAULT_USER_PERMISSIONS)
+            ),
+        )
+
+    return default_paths.get(permission_key, False)
 
 
 def has_access(
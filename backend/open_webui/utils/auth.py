@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import uuid
 import jwt
@@ -23,13 +24,15 @@ from opentelemetry import trace
 
 
 from open_webui.utils.access_control import has_permission
-from open_webui.models.users import Users
+from open_webui.utils.user_cache import user_cache
+from open_webui.models.users import UserModel, Users
 from open_webui.models.auths import Auths
 
 
 from open_webui.constants import ERROR_MESSAGES
 
 from open_webui.env import (
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL,
     ENABLE_PASSWORD_VALIDATION,
     OFFLINE_MODE,
     LICENSE_BLOB,
@@ -328,7 +331,7 @@ async def get_current_user(
                     detail="Invalid token",
                 )
 
-            user = Users.get_user_by_id(data["id"])
+            user = get_cached_user_by_id(data["id"])
             if user is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -353,10 +356,9 @@ async def get_current_user(
                     current_span.set_attribute("client.user.role", user.role)
                     current_span.set_attribute("client.auth.type", "jwt")
 
-                # Refresh the user's last active timestamp asynchronously
-                # to prevent blocking the request
-                if background_tasks:
-                    background_tasks.add_task(Users.update_last_active_by_id, user.id)
+                # Refresh the user's last active timestamp; this only records
+                # it in memory, see Users.flush_last_active
+                Users.update_last_active_by_id(user.id)
             return user
         else:
             raise HTTPException(
@@ -378,9 +380,34 @@ async def get_current_user(
         raise e
 
 
+def get_cached_user_by_id(user_id: str) -> Optional[UserModel]:
+    user = user_cache.get_user(user_id)
+    if user is not None:
+        return UserModel.model_validate(user)
+
+    user = Users.get_user_by_id(user_id)
+    if user is not None:
+        user_cache.set_user(user.model_dump(mode="json"))
+    return user
+
+
+def get_cached_user_by_api_key(api_key: str) -> Optional[UserModel]:
+    user_id = user_cache.get_user_id_by_api_key(api_key)
+    if user_id is not None:
+        user = get_cached_user_by_id(user_id)
+        if user is not None:
+            return user
+
+    user = Users.get_user_by_api_key(api_key)
+    if user is not None:
+        user_cache.set_api_key(api_key, user.id)
+        user_cache.set_user(user.model_dump(mode="json"))
+    return user
+
+
 def get_current_user_by_api_key(request, api_key: str):
     # Each function call manages its own short-lived session internally
-    user = Users.get_user_by_api_key(api_key)
+    user = get_cached_user_by_api_key(api_key)
 
     if user is None:
         raise HTTPException(
@@ -408,6 +435,7 @@ def get_current_user_by_api_key(request, api_key: str):
         current_span.set_attribute("client.user.role", user.role)
         current_span.set_attribute("client.auth.type", "api_key")
 
+    # Buffered in memory and written in batches, see Users.flush_last_active
     Users.update_last_active_by_id(user.id)
     return user
 
@@ -462,3 +490,13 @@ def create_admin_user(email: str, password: str, name: str = "Admin"):
     except Exception as e:
         log.error(f"Error creating admin account: {e}")
         return None
+
+
+async def periodic_last_active_flush():
+    """Write buffered user last_active_at timestamps on a fixed interval."""
+    while True:
+        await asyncio.sleep(DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(Users.flush_last_active)
+        except Exception as e:
+            log.warning(f"Failed to flush last active timestamps: {e}")
@@ -0,0 +1,275 @@
+import logging
+import random
+import time
+from typing import AsyncIterator, Optional
+from urllib.parse import urlparse
+
+from open_webui.env import (
+    UPSTREAM_BALANCER_EJECT_FAILURES,
+    UPSTREAM_BALANCER_EJECT_SECONDS,
+    UPSTREAM_BALANCER_STRATEGY,
+)
+
+log = logging.getLogger(__name__)
+
+
+class _UpstreamStats:
+    def __init__(self):
+        self.requests = 0
+        self.in_flight = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.ewma_latency: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+
+class UpstreamRequest:
+    """
+    One request to an upstream, counted as in flight until released.
+
+    record() reports the outcome once the response (or the error) arrives;
+    release() ends the request, for streams after the last chunk. Both only
+    take effect once.
+    """
+
+    def __init__(self, balancer: "UpstreamBalancer", url: str):
+        self.url = url
+        self.started_at = time.monotonic()
+        self._balancer = balancer
+        self._recorded = False
+        self._released = False
+
+    def record(self, success: bool, error: Optional[str] = None):
+        if self._recorded:
+            return
+        self._recorded = True
+
+        latency = time.monotonic() - self.started_at
+        self._balancer._record(self.url, success, latency, error)
+
+    def release(self):
+        if self._released:
+            return
+        self._released = True
+
+        self._balancer._get_stats(self.url).in_flight -= 1
+
+
+class UpstreamBalancer:
+    """
+    Picks which of several connections (base URLs) serving the same model a
+    request goes to, and tracks in-flight requests, response latency and
+    failures per base URL.
+
+    Strategies:
+    - random: uniformly at random.
+    - weighted: at random, proportional to each connection's weight.
+    - least_outstanding: fewest in-flight requests (streams included) per
+      unit of weight.
+    - ewma: lowest exponentially weighted time to response, scaled by the
+      in-flight requests and weight.
+
+    Connections failing UPSTREAM_BALANCER_EJECT_FAILURES times in a row
+    (connection errors and 5xx responses) are passively ejected for
+    UPSTREAM_BALANCER_EJECT_SECONDS, unless every candidate is ejected. The
+    next request after that probes the connection again; another failure
+    ejects it right away.
+
+    State is per process.
+    """
+
+    def __init__(
+        self,
+        strategy: str = "least_outstanding",
+        eject_failures: int = 3,
+        eject_seconds: float = 30.0,
+        ewma_decay: float = 0.3,
+    ):
+        self.strategy = strategy
+        self.eject_failures = eject_failures
+        self.eject_seconds = eject_seconds
+        self.ewma_decay = ewma_decay
+        self._stats: dict[str, _UpstreamStats] = {}
+
+    def _get_stats(self, url: str) -> _UpstreamStats:
+        stats = self._stats.get(url)
+        if stats is None:
+            stats = _UpstreamStats()
+            self._stats[url] = stats
+        return stats
+
+    def _record(
+        self, url: str, success: bool, latency: float, error: Optional[str] = None
+    ):
+        stats = self._get_stats(url)
+
+        if success:
+            stats.consecutive_failures = 0
+            if stats.ewma_latency is None:
+                stats.ewma_latency = latency
+            else:
+                stats.ewma_latency = (
+                    self.ewma_decay * latency
+                    + (1 - self.ewma_decay) * stats.ewma_latency
+                )
+            return
+
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        stats.last_error = error
+
+        if (
+            self.eject_failures > 0
+            and stats.consecutive_failures >= self.eject_failures
+        ):
+            stats.ejected_until = time.monotonic() + self.eject_seconds
+            stats.ejections += 1
+            log.warning(
+                f"Ejecting upstream {get_display_url(url)} for {self.eject_seconds}s "
+                f"after {stats.consecutive_failures} consecutive failures: {error}"
+            )
+
+    def select(self, urls: list[str], weights: Optional[list] = None) -> int:
+        """
+        Return the index in urls of the connection to send the next request to.
+        """
+        if len(urls) <= 1:
+            return 0
+
+        weights = [get_weight(weight) for weight in (weights or [1.0] * len(urls))]
+
+        now = time.monotonic()
+        candidates = [
+            idx
+            for idx, url in enumerate(urls)
+            if weights[idx] > 0 and self._get_stats(url).ejected_until <= now
+        ]
+        if not candidates:
+            candidates = [idx for idx in range(len(urls)) if weights[idx] > 0]
+        if not candidates:
+            candidates = list(range(len(urls)))
+            weights = [1.0] * len(urls)
+
+        if len(candidates) == 1 or self.strategy == "random":
+            return random.choice(candidates)
+
+        if self.strategy == "weighted":
+            return random.choices(
+                candidates, weights=[weights[idx] for idx in candidates]
+            )[0]
+
+        if self.strategy == "ewma":
+            latencies = [
+                self._get_stats(urls[idx]).ewma_latency
+                for idx in candidates
+                if self._get_stats(urls[idx]).ewma_latency is not None
+            ]
+            # Connections without samples yet are assumed to be average
+            default_latency = sum(latencies) / len(latencies) if latencies else 0.0
+
+            def get_score(idx):
+                stats = self._get_stats(urls[idx])
+                latency = (
+                    stats.ewma_latency
+                    if stats.ewma_latency is not None
+                    else default_latency
+                )
+                return latency * (stats.in_flight + 1) / weights[idx]
+
+        else:
+
+            def get_score(idx):
+                return self._get_stats(urls[idx]).in_flight / weights[idx]
+
+        scores = {idx: get_score(idx) for idx in candidates}
+        best = min(scores.values())
+        return random.choice([idx for idx, score in scores.items() if score == best])
+
+    def acquire(self, url: str) -> UpstreamRequest:
+        stats = self._get_stats(url)
+        stats.requests += 1
+        stats.in_flight += 1
+        return UpstreamRequest(self, url)
+
+    async def wrap_stream(
+        self, stream: AsyncIterator, upstream: UpstreamRequest
+    ) -> AsyncIterator:
+        """Keep the request in flight until the stream is consumed or closed."""
+        try:
+            async for chunk in stream:
+                yield chunk
+        except Exception as e:
+            self._record(upstream.url, False, 0.0, str(e))
+            raise
+        finally:
+            upstream.release()
+
+    def get_stats(self) -> list[dict]:
+        now = time.monotonic()
+
+        upstreams = []
+        for url, stats in self._stats.items():
+            upstreams.append(
+                {
+                    "url": get_display_url(url),
+                    "requests": stats.requests,
+                    "in_flight": stats.in_flight,
+                    "failures": stats.failures,
+                    "consecutive_failures": stats.consecutive_failures,
+                    "ejections": stats.ejections,
+                    "ejected": stats.ejected_until > now,
+                    "ejected_for": max(stats.ejected_until - now, 0.0),
+                    "ewma_latency_ms": (
+                        round(stats.ewma_latency * 1000, 2)
+                        if stats.ewma_latency is not None
+                        else None
+                    ),
+                    "last_error": stats.last_error,
+                }
+            )
+        return upstreams
+
+
+def get_weight(weight) -> float:
+    try:
+        return max(float(weight), 0.0)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def get_display_url(url: str) -> str:
+    # Never report credentials embedded in a base URL
+    parsed = urlparse(url)
+    if parsed.username or parsed.password:
+        netloc = parsed.hostname or ""
+        if parsed.port:
+            netloc = f"{netloc}:{parsed.port}"
+        return parsed._replace(netloc=netloc).geturl()
+    return url
+
+
+upstream_balancer = UpstreamBalancer(
+    strategy=UPSTREAM_BALANCER_STRATEGY,
+    eject_failures=UPSTREAM_BALANCER_EJECT_FAILURES,
+    eject_seconds=UPSTREAM_BALANCER_EJECT_SECONDS,
+)
+
+
+def select_url_idx(url_idxs: list[int], base_urls: list[str], api_configs: dict) -> int:
+    """
+    Pick one of the connections (indexes into base_urls) serving a model,
+    weighted by the "weight" in their API configs.
+    """
+    if len(url_idxs) == 1:
+        return url_idxs[0]
+
+    urls = [base_urls[idx] for idx in url_idxs]
+    weights = [
+        api_configs.get(str(idx), api_configs.get(base_urls[idx], {})).get(
+            "weight", 1.0
+        )
+        for idx in url_idxs
+    ]
+    return url_idxs[upstream_balancer.select(urls, weights)]
@@ -36,7 +36,6 @@ from open_webui.routers.pipelines import (
     process_pipeline_outlet_filter,
 )
 
-from open_webui.models.functions import Functions
 from open_webui.models.models import Models
 
 from open_webui.utils.models import get_all_models, check_model_access
@@ -46,7 +45,7 @@ from open_webui.utils.response import (
     convert_streaming_response_ollama_to_openai,
 )
 from open_webui.utils.filter import (
-    get_sorted_filter_ids,
+    get_filter_chain,
     process_filter_functions,
 )
 
@@ -335,10 +334,9 @@ async def chat_completed(request: Request, form_data: dict, user: Any):
     }
 
     try:
-        filter_ids = get_sorted_filter_ids(
+        filter_functions = get_filter_chain(
             request, model, metadata.get("filter_ids", [])
         )
-        filter_functions = Functions.get_functions_by_ids(filter_ids)
 
         result, _ = await process_filter_functions(
             request=request,
@@ -0,0 +1,128 @@
+import logging
+import time
+from typing import Optional
+
+from open_webui.models.chats import Chats
+from open_webui.models.chat_messages import ChatMessages
+from open_webui.utils.misc import sanitize_text_for_db
+from open_webui.env import (
+    REALTIME_CHAT_SAVE_FLUSH_BYTES,
+    REALTIME_CHAT_SAVE_FLUSH_INTERVAL,
+)
+
+log = logging.getLogger(__name__)
+
+
+def _get_message_size(message: dict) -> int:
+    content = message.get("content")
+    return len(content) if isinstance(content, str) else 0
+
+
+class ChatSaveBuffer:
+    """
+    Write-behind buffer for ENABLE_REALTIME_CHAT_SAVE.
+
+    Streaming updates to a message are merged in memory and written at most
+    once per time/size window, and only to that message's chat_message row.
+    The chat JSON blob is written when the message is first saved and once
+    more when it is flushed on completion, cancellation or shutdown.
+    """
+
+    def __init__(self, flush_interval: float = 1.0, flush_bytes: int = 8192):
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.entries: dict[tuple[str, str], dict] = {}
+
+    def update(self, chat_id: str, message_id: str, message: dict) -> None:
+        key = (chat_id, message_id)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = {
+                "user_id": None,
+                "message": {},
+                "size": 0,
+                "pending_size": 0,
+                "dirty": False,
+                "flushed_at": 0.0,
+            }
+            self.entries[key] = entry
+
+        entry["message"].update(message)
+        entry["dirty"] = True
+
+        size = _get_message_size(entry["message"])
+        entry["pending_size"] += abs(size - entry["size"])
+        entry["size"] = size
+
+        if (
+            time.monotonic() - entry["flushed_at"] >= self.flush_interval
+            or entry["pending_size"] >= self.flush_bytes
+        ):
+            self._write(chat_id, message_id, entry)
+
+    def flush(
+        self, chat_id: str, message_id: str, message: Optional[dict] = None
+    ) -> None:
+        """Persist the buffered message into both the chat blob and chat_message."""
+        entry = self.entries.pop((chat_id, message_id), None)
+        data = {**(entry["message"] if entry else {}), **(message or {})}
+        if not data:
+            return
+
+        Chats.upsert_message_to_chat_by_id_and_message_id(chat_id, message_id, data)
+
+    def flush_if_buffered(
+        self, chat_id: str, message_id: str, message: Optional[dict] = None
+    ) -> None:
+        """flush(), unless the message was already flushed or never buffered."""
+        if (chat_id, message_id) in self.entries:
+            self.flush(chat_id, message_id, message)
+
+    def flush_pending(self, chat_id: str, message_id: str) -> None:
+        """Write any buffered updates to chat_message without closing the entry."""
+        entry = self.entries.get((chat_id, message_id))
+        if entry and entry["dirty"]:
+            self._write(chat_id, message_id, entry)
+
+    def flush_all(self) -> None:
+        for chat_id, message_id in list(self.entries.keys()):
+            try:
+                self.flush(chat_id, message_id)
+            except Exception as e:
+                log.exception(f"Failed to flush chat message {message_id}: {e}")
+
+    def _write(self, chat_id: str, message_id: str, entry: dict) -> None:
+        message = entry["message"]
+
+        if entry["user_id"] is None:
+            # First write also creates the message in the chat blob (and its
+            # chat_message row), later writes only touch the chat_message row.
+            chat = Chats.upsert_message_to_chat_by_id_and_message_id(
+                chat_id, message_id, dict(message)
+            )
+            if chat is None:
+                return
+            entry["user_id"] = chat.user_id
+        else:
+            if isinstance(message.get("content"), str):
+                message["content"] = sanitize_text_for_db(message["content"])
+
+            try:
+                ChatMessages.upsert_message(
+                    message_id=message_id,
+                    chat_id=chat_id,
+                    user_id=entry["user_id"],
+                    data=message,
+                )
+            except Exception as e:
+                log.warning(f"Failed to write to chat_message table: {e}")
+
+        entry["dirty"] = False
+        entry["pending_size"] = 0
+        entry["flushed_at"] = time.monotonic()
+
+
+chat_save_buffer = ChatSaveBuffer(
+    flush_interval=REALTIME_CHAT_SAVE_FLUSH_INTERVAL,
+    flush_bytes=REALTIME_CHAT_SAVE_FLUSH_BYTES,
+)
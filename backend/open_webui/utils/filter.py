@@ -1,5 +1,8 @@
 import inspect
 import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
 
 from open_webui.utils.plugin import (
     load_function_module_by_id,
@@ -20,39 +23,113 @@ def get_function_module(request, function_id, load_from_db=True):
     return function_module
 
 
-def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
-    def get_priority(function_id):
-        function = Functions.get_function_by_id(function_id)
-        if function is not None:
-            valves = Functions.get_function_valves_by_id(function_id)
-            return valves.get("priority", 0) if valves else 0
-        return 0
-
-    filter_ids = [function.id for function in Functions.get_global_filter_functions()]
-    if "info" in model and "meta" in model["info"]:
-        filter_ids.extend(model["info"]["meta"].get("filterIds", []))
-        filter_ids = list(set(filter_ids))
-    active_filter_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
-    ]
+class CompiledFilter:
+    """
+    A filter function resolved for a chain: its record, loaded module and
+    valves, so running it needs no database reads.
+    """
+
+    def __init__(self, function, module, valves: Optional[dict]):
+        self.id = function.id
+        self.function = function
+        self.module = module
+        self.valves = valves
+
+
+class FilterChainCache:
+    """
+    Sorted, compiled filter chains per (model filters, enabled toggles).
+
+    A chain holds the global and model filters that are active (and, for
+    toggle filters, enabled), sorted by their priority valve, with modules
+    and valves resolved once. Chains are dropped when the functions version
+    changes, i.e. when any function or its valves is updated.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._chains: OrderedDict[tuple, list[CompiledFilter]] = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, version: tuple) -> Optional[list[CompiledFilter]]:
+        with self._lock:
+            if version != self._version:
+                self._chains.clear()
+                self._version = version
+                return None
+
+            chain = self._chains.get(key)
+            if chain is not None:
+                self._chains.move_to_end(key)
+            return chain
+
+    def set(self, key: tuple, version: tuple, chain: list[CompiledFilter]) -> None:
+        with self._lock:
+            if version != self._version:
+                return
+
+            self._chains[key] = chain
+            while len(self._chains) > self.max_size:
+                self._chains.popitem(last=False)
+
+
+filter_chains = FilterChainCache()
+
+
+def compile_filter_chain(
+    request, model_filter_ids: list, enabled_filter_ids: list
+) -> list[CompiledFilter]:
+    # Active filters, with their valves, in a single query
+    functions = {
+        function.id: function
+        for function in Functions.get_functions(active_only=True, include_valves=True)
+        if function.type == "filter"
+    }
+
+    filter_ids = [function.id for function in functions.values() if function.is_global]
+    filter_ids = list(set(filter_ids + model_filter_ids))
+
+    chain = []
+    for filter_id in filter_ids:
+        function = functions.get(filter_id)
+        if function is None:
+            continue
 
-    def get_active_status(filter_id):
         function_module = get_function_module(request, filter_id)
+        if getattr(function_module, "toggle", None) and filter_id not in (
+            enabled_filter_ids or []
+        ):
+            continue
 
-        if getattr(function_module, "toggle", None):
-            return filter_id in (enabled_filter_ids or [])
+        chain.append(CompiledFilter(function, function_module, function.valves or {}))
 
-        return True
+    chain.sort(key=lambda compiled: compiled.valves.get("priority", 0))
+    return chain
 
-    active_filter_ids = [
-        filter_id for filter_id in active_filter_ids if get_active_status(filter_id)
-    ]
 
-    filter_ids = [fid for fid in filter_ids if fid in active_filter_ids]
-    filter_ids.sort(key=get_priority)
+def get_filter_chain(
+    request, model: dict, enabled_filter_ids: list = None
+) -> list[CompiledFilter]:
+    model_filter_ids = []
+    if "info" in model and "meta" in model["info"]:
+        model_filter_ids = model["info"]["meta"].get("filterIds", None) or []
+
+    key = (frozenset(model_filter_ids), frozenset(enabled_filter_ids or []))
+    version = Functions.get_functions_version()
+
+    chain = filter_chains.get(key, version)
+    if chain is None:
+        chain = compile_filter_chain(request, model_filter_ids, enabled_filter_ids)
+        filter_chains.set(key, version, chain)
 
-    return filter_ids
+    return chain
+
+
+def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
+    return [
+        compiled.id for compiled in get_filter_chain(request, model, enabled_filter_ids)
+    ]
 
 
 async def process_filter_functions(
@@ -66,9 +143,12 @@ async def process_filter_functions(
         if not filter:
             continue
 
-        function_module = get_function_module(
-            request, filter_id, load_from_db=(filter_type != "stream")
-        )
+        if isinstance(function, CompiledFilter):
+            function_module = function.module
+        else:
+            function_module = get_function_module(
+                request, filter_id, load_from_db=(filter_type != "stream")
+            )
         # Prepare handler function
         handler = getattr(function_module, filter_type, None)
         if not handler:
@@ -80,7 +160,10 @@ async def process_filter_functions(
 
         # Apply valves to the function
         if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-            valves = Functions.get_function_valves_by_id(filter_id)
+            if isinstance(function, CompiledFilter):
+                valves = function.valves
+            else:
+                valves = Functions.get_function_valves_by_id(filter_id)
             function_module.valves = function_module.Valves(
                 **(valves if valves else {})
             )
@@ -3,6 +3,7 @@ import logging
 import sys
 import os
 import base64
+import copy
 import textwrap
 
 import asyncio
@@ -39,6 +40,7 @@ from open_webui.routers.tasks import (
     generate_follow_ups,
     generate_image_prompt,
     generate_chat_tags,
+    generate_combined_tasks,
 )
 from open_webui.routers.retrieval import (
     process_web_search,
@@ -67,7 +69,6 @@ from open_webui.utils.files import (
 
 
 from open_webui.models.users import UserModel
-from open_webui.models.functions import Functions
 from open_webui.models.models import Models
 
 from open_webui.retrieval.utils import get_sources_from_items
@@ -102,13 +103,14 @@ from open_webui.utils.tools import (
 )
 from open_webui.utils.plugin import load_function_module_by_id
 from open_webui.utils.filter import (
-    get_sorted_filter_ids,
+    get_filter_chain,
     process_filter_functions,
 )
 from open_webui.utils.code_interpreter import execute_code_jupyter
 from open_webui.utils.payload import apply_system_prompt_to_body
 from open_webui.utils.response import normalize_usage
 from open_webui.utils.mcp.client import MCPClient
+from open_webui.utils.chat_save import chat_save_buffer
 
 
 from open_webui.config import (
@@ -122,6 +124,8 @@ from open_webui.env import (
     GLOBAL_LOG_LEVEL,
     ENABLE_CHAT_RESPONSE_BASE64_IMAGE_URL_CONVERSION,
     CHAT_RESPONSE_STREAM_DELTA_CHUNK_SIZE,
+    ENABLE_CHAT_RESPONSE_STREAM_DELTA,
+    CHAT_RESPONSE_STREAM_SNAPSHOT_INTERVAL,
     CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES,
     BYPASS_MODEL_ACCESS_CONTROL,
     ENABLE_REALTIME_CHAT_SAVE,
@@ -2158,10 +2162,9 @@ async def process_chat_payload(request, form_data, user, metadata, model):
         raise e
 
     try:
-        filter_ids = get_sorted_filter_ids(
+        filter_functions = get_filter_chain(
             request, model, metadata.get("filter_ids", [])
         )
-        filter_functions = Functions.get_functions_by_ids(filter_ids)
 
         form_data, flags = await process_filter_functions(
             request=request,
@@ -2604,6 +2607,87 @@ def get_event_emitter_and_caller(metadata):
     return event_emitter, event_caller
 
 
+def get_common_prefix_length(a: str, b: str) -> int:
+    if b.startswith(a):
+        return len(a)
+
+    # Binary search on slice comparisons, which run in C
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[:mid] == b[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+class StreamDeltaEncoder:
+    """
+    Turns full chat:completion payloads into sequence-numbered patches.
+
+    `content` is replaced by `content_delta` ({start, text}: keep the first
+    `start` characters and append `text`) and `output` by `output_delta`
+    ({start, items}: keep the first `start` items and append `items`).
+    Every `snapshot_interval` events, and for the final `done` event, the full
+    payload is sent instead so clients that missed an event can resync.
+    """
+
+    def __init__(self, snapshot_interval: int = 0):
+        self.snapshot_interval = snapshot_interval
+        self.seq = 0
+        self.content = None
+        # Copies of the output items last sent, earlier items can be updated
+        # in place (e.g. function calls getting their results)
+        self.output = None
+
+    def encode(self, data: dict) -> dict:
+        self.seq += 1
+        snapshot = data.get("done", False) or (
+            self.snapshot_interval > 0 and self.seq % self.snapshot_interval == 0
+        )
+
+        data = {**data, "seq": self.seq}
+
+        if isinstance(data.get("content"), str):
+            content = data["content"]
+            if not snapshot and self.content is not None:
+                start = get_common_prefix_length(self.content, content)
+                del data["content"]
+                data["content_delta"] = {"start": start, "text": content[start:]}
+            self.content = content
+
+        if isinstance(data.get("output"), list):
+            output = data["output"]
+            start = 0
+            if not snapshot and self.output is not None:
+                # Resend from the first item that differs from what was sent
+                while (
+                    start < len(output)
+                    and start < len(self.output)
+                    and output[start] == self.output[start]
+                ):
+                    start += 1
+                del data["output"]
+                data["output_delta"] = {"start": start, "items": output[start:]}
+            self.output = (self.output or [])[:start] + copy.deepcopy(output[start:])
+
+        return data
+
+
+def get_stream_delta_event_emitter(event_emitter, snapshot_interval: int = 0):
+    encoder = StreamDeltaEncoder(snapshot_interval)
+
+    async def __event_emitter__(event_data):
+        if event_data.get("type") == "chat:completion" and isinstance(
+            event_data.get("data"), dict
+        ):
+            event_data = {**event_data, "data": encoder.encode(event_data["data"])}
+        return await event_emitter(event_data)
+
+    return __event_emitter__
+
+
 def build_chat_response_context(
     request, form_data, user, model, metadata, tasks, events
 ):
@@ -2683,6 +2767,66 @@ async def get_system_oauth_token(request, user):
     return oauth_token
 
 
+# Stripped from chat messages before they are sent to the background task models
+TASK_MESSAGE_CONTENT_PATTERN = re.compile(
+    r"<details\b[^>]*>.*?<\/details>|!\[.*?\]\(.*?\)", flags=re.S | re.I
+)
+
+
+def get_task_messages(message_list: list[dict]) -> list[dict]:
+    """
+    Prepare chat messages for the background task models: text content only,
+    without details blocks and images. New message dicts are created, so the
+    original messages are not affected.
+    """
+    messages = []
+    for message in message_list:
+        content = message.get("content", "")
+        if isinstance(content, list):
+            for item in content:
+                if item.get("type") == "text":
+                    content = item["text"]
+                    break
+
+        if isinstance(content, str):
+            content = TASK_MESSAGE_CONTENT_PATTERN.sub("", content).strip()
+
+        messages.append(
+            {
+                **message,
+                "role": message.get(
+                    "role", "assistant"
+                ),  # Safe fallback for missing role
+                "content": content,
+            }
+        )
+
+    return messages
+
+
+def get_task_response_json(res) -> Optional[dict]:
+    """
+    Extract the JSON object from a task model completion, if there is one.
+    """
+    if not res or not isinstance(res, dict) or len(res.get("choices", [])) != 1:
+        return None
+
+    response_message = res["choices"][0].get("message", {})
+    content = (
+        response_message.get("content")
+        or response_message.get("reasoning_content")
+        or ""
+    )
+    content = content[content.find("{") : content.rfind("}") + 1]
+
+    try:
+        data = json.loads(content)
+    except Exception:
+        return None
+
+    return data if isinstance(data, dict) else None
+
+
 async def background_tasks_handler(ctx):
     request = ctx["request"]
     form_data = ctx["form_data"]
@@ -2698,38 +2842,10 @@ async def background_tasks_handler(ctx):
         messages_map = Chats.get_messages_map_by_chat_id(metadata["chat_id"])
         message = messages_map.get(metadata["message_id"]) if messages_map else None
 
-        message_list = get_message_list(messages_map, metadata["message_id"])
-
-        # Remove details tags and files from the messages.
-        # as get_message_list creates a new list, it does not affect
-        # the original messages outside of this handler
-
-        messages = []
-        for message in message_list:
-            content = message.get("content", "")
-            if isinstance(content, list):
-                for item in content:
-                    if item.get("type") == "text":
-                        content = item["text"]
-                        break
-
-            if isinstance(content, str):
-                content = re.sub(
-                    r"<details\b[^>]*>.*?<\/details>|!\[.*?\]\(.*?\)",
-                    "",
-                    content,
-                    flags=re.S | re.I,
-                ).strip()
-
-            messages.append(
-                {
-                    **message,
-                    "role": message.get(
-                        "role", "assistant"
-                    ),  # Safe fallback for missing role
-                    "content": content,
-                }
-            )
+        # Preprocessed once and shared by all of the tasks below
+        messages = get_task_messages(
+            get_message_list(messages_map, metadata["message_id"])
+        )
     else:
         # Local temp chat, get the model and message from the form_data
         message = get_last_user_message_item(form_data.get("messages", []))
@@ -2737,172 +2853,161 @@ async def background_tasks_handler(ctx):
         if message:
             message["model"] = form_data.get("model")
 
-    if message and "model" in message:
-        if tasks and messages:
-            if (
-                TASKS.FOLLOW_UP_GENERATION in tasks
-                and tasks[TASKS.FOLLOW_UP_GENERATION]
-            ):
-                res = await generate_follow_ups(
-                    request,
-                    {
-                        "model": message["model"],
-                        "messages": messages,
-                        "message_id": metadata["message_id"],
-                        "chat_id": metadata["chat_id"],
-                    },
-                    user,
-                )
-
-                if res and isinstance(res, dict):
-                    if len(res.get("choices", [])) == 1:
-                        response_message = res.get("choices", [])[0].get("message", {})
-
-                        follow_ups_string = response_message.get(
-                            "content"
-                        ) or response_message.get("reasoning_content", "")
-                    else:
-                        follow_ups_string = ""
-
-                    follow_ups_string = follow_ups_string[
-                        follow_ups_string.find("{") : follow_ups_string.rfind("}") + 1
-                    ]
-
-                    try:
-                        follow_ups = json.loads(follow_ups_string).get("follow_ups", [])
-                        await event_emitter(
-                            {
-                                "type": "chat:message:follow_ups",
-                                "data": {
-                                    "follow_ups": follow_ups,
-                                },
-                            }
-                        )
-
-                        if not metadata.get("chat_id", "").startswith("local:"):
-                            Chats.upsert_message_to_chat_by_id_and_message_id(
-                                metadata["chat_id"],
-                                metadata["message_id"],
-                                {
-                                    "followUps": follow_ups,
-                                },
-                            )
-
-                    except Exception as e:
-                        pass
-
-            if not metadata.get("chat_id", "").startswith(
-                "local:"
-            ):  # Only update titles and tags for non-temp chats
-                if TASKS.TITLE_GENERATION in tasks:
-                    user_message = get_last_user_message(messages)
-                    if user_message and len(user_message) > 100:
-                        user_message = user_message[:100] + "..."
-
-                    title = None
-                    if tasks[TASKS.TITLE_GENERATION]:
-                        res = await generate_title(
-                            request,
-                            {
-                                "model": message["model"],
-                                "messages": messages,
-                                "chat_id": metadata["chat_id"],
-                            },
-                            user,
-                        )
-
-                        if res and isinstance(res, dict):
-                            if len(res.get("choices", [])) == 1:
-                                response_message = res.get("choices", [])[0].get(
-                                    "message", {}
-                                )
-
-                                title_string = (
-                                    response_message.get("content")
-                                    or response_message.get(
-                                        "reasoning_content",
-                                    )
-                                    or message.get("content", user_message)
-                                )
-                            else:
-                                title_string = ""
-
-                            title_string = title_string[
-                                title_string.find("{") : title_string.rfind("}") + 1
-                            ]
+    if not (message and "model" in message and tasks and messages):
+        return
 
-                            try:
-                                title = json.loads(title_string).get(
-                                    "title", user_message
-                                )
-                            except Exception as e:
-                                title = ""
+    chat_id = metadata["chat_id"]
+    # Titles and tags are only updated for non-temp chats
+    is_temp_chat = metadata.get("chat_id", "").startswith("local:")
 
-                            if not title:
-                                title = messages[0].get("content", user_message)
+    task_form_data = {
+        "model": message["model"],
+        "messages": messages,
+        "chat_id": chat_id,
+    }
 
-                            Chats.update_chat_title_by_id(metadata["chat_id"], title)
+    user_message = get_last_user_message(messages)
+    if user_message and len(user_message) > 100:
+        user_message = user_message[:100] + "..."
 
-                            await event_emitter(
-                                {
-                                    "type": "chat:title",
-                                    "data": title,
-                                }
-                            )
+    async def set_follow_ups(follow_ups):
+        await event_emitter(
+            {
+                "type": "chat:message:follow_ups",
+                "data": {
+                    "follow_ups": follow_ups,
+                },
+            }
+        )
 
-                    if title == None and len(messages) == 2:
-                        title = messages[0].get("content", user_message)
+        if not is_temp_chat:
+            Chats.upsert_message_to_chat_by_id_and_message_id(
+                chat_id,
+                metadata["message_id"],
+                {
+                    "followUps": follow_ups,
+                },
+            )
 
-                        Chats.update_chat_title_by_id(metadata["chat_id"], title)
+    async def set_title(title):
+        Chats.update_chat_title_by_id(chat_id, title)
 
-                        await event_emitter(
-                            {
-                                "type": "chat:title",
-                                "data": message.get("content", user_message),
-                            }
-                        )
+        await event_emitter(
+            {
+                "type": "chat:title",
+                "data": title,
+            }
+        )
 
-                if TASKS.TAGS_GENERATION in tasks and tasks[TASKS.TAGS_GENERATION]:
-                    res = await generate_chat_tags(
-                        request,
-                        {
-                            "model": message["model"],
-                            "messages": messages,
-                            "chat_id": metadata["chat_id"],
-                        },
-                        user,
-                    )
+    async def set_tags(tags):
+        Chats.update_chat_tags_by_id(chat_id, tags, user)
 
-                    if res and isinstance(res, dict):
-                        if len(res.get("choices", [])) == 1:
-                            response_message = res.get("choices", [])[0].get(
-                                "message", {}
-                            )
+        await event_emitter(
+            {
+                "type": "chat:tags",
+                "data": tags,
+            }
+        )
 
-                            tags_string = response_message.get(
-                                "content"
-                            ) or response_message.get("reasoning_content", "")
-                        else:
-                            tags_string = ""
+    async def follow_ups_task():
+        res = await generate_follow_ups(
+            request,
+            {**task_form_data, "message_id": metadata["message_id"]},
+            user,
+        )
 
-                        tags_string = tags_string[
-                            tags_string.find("{") : tags_string.rfind("}") + 1
-                        ]
+        data = get_task_response_json(res)
+        if data is not None:
+            await set_follow_ups(data.get("follow_ups", []))
+
+    async def title_task():
+        if tasks[TASKS.TITLE_GENERATION]:
+            res = await generate_title(request, task_form_data, user)
+
+            if res and isinstance(res, dict):
+                data = get_task_response_json(res)
+                title = data.get("title", user_message) if data else ""
+
+                if not title:
+                    title = messages[0].get("content", user_message)
+
+                await set_title(title)
+                return
+
+        if len(messages) == 2:
+            await set_title(messages[0].get("content", user_message))
+
+    async def tags_task():
+        res = await generate_chat_tags(request, task_form_data, user)
+
+        data = get_task_response_json(res)
+        if data is not None:
+            await set_tags(data.get("tags", []))
+
+    pending = {}
+    if tasks.get(TASKS.FOLLOW_UP_GENERATION):
+        pending[TASKS.FOLLOW_UP_GENERATION] = follow_ups_task
+    if not is_temp_chat:
+        if TASKS.TITLE_GENERATION in tasks:
+            pending[TASKS.TITLE_GENERATION] = title_task
+        if tasks.get(TASKS.TAGS_GENERATION):
+            pending[TASKS.TAGS_GENERATION] = tags_task
+
+    config = request.app.state.config
+    if config.ENABLE_COMBINED_TASK_GENERATION:
+        # Task -> (result key, validator, setter, enabled)
+        combinable = {
+            TASKS.FOLLOW_UP_GENERATION: (
+                "follow_ups",
+                lambda value: isinstance(value, list),
+                set_follow_ups,
+                config.ENABLE_FOLLOW_UP_GENERATION,
+            ),
+            TASKS.TITLE_GENERATION: (
+                "title",
+                lambda value: isinstance(value, str) and value.strip(),
+                set_title,
+                config.ENABLE_TITLE_GENERATION,
+            ),
+            TASKS.TAGS_GENERATION: (
+                "tags",
+                lambda value: isinstance(value, list),
+                set_tags,
+                config.ENABLE_TAGS_GENERATION,
+            ),
+        }
+        combined = [
+            task
+            for task, (_, _, _, enabled) in combinable.items()
+            if task in pending and tasks.get(task) and enabled
+        ]
 
-                        try:
-                            tags = json.loads(tags_string).get("tags", [])
-                            Chats.update_chat_tags_by_id(
-                                metadata["chat_id"], tags, user
-                            )
+        if len(combined) > 1:
+            data = None
+            try:
+                data = get_task_response_json(
+                    await generate_combined_tasks(request, task_form_data, user)
+                )
+            except Exception as e:
+                log.warning(f"Combined task generation failed: {e}")
+
+            # Tasks missing from (or invalid in) the combined result fall back
+            # to their own generation below
+            for task in combined:
+                key, is_valid, set_value, _ = combinable[task]
+                if data and is_valid(data.get(key)):
+                    pending.pop(task)
+                    try:
+                        await set_value(data[key])
+                    except Exception as e:
+                        log.debug(f"Error applying {task}: {e}")
 
-                            await event_emitter(
-                                {
-                                    "type": "chat:tags",
-                                    "data": tags,
-                                }
-                            )
-                        except Exception as e:
-                            pass
+    results = await asyncio.gather(
+        *(task() for task in pending.values()), return_exceptions=True
+    )
+    for task, result in zip(pending, results):
+        if isinstance(result, Exception):
+            log.error(f"Error running background task {task}: {result}")
 
 
 async def non_streaming_chat_response_handler(response, ctx):
@@ -3060,16 +3165,16 @@ async def streaming_chat_response_handler(response, ctx):
         "__model__": model,
     }
 
-    filter_functions = [
-        Functions.get_function_by_id(filter_id)
-        for filter_id in get_sorted_filter_ids(
-            request, model, metadata.get("filter_ids", [])
-        )
-    ]
+    filter_functions = get_filter_chain(request, model, metadata.get("filter_ids", []))
 
     # Standard streaming response handler
     if event_emitter and event_caller:
         task_id = str(uuid4())  # Create a unique task ID.
+
+        if ENABLE_CHAT_RESPONSE_STREAM_DELTA:
+            event_emitter = get_stream_delta_event_emitter(
+                event_emitter, CHAT_RESPONSE_STREAM_SNAPSHOT_INTERVAL
+            )
         model_id = form_data.get("model", "")
 
         # Handle as a background task
@@ -3920,8 +4025,8 @@ async def streaming_chat_response_handler(response, ctx):
                                                 break
 
                                         if ENABLE_REALTIME_CHAT_SAVE:
-                                            # Save message in the database
-                                            Chats.upsert_message_to_chat_by_id_and_message_id(
+                                            # Save message in the database (coalesced)
+                                            chat_save_buffer.update(
                                                 metadata["chat_id"],
                                                 metadata["message_id"],
                                                 {
@@ -3955,6 +4060,11 @@ async def streaming_chat_response_handler(response, ctx):
                                 continue
                     await flush_pending_delta_data()
 
+                    if ENABLE_REALTIME_CHAT_SAVE:
+                        chat_save_buffer.flush_pending(
+                            metadata["chat_id"], metadata["message_id"]
+                        )
+
                     if output:
                         # Clean up the last message item
                         if output[-1].get("type") == "message":
@@ -4497,11 +4607,16 @@ async def streaming_chat_response_handler(response, ctx):
                             **({"usage": usage} if usage else {}),
                         },
                     )
-                elif usage:
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                else:
+                    # Single chat blob write for the buffered realtime saves
+                    chat_save_buffer.flush(
                         metadata["chat_id"],
                         metadata["message_id"],
-                        {"usage": usage},
+                        {
+                            "content": serialize_output(output),
+                            "output": output,
+                            **({"usage": usage} if usage else {}),
+                        },
                     )
 
                 # Send a webhook notification if the user is not active
@@ -4542,6 +4657,30 @@ async def streaming_chat_response_handler(response, ctx):
                             "output": output,
                         },
                     )
+                else:
+                    chat_save_buffer.flush(
+                        metadata["chat_id"],
+                        metadata["message_id"],
+                        {
+                            "content": serialize_output(output),
+                            "output": output,
+                        },
+                    )
+            finally:
+                if ENABLE_REALTIME_CHAT_SAVE:
+                    # Keep what was streamed when the handler failed, a no-op
+                    # once the message was flushed above
+                    try:
+                        chat_save_buffer.flush_if_buffered(
+                            metadata["chat_id"],
+                            metadata["message_id"],
+                            {
+                                "content": serialize_output(output),
+                                "output": output,
+                            },
+                        )
+                    except Exception as e:
+                        log.exception(f"Failed to save buffered message: {e}")
 
             if response.background is not None:
                 await response.background()
@@ -1,4 +1,6 @@
+import codecs
 import hashlib
+import queue
 import re
 import threading
 import time
@@ -6,7 +8,7 @@ import uuid
 import logging
 from datetime import timedelta
 from pathlib import Path
-from typing import Callable, Optional, Sequence, Union
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Union
 import json
 import aiohttp
 import mimeparse
@@ -794,7 +796,7 @@ def extract_urls(text: str) -> list[str]:
 
 async def cleanup_response(
     response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
+    session: Optional[aiohttp.ClientSession] = None,
 ):
     if response:
         response.close()
@@ -802,7 +804,7 @@ async def cleanup_response(
         await session.close()
 
 
-async def stream_wrapper(response, session, content_handler=None):
+async def stream_wrapper(response, session=None, content_handler=None):
     """
     Wrap a stream to ensure cleanup happens even if streaming is interrupted.
     This is more reliable than BackgroundTask which may not run if client disconnects.
@@ -884,3 +886,161 @@ def stream_chunks_handler(stream: aiohttp.StreamReader):
             yield b"\n"
 
     return yield_safe_stream_chunks()
+
+
+class _ThreadedIteratorError:
+    def __init__(self, exception: BaseException):
+        self.exception = exception
+
+
+def iterate_in_thread(iterable: Iterable, maxsize: int = 1) -> Iterator:
+    """
+    Consume iterable in a background thread, handing items over through a
+    bounded queue so the producer runs at most maxsize items ahead.
+
+    The thread starts on the first next() of the returned generator, so a
+    generator that is never iterated leaves no thread behind. Exceptions
+    raised by the producer are re-raised in the consumer. Closing the
+    returned generator early stops the producer and closes iterable, so
+    chained stages shut down together.
+    """
+    items = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+            put(done)
+        except BaseException as e:
+            put(_ThreadedIteratorError(e))
+        finally:
+            close = getattr(iterable, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+
+    def consume():
+        threading.Thread(target=produce, daemon=True).start()
+        try:
+            while True:
+                item = items.get()
+                if item is done:
+                    return
+                if isinstance(item, _ThreadedIteratorError):
+                    raise item.exception
+                yield item
+        finally:
+            stop.set()
+
+    return consume()
+
+
+NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+def iterate_json_array(file, chunk_size: int = 1024 * 1024) -> Iterator:
+    """
+    Yield the elements of a top-level JSON array read from a binary file
+    object, holding roughly one element in memory at a time instead of the
+    whole document.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    pos = 0
+    # Characters dropped from the start of the buffer, positions reported in
+    # errors are offset + pos so they count from the start of the file
+    offset = 0
+    eof = False
+
+    def read(size: int) -> bool:
+        nonlocal buffer, eof
+        if eof:
+            return False
+        data = file.read(size)
+        if not data:
+            eof = True
+            buffer += text_decoder.decode(b"", final=True)
+            return False
+        buffer += text_decoder.decode(data)
+        return True
+
+    def next_char() -> Optional[str]:
+        # Skip whitespace, reading ahead as needed
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not read(chunk_size):
+                return None
+
+    if next_char() != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+
+    expect_value = True
+    after_comma = False
+    while True:
+        char = next_char()
+        if char is None:
+            raise ValueError("Unexpected end of JSON array")
+        if char == "]":
+            if after_comma:
+                raise ValueError(f"Expected a value at position {offset + pos}")
+            pos += 1
+            if next_char() is not None:
+                raise ValueError(
+                    f"Unexpected data after JSON array at position {offset + pos}"
+                )
+            return
+        if not expect_value:
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' at position {offset + pos}")
+            pos += 1
+            expect_value = True
+            after_comma = True
+            continue
+
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+            # A number followed only by number characters up to the buffer
+            # end may be truncated ("1." or "2.5e" decode as 1 and 2.5),
+            # unless the whole file has been read
+            if not eof:
+                value_end = end
+                if isinstance(item, (int, float)) and not isinstance(item, bool):
+                    while value_end < len(buffer) and buffer[value_end] in NUMBER_CHARS:
+                        value_end += 1
+                if value_end >= len(buffer):
+                    raise json.JSONDecodeError("Truncated value", buffer, end)
+        except json.JSONDecodeError as e:
+            # Read at least as much again as the pending value so large
+            # values are re-parsed a logarithmic number of times
+            if not read(max(chunk_size, len(buffer) - pos)):
+                raise ValueError(f"{e.msg} at position {offset + e.pos}") from e
+            continue
+
+        yield item
+        pos = end
+        expect_value = False
+        after_comma = False
+        if pos > chunk_size:
+            buffer = buffer[pos:]
+            offset += pos
+            pos = 0
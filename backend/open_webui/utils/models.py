@@ -7,7 +7,7 @@ import sys
 from aiocache import cached
 from fastapi import Request
 
-from open_webui.socket.utils import RedisDict
+from open_webui.socket.utils import ModelRegistry
 from open_webui.routers import openai, ollama
 from open_webui.functions import get_function_models
 
@@ -79,308 +79,429 @@ async def get_all_base_models(request: Request, user: UserModel = None):
     return function_models + openai_models + ollama_models
 
 
-async def get_all_models(request, refresh: bool = False, user: UserModel = None):
-    if (
-        request.app.state.MODELS
-        and request.app.state.BASE_MODELS
-        and (request.app.state.config.ENABLE_BASE_MODELS_CACHE and not refresh)
-    ):
-        base_models = request.app.state.BASE_MODELS
+def get_action_items_from_module(function, module):
+    if hasattr(module, "actions"):
+        return [
+            {
+                "id": f"{function.id}.{action['id']}",
+                "name": action.get("name", f"{function.name} ({action['id']})"),
+                "description": function.meta.description,
+                "icon": action.get(
+                    "icon_url",
+                    function.meta.manifest.get("icon_url", None)
+                    or getattr(module, "icon_url", None)
+                    or getattr(module, "icon", None),
+                ),
+            }
+            for action in module.actions
+        ]
     else:
-        base_models = await get_all_base_models(request, user=user)
-        request.app.state.BASE_MODELS = base_models
-
-    # deep copy the base models to avoid modifying the original list
-    models = [model.copy() for model in base_models]
+        return [
+            {
+                "id": function.id,
+                "name": function.name,
+                "description": function.meta.description,
+                "icon": function.meta.manifest.get("icon_url", None)
+                or getattr(module, "icon_url", None)
+                or getattr(module, "icon", None),
+            }
+        ]
 
-    # If there are no models, return an empty list
-    if len(models) == 0:
-        return []
 
-    # Add arena models
-    if request.app.state.config.ENABLE_EVALUATION_ARENA_MODELS:
-        arena_models = []
-        if len(request.app.state.config.EVALUATION_ARENA_MODELS) > 0:
-            arena_models = [
-                {
-                    "id": model["id"],
-                    "name": model["name"],
-                    "info": {
-                        "meta": model["meta"],
-                    },
-                    "object": "model",
-                    "created": int(time.time()),
-                    "owned_by": "arena",
-                    "arena": True,
-                }
-                for model in request.app.state.config.EVALUATION_ARENA_MODELS
-            ]
-        else:
-            # Add default arena model
-            arena_models = [
-                {
-                    "id": DEFAULT_ARENA_MODEL["id"],
-                    "name": DEFAULT_ARENA_MODEL["name"],
-                    "info": {
-                        "meta": DEFAULT_ARENA_MODEL["meta"],
-                    },
-                    "object": "model",
-                    "created": int(time.time()),
-                    "owned_by": "arena",
-                    "arena": True,
-                }
-            ]
-        models = models + arena_models
-
-    global_action_ids = [
-        function.id for function in Functions.get_global_action_functions()
-    ]
-    enabled_action_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("action", active_only=True)
+def get_filter_items_from_module(function, module):
+    return [
+        {
+            "id": function.id,
+            "name": function.name,
+            "description": function.meta.description,
+            "icon": function.meta.manifest.get("icon_url", None)
+            or getattr(module, "icon_url", None)
+            or getattr(module, "icon", None),
+            "has_user_valves": hasattr(module, "UserValves"),
+        }
     ]
 
-    global_filter_ids = [
-        function.id for function in Functions.get_global_filter_functions()
-    ]
-    enabled_filter_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
-    ]
 
-    custom_models = Models.get_all_models()
-    for custom_model in custom_models:
-        if custom_model.base_model_id is None:
-            # Applied directly to a base model
-            for model in models:
-                if custom_model.id == model["id"] or (
-                    model.get("owned_by") == "ollama"
-                    and custom_model.id
-                    == model["id"].split(":")[
-                        0
-                    ]  # Ollama may return model ids in different formats (e.g., 'llama3' vs. 'llama3:7b')
-                ):
-                    if custom_model.is_active:
-                        model["name"] = custom_model.name
-                        model["info"] = custom_model.model_dump()
-
-                        # Set action_ids and filter_ids
-                        action_ids = []
-                        filter_ids = []
-
-                        if "info" in model:
-                            if "meta" in model["info"]:
-                                action_ids.extend(
-                                    model["info"]["meta"].get("actionIds", [])
-                                )
-                                filter_ids.extend(
-                                    model["info"]["meta"].get("filterIds", [])
-                                )
-
-                            if "params" in model["info"]:
-                                # Remove params to avoid exposing sensitive info
-                                del model["info"]["params"]
-
-                        model["action_ids"] = action_ids
-                        model["filter_ids"] = filter_ids
-                    else:
-                        models.remove(model)
+def get_arena_models(request: Request) -> list[dict]:
+    arena_models = request.app.state.config.EVALUATION_ARENA_MODELS
+    if len(arena_models) == 0:
+        # Add default arena model
+        arena_models = [DEFAULT_ARENA_MODEL]
 
-        elif custom_model.is_active and (
-            custom_model.id not in [model["id"] for model in models]
-        ):
-            # Custom model based on a base model
-            owned_by = "openai"
-            connection_type = None
+    return [
+        {
+            "id": model["id"],
+            "name": model["name"],
+            "info": {
+                "meta": model["meta"],
+            },
+            "object": "model",
+            "created": int(time.time()),
+            "owned_by": "arena",
+            "arena": True,
+        }
+        for model in arena_models
+    ]
 
-            pipe = None
 
-            for m in models:
-                if (
-                    custom_model.base_model_id == m["id"]
-                    or custom_model.base_model_id == m["id"].split(":")[0]
-                ):
-                    owned_by = m.get("owned_by", "unknown")
-                    if "pipe" in m:
-                        pipe = m["pipe"]
+def copy_model(model: dict) -> dict:
+    # Callers may modify the returned models (e.g. /api/models drops the
+    # profile image), so copy the levels they touch
+    model = model.copy()
+    info = model.get("info")
+    if isinstance(info, dict):
+        model["info"] = info = info.copy()
+        if isinstance(info.get("meta"), dict):
+            info["meta"] = info["meta"].copy()
+    return model
 
-                    connection_type = m.get("connection_type", None)
-                    break
 
-            model = {
-                "id": f"{custom_model.id}",
-                "name": custom_model.name,
-                "object": "model",
-                "created": custom_model.created_at,
-                "owned_by": owned_by,
-                "connection_type": connection_type,
-                "preset": True,
-                **({"pipe": pipe} if pipe is not None else {}),
-            }
+# Set to the fetch time by the Ollama and arena model sources, so they
+# differ on every fetch without the model changing
+VOLATILE_SOURCE_FIELDS = ("created",)
 
-            info = custom_model.model_dump()
-            if "params" in info:
-                # Remove params to avoid exposing sensitive info
-                del info["params"]
 
-            model["info"] = info
-
-            action_ids = []
-            filter_ids = []
-
-            if custom_model.meta:
-                meta = custom_model.meta.model_dump()
-
-                if "actionIds" in meta:
-                    action_ids.extend(meta["actionIds"])
-
-                if "filterIds" in meta:
-                    filter_ids.extend(meta["filterIds"])
-
-            model["action_ids"] = action_ids
-            model["filter_ids"] = filter_ids
-
-            models.append(model)
-
-    # Process action_ids to get the actions
-    def get_action_items_from_module(function, module):
-        actions = []
-        if hasattr(module, "actions"):
-            actions = module.actions
-            return [
-                {
-                    "id": f"{function.id}.{action['id']}",
-                    "name": action.get("name", f"{function.name} ({action['id']})"),
-                    "description": function.meta.description,
-                    "icon": action.get(
-                        "icon_url",
-                        function.meta.manifest.get("icon_url", None)
-                        or getattr(module, "icon_url", None)
-                        or getattr(module, "icon", None),
-                    ),
-                }
-                for action in actions
-            ]
-        else:
-            return [
-                {
-                    "id": function.id,
-                    "name": function.name,
-                    "description": function.meta.description,
-                    "icon": function.meta.manifest.get("icon_url", None)
-                    or getattr(module, "icon_url", None)
-                    or getattr(module, "icon", None),
-                }
-            ]
+class ModelIndex:
+    """
+    Models assembled by get_all_models, keyed by model id.
 
-    # Process filter_ids to get the filters
-    def get_filter_items_from_module(function, module):
-        return [
-            {
-                "id": function.id,
-                "name": function.name,
-                "description": function.meta.description,
-                "icon": function.meta.manifest.get("icon_url", None)
-                or getattr(module, "icon_url", None)
-                or getattr(module, "icon", None),
-                "has_user_valves": hasattr(module, "UserValves"),
-            }
-        ]
+    Each entry keeps the inputs it was built from: the base model, the
+    workspace model applied to it and the action/filter functions (and their
+    loaded modules) it resolves to. A rebuild looks base and workspace models
+    up by id instead of scanning the list, reuses every entry whose inputs are
+    unchanged and only re-assembles the rest.
+    """
 
-    # Batch-prefetch all needed function records to avoid N+1 queries
-    all_function_ids = set()
-    for model in models:
-        all_function_ids.update(model.get("action_ids", []))
-        all_function_ids.update(model.get("filter_ids", []))
-    all_function_ids.update(global_action_ids)
-    all_function_ids.update(global_filter_ids)
-
-    functions_by_id = {
-        f.id: f for f in Functions.get_functions_by_ids(list(all_function_ids))
-    }
-
-    # Pre-warm the function module cache once per unique function ID.
-    # This ensures each function's DB freshness check runs exactly once,
-    # not once per (model × function) pair.
-    for function_id in all_function_ids:
-        try:
-            get_function_module_from_cache(request, function_id)
-        except Exception as e:
-            log.info(f"Failed to load function module for {function_id}: {e}")
-
-    # Apply global model defaults to all models
-    # Per-model overrides take precedence over global defaults
-    default_metadata = (
-        getattr(request.app.state.config, "DEFAULT_MODEL_METADATA", None) or {}
-    )
+    def __init__(self):
+        self.entries: dict[str, tuple[tuple, dict]] = {}
+        self.function_versions: dict[str, int] = {}
+        self.stats: dict = {}
 
-    if default_metadata:
-        for model in models:
-            info = model.get("info")
+    def load_function_modules(self, request: Request, functions: dict, function_ids):
+        for function_id in function_ids:
+            function = functions.get(function_id)
+            if function is None:
+                continue
 
-            if info is None:
-                model["info"] = {"meta": copy.deepcopy(default_metadata)}
+            # Each check reads the function from the database, so only check
+            # functions that changed since they were last loaded
+            if (
+                function_id in request.app.state.FUNCTIONS
+                and self.function_versions.get(function_id) == function.updated_at
+            ):
                 continue
 
-            meta = info.setdefault("meta", {})
-            for key, value in default_metadata.items():
-                if key == "capabilities":
-                    # Merge capabilities: defaults as base, per-model overrides win
-                    existing = meta.get("capabilities") or {}
-                    meta["capabilities"] = {**value, **existing}
-                elif meta.get(key) is None:
-                    meta[key] = copy.deepcopy(value)
+            try:
+                get_function_module_from_cache(request, function_id)
+                self.function_versions[function_id] = function.updated_at
+            except Exception as e:
+                log.info(f"Failed to load function module for {function_id}: {e}")
+
+    def resolve(self, sources: list[dict], custom_models: list) -> list[tuple]:
+        """
+        Apply workspace models to the base models and add the custom models
+        based on them, in the order get_all_models has always used. Returns
+        (source, workspace model, base model) tuples.
+        """
+        entries = [[source, None, None] for source in sources]
+        # The models as seen by custom models looking up their base model
+        descriptors = list(sources)
+        removed = set()
+
+        positions_by_id: dict[str, list[int]] = {}
+        positions_by_prefix: dict[str, list[int]] = {}
+        ollama_positions_by_prefix: dict[str, list[int]] = {}
+
+        def add_to_index(position, model):
+            positions_by_id.setdefault(model["id"], []).append(position)
+            prefix = model["id"].split(":")[0]
+            positions_by_prefix.setdefault(prefix, []).append(position)
+            if model.get("owned_by") == "ollama":
+                # Ollama may return model ids in different formats (e.g., 'llama3' vs. 'llama3:7b')
+                ollama_positions_by_prefix.setdefault(prefix, []).append(position)
+
+        def get_positions(index, model_id):
+            return [p for p in index.get(model_id, []) if p not in removed]
+
+        for position, source in enumerate(sources):
+            add_to_index(position, source)
+
+        for custom_model in custom_models:
+            if custom_model.base_model_id is None:
+                # Applied directly to a base model
+                positions = sorted(
+                    set(get_positions(positions_by_id, custom_model.id))
+                    | set(get_positions(ollama_positions_by_prefix, custom_model.id))
+                )
+                for position in positions:
+                    if entries[position][0] is None:
+                        continue
+                    if custom_model.is_active:
+                        entries[position][1] = custom_model
+                    else:
+                        removed.add(position)
+
+            elif custom_model.is_active and not get_positions(
+                positions_by_id, custom_model.id
+            ):
+                # Custom model based on a base model
+                base_positions = get_positions(
+                    positions_by_id, custom_model.base_model_id
+                ) + get_positions(positions_by_prefix, custom_model.base_model_id)
+
+                base_model = {"owned_by": "openai", "connection_type": None}
+                if base_positions:
+                    m = descriptors[min(base_positions)]
+                    base_model = {
+                        "owned_by": m.get("owned_by", "unknown"),
+                        "connection_type": m.get("connection_type", None),
+                        **({"pipe": m["pipe"]} if "pipe" in m else {}),
+                    }
+
+                position = len(entries)
+                entries.append([None, custom_model, base_model])
+                descriptors.append({"id": custom_model.id, **base_model})
+                add_to_index(position, descriptors[position])
+
+        return [
+            tuple(entry)
+            for position, entry in enumerate(entries)
+            if position not in removed
+        ]
+
+    def assemble(
+        self,
+        request: Request,
+        source,
+        custom_model,
+        base_model,
+        global_action_ids: list[str],
+        global_filter_ids: list[str],
+        functions: dict,
+        default_metadata: dict,
+    ) -> tuple[tuple, dict]:
+        info = custom_model.model_dump() if custom_model is not None else None
+
+        action_ids = []
+        filter_ids = []
+        if info is not None:
+            if "meta" in info:
+                action_ids.extend(info["meta"].get("actionIds", None) or [])
+                filter_ids.extend(info["meta"].get("filterIds", None) or [])
+
+            if "params" in info:
+                # Remove params to avoid exposing sensitive info
+                del info["params"]
 
-    for model in models:
         action_ids = [
             action_id
-            for action_id in list(set(model.pop("action_ids", []) + global_action_ids))
-            if action_id in enabled_action_ids
+            for action_id in list(set(action_ids + global_action_ids))
+            if action_id in functions and functions[action_id].type == "action"
         ]
         filter_ids = [
             filter_id
-            for filter_id in list(set(model.pop("filter_ids", []) + global_filter_ids))
-            if filter_id in enabled_filter_ids
+            for filter_id in list(set(filter_ids + global_filter_ids))
+            if filter_id in functions and functions[filter_id].type == "filter"
         ]
 
+        self.load_function_modules(request, functions, action_ids + filter_ids)
+
+        function_key = tuple(
+            (
+                function_id,
+                functions[function_id].updated_at,
+                request.app.state.FUNCTIONS.get(function_id),
+            )
+            for function_id in sorted(action_ids + filter_ids)
+        )
+        key = (
+            (
+                {k: v for k, v in source.items() if k not in VOLATILE_SOURCE_FIELDS}
+                if source is not None
+                else None
+            ),
+            info,
+            base_model,
+            function_key,
+            default_metadata,
+        )
+
+        model_id = source["id"] if source is not None else custom_model.id
+        entry = self.entries.get(model_id)
+        if entry is not None and entry[0] == key:
+            return entry
+
+        # The key keeps the inputs as they were, the model gets its own copies
+        if info is not None:
+            info = copy.deepcopy(info)
+
+        if source is not None:
+            model = source.copy()
+            if info is not None:
+                model["name"] = custom_model.name
+                model["info"] = info
+            elif default_metadata and isinstance(model.get("info"), dict):
+                model["info"] = copy.deepcopy(model["info"])
+        else:
+            model = {
+                "id": f"{custom_model.id}",
+                "name": custom_model.name,
+                "object": "model",
+                "created": custom_model.created_at,
+                **base_model,
+                "preset": True,
+                "info": info,
+            }
+
+        # Apply global model defaults, per-model overrides take precedence
+        if default_metadata:
+            if model.get("info") is None:
+                model["info"] = {"meta": copy.deepcopy(default_metadata)}
+            else:
+                meta = model["info"].setdefault("meta", {})
+                for k, value in default_metadata.items():
+                    if k == "capabilities":
+                        # Merge capabilities: defaults as base, per-model overrides win
+                        existing = meta.get("capabilities") or {}
+                        meta["capabilities"] = {**value, **existing}
+                    elif meta.get(k) is None:
+                        meta[k] = copy.deepcopy(value)
+
         model["actions"] = []
         for action_id in action_ids:
-            action_function = functions_by_id.get(action_id)
-            if action_function is None:
-                log.info(f"Action not found: {action_id}")
-                continue
-
             function_module = request.app.state.FUNCTIONS.get(action_id)
             if function_module is None:
                 log.info(f"Failed to load action module: {action_id}")
                 continue
             model["actions"].extend(
-                get_action_items_from_module(action_function, function_module)
+                get_action_items_from_module(functions[action_id], function_module)
             )
 
         model["filters"] = []
         for filter_id in filter_ids:
-            filter_function = functions_by_id.get(filter_id)
-            if filter_function is None:
-                log.info(f"Filter not found: {filter_id}")
-                continue
-
             function_module = request.app.state.FUNCTIONS.get(filter_id)
             if function_module is None:
                 log.info(f"Failed to load filter module: {filter_id}")
                 continue
             if getattr(function_module, "toggle", None):
                 model["filters"].extend(
-                    get_filter_items_from_module(filter_function, function_module)
+                    get_filter_items_from_module(functions[filter_id], function_module)
                 )
 
-    log.debug(f"get_all_models() returned {len(models)} models")
+        return (key, model)
 
-    models_dict = {model["id"]: model for model in models}
-    if isinstance(request.app.state.MODELS, RedisDict):
-        request.app.state.MODELS.set(models_dict)
+    def build(self, request: Request, sources: list[dict]) -> tuple[list[dict], bool]:
+        """
+        Returns the assembled models and whether any of them changed since the
+        previous build.
+        """
+        custom_models = Models.get_all_models()
+
+        # Active action and filter functions, in a single query
+        functions = {
+            function.id: function
+            for function in Functions.get_functions(active_only=True)
+            if function.type in ("action", "filter")
+        }
+        global_action_ids = [
+            function.id
+            for function in functions.values()
+            if function.type == "action" and function.is_global
+        ]
+        global_filter_ids = [
+            function.id
+            for function in functions.values()
+            if function.type == "filter" and function.is_global
+        ]
+
+        default_metadata = (
+            getattr(request.app.state.config, "DEFAULT_MODEL_METADATA", None) or {}
+        )
+
+        entries = {}
+        models = []
+        rebuilt = 0
+        for source, custom_model, base_model in self.resolve(sources, custom_models):
+            entry = self.assemble(
+                request,
+                source,
+                custom_model,
+                base_model,
+                global_action_ids,
+                global_filter_ids,
+                functions,
+                default_metadata,
+            )
+            if self.entries.get(entry[1]["id"]) is not entry:
+                rebuilt += 1
+
+            entries[entry[1]["id"]] = entry
+            models.append(entry[1])
+
+        changed = rebuilt > 0 or entries.keys() != self.entries.keys()
+        self.entries = entries
+        self.stats.update(
+            {
+                "models": len(models),
+                "rebuilt": rebuilt,
+                "reused": len(models) - rebuilt,
+            }
+        )
+
+        return models, changed
+
+
+model_index = ModelIndex()
+
+
+async def get_all_models(request, refresh: bool = False, user: UserModel = None):
+    start_time = time.perf_counter()
+
+    base_models_cached = bool(
+        request.app.state.MODELS
+        and request.app.state.BASE_MODELS
+        and (request.app.state.config.ENABLE_BASE_MODELS_CACHE and not refresh)
+    )
+    if base_models_cached:
+        base_models = request.app.state.BASE_MODELS
     else:
-        request.app.state.MODELS = models_dict
+        base_models = await get_all_base_models(request, user=user)
+        request.app.state.BASE_MODELS = base_models
+
+    base_models_time = time.perf_counter()
+
+    # If there are no models, return an empty list
+    if len(base_models) == 0:
+        return []
+
+    sources = list(base_models)
+
+    # Add arena models
+    if request.app.state.config.ENABLE_EVALUATION_ARENA_MODELS:
+        sources.extend(get_arena_models(request))
+
+    models, changed = model_index.build(request, sources)
+    models = [copy_model(model) for model in models]
+
+    end_time = time.perf_counter()
+    model_index.stats.update(
+        {
+            "base_models_cached": base_models_cached,
+            "base_models_ms": round((base_models_time - start_time) * 1000, 2),
+            "assembly_ms": round((end_time - base_models_time) * 1000, 2),
+            "duration_ms": round((end_time - start_time) * 1000, 2),
+        }
+    )
+    log.debug(f"get_all_models() returned {len(models)} models: {model_index.stats}")
+
+    # Only publish the models when they changed, the registry is shared
+    # between replicas in Redis mode
+    if changed or not request.app.state.MODELS:
+        models_dict = {model["id"]: model for model in models}
+        if isinstance(request.app.state.MODELS, ModelRegistry):
+            await request.app.state.MODELS.set(models_dict)
+        else:
+            request.app.state.MODELS = models_dict
 
     return models
 
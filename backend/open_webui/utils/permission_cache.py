@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from open_webui.env import AUTH_PERMISSION_CACHE_TTL, AUTH_USER_CACHE_MAX_SIZE
+
+
+def get_permission_paths(permissions: dict, prefix: str = "") -> dict[str, bool]:
+    """
+    Flattens a permission tree into {"chat.tts": True, "chat": True, ...}, with
+    the truthiness of every node (leaf or subtree) keyed by its dotted path.
+    """
+    paths = {}
+    for key, value in permissions.items():
+        path = f"{prefix}{key}"
+        paths[path] = bool(value)
+        if isinstance(value, dict):
+            paths.update(get_permission_paths(value, f"{path}."))
+    return paths
+
+
+def copy_permissions(permissions: dict) -> dict:
+    return {
+        key: copy_permissions(value) if isinstance(value, dict) else value
+        for key, value in permissions.items()
+    }
+
+
+class PermissionCache:
+    """
+    Effective permissions per user, for get_permissions and has_permission.
+
+    An entry holds the permissions of all the user's groups merged into one
+    tree (the most permissive value wins) and the flattened dotted paths of
+    that tree, so a permission check is a dict lookup instead of a group
+    query. Results combined with the default permissions are kept per entry
+    for the default permissions object they were built from; a write to
+    USER_PERMISSIONS replaces that object, so they are rebuilt.
+
+    Group and membership writes in GroupTable invalidate the affected users
+    (or everything); other replicas' entries expire after
+    AUTH_PERMISSION_CACHE_TTL seconds.
+    """
+
+    def __init__(self, ttl: float = 10.0, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._defaults: Optional[tuple[Any, dict[str, bool]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, user_id: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+
+            self._entries.move_to_end(user_id)
+            return value
+
+    def set(self, user_id: str, group_permissions: dict) -> dict:
+        value = {
+            "permissions": group_permissions,
+            "paths": get_permission_paths(group_permissions),
+            "effective": None,
+        }
+
+        if self.enabled:
+            with self._lock:
+                self._entries[user_id] = (time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+        return value
+
+    def get_default_paths(self, default_permissions: dict) -> Optional[dict]:
+        defaults = self._defaults
+        if defaults is not None and defaults[0] is default_permissions:
+            return defaults[1]
+        return None
+
+    def set_default_paths(self, default_permissions: dict, paths: dict) -> dict:
+        self._defaults = (default_permissions, paths)
+        return paths
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def invalidate_users(self, user_ids: list[str]) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+permission_cache = PermissionCache(
+    ttl=AUTH_PERMISSION_CACHE_TTL, max_size=AUTH_USER_CACHE_MAX_SIZE
+)
@@ -16,6 +16,7 @@ from open_webui.env import (
 )
 from open_webui.models.functions import Functions
 from open_webui.models.tools import Tools
+from open_webui.utils.plugin_cache import get_content_hash, plugin_cache
 
 log = logging.getLogger(__name__)
 
@@ -309,7 +310,18 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
 
 def get_tool_module_from_cache(request, tool_id, load_from_db=True):
     if load_from_db:
-        # Always load from the database by default
+        # Check the loaded module against the content hash, and only load the
+        # source when it changed
+        token = plugin_cache.get_token()
+        if hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS:
+            if plugin_cache.is_current("tool", tool_id):
+                return request.app.state.TOOLS[tool_id], None
+
+            content_hash = Tools.get_tool_content_hash_by_id(tool_id)
+            if content_hash and content_hash == plugin_cache.get_hash("tool", tool_id):
+                plugin_cache.set_hash("tool", tool_id, content_hash, token)
+                return request.app.state.TOOLS[tool_id], None
+
         tool = Tools.get_tool_by_id(tool_id)
         if not tool:
             raise Exception(f"Tool not found: {tool_id}")
@@ -328,6 +340,7 @@ def get_tool_module_from_cache(request, tool_id, load_from_db=True):
             hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS
         ):
             if request.app.state.TOOL_CONTENTS[tool_id] == content:
+                plugin_cache.set_hash("tool", tool_id, get_content_hash(content), token)
                 return request.app.state.TOOLS[tool_id], None
 
         tool_module, frontmatter = load_tool_module_by_id(tool_id, content)
@@ -345,15 +358,32 @@ def get_tool_module_from_cache(request, tool_id, load_from_db=True):
 
     request.app.state.TOOLS[tool_id] = tool_module
     request.app.state.TOOL_CONTENTS[tool_id] = content
+    if load_from_db:
+        plugin_cache.set_hash("tool", tool_id, get_content_hash(content), token)
 
     return tool_module, frontmatter
 
 
 def get_function_module_from_cache(request, function_id, load_from_db=True):
     if load_from_db:
-        # Always load from the database by default
+        # Always check the database by default
         # This is useful for hooks like "inlet" or "outlet" where the content might change
-        # and we want to ensure the latest content is used.
+        # and we want to ensure the latest content is used. Only the content hash is
+        # compared, the source is loaded when it changed.
+        token = plugin_cache.get_token()
+        if (
+            hasattr(request.app.state, "FUNCTIONS")
+            and function_id in request.app.state.FUNCTIONS
+        ):
+            if plugin_cache.is_current("function", function_id):
+                return request.app.state.FUNCTIONS[function_id], None, None
+
+            content_hash = Functions.get_function_content_hash_by_id(function_id)
+            if content_hash and content_hash == plugin_cache.get_hash(
+                "function", function_id
+            ):
+                plugin_cache.set_hash("function", function_id, content_hash, token)
+                return request.app.state.FUNCTIONS[function_id], None, None
 
         function = Functions.get_function_by_id(function_id)
         if not function:
@@ -374,6 +404,9 @@ def get_function_module_from_cache(request, function_id, load_from_db=True):
             and function_id in request.app.state.FUNCTIONS
         ):
             if request.app.state.FUNCTION_CONTENTS[function_id] == content:
+                plugin_cache.set_hash(
+                    "function", function_id, get_content_hash(content), token
+                )
                 return request.app.state.FUNCTIONS[function_id], None, None
 
         function_module, function_type, frontmatter = load_function_module_by_id(
@@ -401,6 +434,8 @@ def get_function_module_from_cache(request, function_id, load_from_db=True):
 
     request.app.state.FUNCTIONS[function_id] = function_module
     request.app.state.FUNCTION_CONTENTS[function_id] = content
+    if load_from_db:
+        plugin_cache.set_hash("function", function_id, get_content_hash(content), token)
 
     return function_module, function_type, frontmatter
 
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+import weakref
+from typing import Any, Callable, Optional
+
+from open_webui.env import (
+    REDIS_CLUSTER,
+    REDIS_CONFIG_SYNC_INTERVAL,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+
+
+def get_content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class PluginCache:
+    """
+    Tracks which content (by hash) each loaded tool and function module was
+    built from, and the specs generated from loaded modules.
+
+    get_tool_module_from_cache and get_function_module_from_cache compare
+    the content_hash column with the hash recorded here instead of reading
+    and comparing the whole source. Content writes in ToolsTable and
+    FunctionsTable invalidate the entry here and, with Redis, publish it to
+    the other replicas; while subscribed, a recorded hash is trusted without
+    asking the database at all.
+    """
+
+    def __init__(self):
+        self._hashes: dict[tuple[str, str], str] = {}
+        self._valid: set[tuple[str, str]] = set()
+        self._invalidations = 0
+        self._listening = False
+        self._lock = threading.Lock()
+        self._specs = weakref.WeakKeyDictionary()
+        self._redis = None
+
+        if REDIS_URL:
+            try:
+                self._redis = get_redis_connection(
+                    redis_url=REDIS_URL,
+                    redis_sentinels=get_sentinels_from_env(
+                        REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+                    ),
+                    redis_cluster=REDIS_CLUSTER,
+                    decode_responses=True,
+                )
+                threading.Thread(
+                    target=self._listen_for_updates,
+                    name="plugin-cache-listener",
+                    daemon=True,
+                ).start()
+            except Exception as e:
+                log.warning(f"Plugin cache will not use Redis: {e}")
+
+    def _get_channel(self) -> str:
+        return f"{REDIS_KEY_PREFIX}:plugins:updates"
+
+    def _listen_for_updates(self):
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._get_channel())
+
+                # Anything may have changed before we were subscribed
+                with self._lock:
+                    self._valid.clear()
+                self._listening = True
+
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        data = json.loads(message["data"])
+                        self._invalidate_local((data["type"], data["id"]))
+            except Exception as e:
+                log.warning(f"Plugin cache listener disconnected from Redis: {e}")
+            finally:
+                self._listening = False
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+            time.sleep(max(REDIS_CONFIG_SYNC_INTERVAL / 10, 1))
+
+    def _invalidate_local(self, key: tuple[str, str]) -> None:
+        with self._lock:
+            self._invalidations += 1
+            self._hashes.pop(key, None)
+            self._valid.discard(key)
+
+    def get_token(self) -> int:
+        """
+        Taken before reading from the database, so set_hash can tell whether
+        an invalidation arrived in the meantime.
+        """
+        return self._invalidations
+
+    def is_current(self, type: str, id: str) -> bool:
+        """
+        Whether the loaded module is known to match the stored content without
+        checking the database: only while invalidations are being received.
+        """
+        return self._listening and (type, id) in self._valid
+
+    def get_hash(self, type: str, id: str) -> Optional[str]:
+        return self._hashes.get((type, id))
+
+    def set_hash(self, type: str, id: str, content_hash: str, token: int) -> None:
+        with self._lock:
+            self._hashes[(type, id)] = content_hash
+            if token == self._invalidations:
+                self._valid.add((type, id))
+
+    def invalidate(self, type: str, id: str) -> None:
+        self._invalidate_local((type, id))
+
+        if self._redis is not None:
+            try:
+                self._redis.publish(
+                    self._get_channel(), json.dumps({"type": type, "id": id})
+                )
+            except Exception as e:
+                log.debug(f"Plugin cache Redis publish failed: {e}")
+
+    def get_specs(self, obj, build: Callable[[Any], Any]) -> Any:
+        """
+        Specs generated from a loaded tool module (or builtin tool function),
+        built once per object; a reloaded module is a new object.
+        """
+        specs = self._specs.get(obj)
+        if specs is None:
+            specs = build(obj)
+            self._specs[obj] = specs
+        return specs
+
+
+plugin_cache = PluginCache()
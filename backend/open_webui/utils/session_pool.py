@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import time
+from typing import Optional, Union
+from urllib.parse import urlparse
+
+import aiohttp
+
+from open_webui.env import (
+    AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL,
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT,
+    AIOHTTP_CLIENT_POOL_LIMIT,
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    AIOHTTP_CLIENT_SESSION_SSL,
+    AIOHTTP_CLIENT_TIMEOUT,
+)
+
+log = logging.getLogger(__name__)
+
+
+def get_origin(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+
+class _PoolStats:
+    def __init__(self):
+        self.created_at = int(time.time())
+        self.requests = 0
+        self.in_flight = 0
+        self.errors = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+
+    def get_trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.requests += 1
+            self.in_flight += 1
+
+        async def on_request_end(session, ctx, params):
+            self.in_flight -= 1
+
+        async def on_request_exception(session, ctx, params):
+            self.in_flight -= 1
+            self.errors += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.connections_reused += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self.dns_cache_hits += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            self.dns_cache_misses += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+
+
+class ClientSessionPool:
+    """
+    Application-scoped registry of pooled aiohttp sessions.
+
+    Upstream model, embedding and tool requests share one keep-alive session
+    per origin and SSL/proxy settings instead of paying TCP and TLS setup on
+    every call. Sessions are bound to the event loop they were created on.
+    Pooled sessions must not be closed by callers; close() closes all of them
+    on shutdown.
+
+    Pooled sessions use a dummy cookie jar so upstream cookies are never
+    shared between users; pass per-request cookies explicitly.
+    """
+
+    def __init__(self):
+        self._sessions: dict[tuple, aiohttp.ClientSession] = {}
+        self._stats: dict[tuple, _PoolStats] = {}
+        self._loops: dict[int, asyncio.AbstractEventLoop] = {}
+
+    def get_session(
+        self,
+        url: str,
+        ssl: Union[bool, object] = AIOHTTP_CLIENT_SESSION_SSL,
+        trust_env: bool = True,
+        name: Optional[str] = None,
+    ) -> aiohttp.ClientSession:
+        """
+        Return the shared session for the origin of url, or for name if given
+        (for callers that reach arbitrary hosts, such as the web loader).
+        Must be called in a running loop.
+        """
+        loop = asyncio.get_running_loop()
+        self._prune_closed_loops()
+
+        key = (id(loop), name or get_origin(url), ssl, trust_env)
+        session = self._sessions.get(key)
+        if session is not None and not session.closed:
+            return session
+
+        stats = _PoolStats()
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=AIOHTTP_CLIENT_POOL_LIMIT,
+                limit_per_host=AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+                keepalive_timeout=AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT,
+                use_dns_cache=AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL > 0,
+                ttl_dns_cache=AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL or None,
+                ssl=ssl,
+            ),
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+            trust_env=trust_env,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            trace_configs=[stats.get_trace_config()],
+        )
+
+        self._sessions[key] = session
+        self._stats[key] = stats
+        self._loops[id(loop)] = loop
+        return session
+
+    def _prune_closed_loops(self):
+        for loop_id, loop in list(self._loops.items()):
+            if loop.is_closed():
+                for key in [key for key in self._sessions if key[0] == loop_id]:
+                    self._sessions.pop(key, None)
+                    self._stats.pop(key, None)
+                del self._loops[loop_id]
+
+    def get_stats(self) -> list[dict]:
+        self._prune_closed_loops()
+
+        pools = []
+        for key, session in self._sessions.items():
+            _, origin, ssl, trust_env = key
+            stats = self._stats[key]
+            connector = session.connector
+
+            pools.append(
+                {
+                    "origin": origin,
+                    "ssl": ssl if isinstance(ssl, bool) else True,
+                    "trust_env": trust_env,
+                    "closed": session.closed,
+                    "limit": connector.limit if connector else None,
+                    "limit_per_host": connector.limit_per_host if connector else None,
+                    "created_at": stats.created_at,
+                    "requests": stats.requests,
+                    "in_flight": stats.in_flight,
+                    "errors": stats.errors,
+                    "connections_created": stats.connections_created,
+                    "connections_reused": stats.connections_reused,
+                    "dns_cache_hits": stats.dns_cache_hits,
+                    "dns_cache_misses": stats.dns_cache_misses,
+                }
+            )
+        return pools
+
+    async def close(self):
+        """Close every session created on the running loop."""
+        loop_id = id(asyncio.get_running_loop())
+        for key in [key for key in self._sessions if key[0] == loop_id]:
+            session = self._sessions.pop(key)
+            self._stats.pop(key, None)
+            try:
+                await session.close()
+            except Exception as e:
+                log.debug(f"Error closing pooled session for {key[1]}: {e}")
+        self._loops.pop(loop_id, None)
+
+
+session_pool = ClientSessionPool()
+
+
+def get_client_session(
+    url: str,
+    ssl: Union[bool, object] = AIOHTTP_CLIENT_SESSION_SSL,
+    trust_env: bool = True,
+    name: Optional[str] = None,
+) -> aiohttp.ClientSession:
+    return session_pool.get_session(url, ssl=ssl, trust_env=trust_env, name=name)
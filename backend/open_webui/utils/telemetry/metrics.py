@@ -8,6 +8,8 @@ Metrics collected:
 
 * http.server.requests (counter)
 * http.server.duration (histogram, milliseconds)
+* webui.models.build.duration (gauge, milliseconds, last get_all_models)
+* webui.models.build.rebuilt (gauge, models re-assembled by the last build)
 
 Attributes used: http.method, http.route, http.status_code
 
@@ -176,6 +178,26 @@ def setup_metrics(app: FastAPI, resource: Resource) -> None:
         callbacks=[observe_users_active_today],
     )
 
+    def observe_model_build(key: str) -> Sequence[metrics.Observation]:
+        from open_webui.utils.models import model_index
+
+        value = model_index.stats.get(key)
+        return [metrics.Observation(value=value)] if value is not None else []
+
+    meter.create_observable_gauge(
+        name="webui.models.build.duration",
+        description="Duration of the last model list build",
+        unit="ms",
+        callbacks=[lambda options: observe_model_build("duration_ms")],
+    )
+
+    meter.create_observable_gauge(
+        name="webui.models.build.rebuilt",
+        description="Number of models re-assembled by the last model list build",
+        unit="models",
+        callbacks=[lambda options: observe_model_build("rebuilt")],
+    )
+
     # FastAPI middleware
     @app.middleware("http")
     async def _metrics_middleware(request: Request, call_next):
@@ -6,6 +6,8 @@ import aiohttp
 import asyncio
 import yaml
 import json
+import hashlib
+import time
 
 from pydantic import BaseModel
 from pydantic.fields import FieldInfo
@@ -39,18 +41,20 @@ from open_webui.models.tools import Tools
 from open_webui.models.users import UserModel
 from open_webui.models.groups import Groups
 from open_webui.models.access_grants import AccessGrants
-from open_webui.utils.plugin import load_tool_module_by_id
+from open_webui.utils.plugin import get_tool_module_from_cache
+from open_webui.utils.plugin_cache import plugin_cache
 from open_webui.utils.access_control import has_access
 from open_webui.config import BYPASS_ADMIN_ACCESS_CONTROL
 from open_webui.env import (
-    AIOHTTP_CLIENT_TIMEOUT,
     AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA,
     AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
     ENABLE_FORWARD_USER_INFO_HEADERS,
+    TOOL_SERVER_SPEC_CACHE_TTL,
     FORWARD_SESSION_INFO_HEADER_CHAT_ID,
     FORWARD_SESSION_INFO_HEADER_MESSAGE_ID,
 )
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.session_pool import get_client_session
 from open_webui.tools.builtin import (
     search_web,
     fetch_url,
@@ -186,10 +190,7 @@ async def get_tools(
                 log.warning(f"Access denied to tool {tool_id} for user {user.id}")
                 continue
 
-            module = request.app.state.TOOLS.get(tool_id, None)
-            if module is None:
-                module, _ = load_tool_module_by_id(tool_id)
-                request.app.state.TOOLS[tool_id] = module
+            module, _ = get_tool_module_from_cache(request, tool_id)
 
             __user__ = {
                 **extra_params["__user__"],
@@ -557,9 +558,8 @@ def get_builtin_tools(
             },
         )
 
-        # Generate spec from function
-        pydantic_model = convert_function_to_pydantic_model(func)
-        spec = convert_pydantic_model_to_openai_function_spec(pydantic_model)
+        # Generate spec from function (once per function)
+        spec = copy.deepcopy(plugin_cache.get_specs(func, build_function_spec))
 
         tools_dict[func.__name__] = {
             "tool_id": f"builtin:{func.__name__}",
@@ -684,7 +684,7 @@ def get_functions_from_tool(tool: object) -> list[Callable]:
     ]
 
 
-def get_tool_specs(tool_module: object) -> list[dict]:
+def build_tool_specs(tool_module: object) -> list[dict]:
     function_models = map(
         convert_function_to_pydantic_model, get_functions_from_tool(tool_module)
     )
@@ -697,6 +697,16 @@ def get_tool_specs(tool_module: object) -> list[dict]:
     return specs
 
 
+def build_function_spec(func: Callable) -> dict:
+    pydantic_model = convert_function_to_pydantic_model(func)
+    return convert_pydantic_model_to_openai_function_spec(pydantic_model)
+
+
+def get_tool_specs(tool_module: object) -> list[dict]:
+    # Specs are generated once per loaded module, callers get their own copy
+    return copy.deepcopy(plugin_cache.get_specs(tool_module, build_tool_specs))
+
+
 def resolve_schema(schema, components):
     """
     Recursively resolves a JSON schema using OpenAPI components.
@@ -810,34 +820,36 @@ def convert_openapi_to_tool_payload(openapi_spec):
 
 
 async def set_tool_servers(request: Request):
+    # Refetch every server, e.g. after the connections changed
     request.app.state.TOOL_SERVERS = await get_tool_servers_data(
-        request.app.state.config.TOOL_SERVER_CONNECTIONS
+        request.app.state.config.TOOL_SERVER_CONNECTIONS, refresh=True
     )
 
-    if request.app.state.redis is not None:
-        await request.app.state.redis.set(
-            "tool_servers", json.dumps(request.app.state.TOOL_SERVERS)
-        )
-
     return request.app.state.TOOL_SERVERS
 
 
 async def get_tool_servers(request: Request):
-    tool_servers = []
-    if request.app.state.redis is not None:
-        try:
-            tool_servers = json.loads(await request.app.state.redis.get("tool_servers"))
-            request.app.state.TOOL_SERVERS = tool_servers
-        except Exception as e:
-            log.error(f"Error fetching tool_servers from Redis: {e}")
+    request.app.state.TOOL_SERVERS = await get_tool_servers_data(
+        request.app.state.config.TOOL_SERVER_CONNECTIONS
+    )
 
-    if not tool_servers:
-        tool_servers = await set_tool_servers(request)
+    return request.app.state.TOOL_SERVERS
 
-    return tool_servers
 
+def parse_tool_server_spec(text_content: str) -> Dict[str, Any]:
+    try:
+        return json.loads(text_content)
+    except json.JSONDecodeError:
+        return yaml.safe_load(text_content)
 
-async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, Any]:
+
+async def fetch_tool_server_spec(
+    url: str, headers: Optional[dict]
+) -> tuple[Optional[Dict[str, Any]], dict]:
+    """
+    Fetch a tool server spec. Returns the spec (None when the server answered
+    304 Not Modified to a conditional request) and its ETag/Last-Modified.
+    """
     _headers = {
         "Accept": "application/json",
         "Content-Type": "application/json",
@@ -849,30 +861,25 @@ async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, A
     error = None
     try:
         timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA)
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            async with session.get(
-                url, headers=_headers, ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL
-            ) as response:
-                if response.status != 200:
-                    error_body = await response.json()
-                    raise Exception(error_body)
-
-                text_content = None
-
-                # Check if URL ends with .yaml or .yml to determine format
-                if url.lower().endswith((".yaml", ".yml")):
-                    text_content = await response.text()
-                    res = yaml.safe_load(text_content)
-                else:
-                    text_content = await response.text()
-
-                try:
-                    res = json.loads(text_content)
-                except json.JSONDecodeError:
-                    try:
-                        res = yaml.safe_load(text_content)
-                    except Exception as e:
-                        raise e
+        session = get_client_session(url, ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL)
+        async with session.get(
+            url,
+            headers=_headers,
+            ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+            timeout=timeout,
+        ) as response:
+            if response.status == 304:
+                return None, {}
+
+            if response.status != 200:
+                error_body = await response.json()
+                raise Exception(error_body)
+
+            res = parse_tool_server_spec(await response.text())
+            validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
 
     except Exception as err:
         log.exception(f"Could not fetch tool server spec from {url}")
@@ -883,10 +890,128 @@ async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, A
         raise Exception(error)
 
     log.debug(f"Fetched data: {res}")
+    return res, validators
+
+
+async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, Any]:
+    res, _ = await fetch_tool_server_spec(url, headers)
     return res
 
 
-async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+class ToolServerSpecCache:
+    """
+    OpenAPI specs of tool servers and their converted tool payloads, per spec
+    URL and credentials.
+
+    An entry is served as is for TOOL_SERVER_SPEC_CACHE_TTL seconds. After
+    that it is still served while a background refresh revalidates it with
+    If-None-Match/If-Modified-Since; if the server can't be reached, the last
+    good spec is kept. Only servers that were never fetched (or an explicit
+    refresh) are waited for.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._entries: dict[tuple, dict] = {}
+        self._refreshing: dict[tuple, asyncio.Task] = {}
+
+    def _get_entry(self, spec: Dict[str, Any], validators: dict) -> dict:
+        return {
+            "openapi": spec,
+            "specs": convert_openapi_to_tool_payload(spec),
+            "etag": validators.get("etag"),
+            "last_modified": validators.get("last_modified"),
+            "fetched_at": time.monotonic(),
+        }
+
+    async def _revalidate(self, key: tuple, url: str, headers: Optional[dict]) -> dict:
+        entry = self._entries.get(key)
+
+        headers = {**(headers or {})}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            spec, validators = await fetch_tool_server_spec(url, headers)
+        except Exception as e:
+            if entry is None:
+                raise e
+
+            # Serve the last good spec, and try again after the TTL
+            log.warning(f"Serving cached tool server spec for {url}: {e}")
+            entry["fetched_at"] = time.monotonic()
+            return entry
+
+        if spec is None:
+            if entry is not None:
+                # Not modified
+                entry["fetched_at"] = time.monotonic()
+                return entry
+
+            # A 304 with nothing cached to serve: fetch the spec unconditionally
+            headers = {
+                k: v
+                for k, v in headers.items()
+                if k.lower() not in ("if-none-match", "if-modified-since")
+            }
+            spec, validators = await fetch_tool_server_spec(url, headers)
+            if spec is None:
+                raise Exception(f"Tool server {url} returned 304 without a cached spec")
+
+        entry = self._get_entry(spec, validators)
+        self._entries[key] = entry
+        return entry
+
+    async def _refresh(self, key: tuple, url: str, headers: Optional[dict]) -> dict:
+        task = self._refreshing.get(key)
+        if task is None:
+            task = asyncio.create_task(self._revalidate(key, url, headers))
+            self._refreshing[key] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+        # Callers giving up must not cancel a refresh shared with others
+        return await asyncio.shield(task)
+
+    async def get(
+        self, url: str, headers: Optional[dict], refresh: bool = False
+    ) -> dict:
+        key = ("url", url, json.dumps(headers, sort_keys=True))
+
+        entry = self._entries.get(key)
+        if entry is None or refresh:
+            return await self._refresh(key, url, headers)
+
+        if time.monotonic() - entry["fetched_at"] > self.ttl:
+            if key not in self._refreshing:
+                task = asyncio.create_task(self._refresh(key, url, headers))
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        return entry
+
+    def get_json(self, spec_json: str) -> Optional[dict]:
+        key = ("json", hashlib.sha256(spec_json.encode("utf-8")).hexdigest())
+
+        entry = self._entries.get(key)
+        if entry is None:
+            spec = json.loads(spec_json)
+            if not spec:
+                return None
+
+            entry = self._get_entry(spec, {})
+            self._entries[key] = entry
+
+        return entry
+
+
+tool_server_spec_cache = ToolServerSpecCache(ttl=TOOL_SERVER_SPEC_CACHE_TTL)
+
+
+async def get_tool_servers_data(
+    servers: List[Dict[str, Any]], refresh: bool = False
+) -> List[Dict[str, Any]]:
     # Prepare list of enabled servers along with their original index
 
     tasks = []
@@ -914,30 +1039,28 @@ async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str,
             server_url = server.get("url")
             spec_type = server.get("spec_type", "url")
 
-            # Create async tasks to fetch data
+            # Create async tasks to get the (cached) spec
             task = None
             if spec_type == "url":
                 # Path (to OpenAPI spec URL) can be either a full URL or a path to append to the base URL
                 openapi_path = server.get("path", "openapi.json")
                 spec_url = get_tool_server_url(server_url, openapi_path)
                 # Fetch from URL
-                task = get_tool_server_data(
+                task = tool_server_spec_cache.get(
                     spec_url,
                     {"Authorization": f"Bearer {token}"} if token else None,
+                    refresh=refresh,
                 )
             elif spec_type == "json" and server.get("spec", ""):
                 # Use provided JSON spec
-                spec_json = None
+                entry = None
                 try:
-                    spec_json = json.loads(server.get("spec", ""))
+                    entry = tool_server_spec_cache.get_json(server.get("spec", ""))
                 except Exception as e:
                     log.error(f"Error parsing JSON spec for tool server {id}: {e}")
 
-                if spec_json:
-                    task = asyncio.sleep(
-                        0,
-                        result=spec_json,
-                    )
+                if entry:
+                    task = asyncio.sleep(0, result=entry)
 
             if task:
                 tasks.append(task)
@@ -953,15 +1076,10 @@ async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str,
             log.error(f"Failed to connect to {url} OpenAPI tool server")
             continue
 
-        response = {
-            "openapi": response,
-            "info": response.get("info", {}),
-            "specs": convert_openapi_to_tool_payload(response),
-        }
-
-        openapi_data = response.get("openapi", {})
+        # The cached spec is shared, override the info on a copy
+        openapi_data = response["openapi"]
         if info and isinstance(openapi_data, dict):
-            openapi_data["info"] = openapi_data.get("info", {})
+            openapi_data = {**openapi_data, "info": {**openapi_data.get("info", {})}}
 
             if "name" in info:
                 openapi_data["info"]["title"] = info.get("name", "Tool Server")
@@ -975,8 +1093,12 @@ async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str,
                 "idx": idx,
                 "url": server.get("url"),
                 "openapi": openapi_data,
-                "info": response.get("info"),
-                "specs": response.get("specs"),
+                "info": (
+                    openapi_data.get("info", {})
+                    if isinstance(openapi_data, dict)
+                    else {}
+                ),
+                "specs": response["specs"],
             }
         )
 
@@ -1048,50 +1170,48 @@ async def execute_tool_server(
             if params:
                 body_params = params
 
-        async with aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        ) as session:
-            request_method = getattr(session, http_method.lower())
-
-            if http_method in ["post", "put", "patch", "delete"]:
-                async with request_method(
-                    final_url,
-                    json=body_params,
-                    headers=headers,
-                    cookies=cookies,
-                    ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
-                    allow_redirects=False,
-                ) as response:
-                    if response.status >= 400:
-                        text = await response.text()
-                        raise Exception(f"HTTP error {response.status}: {text}")
-
-                    try:
-                        response_data = await response.json()
-                    except Exception:
-                        response_data = await response.text()
-
-                    response_headers = response.headers
-                    return (response_data, response_headers)
-            else:
-                async with request_method(
-                    final_url,
-                    headers=headers,
-                    cookies=cookies,
-                    ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
-                    allow_redirects=False,
-                ) as response:
-                    if response.status >= 400:
-                        text = await response.text()
-                        raise Exception(f"HTTP error {response.status}: {text}")
-
-                    try:
-                        response_data = await response.json()
-                    except Exception:
-                        response_data = await response.text()
-
-                    response_headers = response.headers
-                    return (response_data, response_headers)
+        session = get_client_session(url, ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL)
+        request_method = getattr(session, http_method.lower())
+
+        if http_method in ["post", "put", "patch", "delete"]:
+            async with request_method(
+                final_url,
+                json=body_params,
+                headers=headers,
+                cookies=cookies,
+                ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+                allow_redirects=False,
+            ) as response:
+                if response.status >= 400:
+                    text = await response.text()
+                    raise Exception(f"HTTP error {response.status}: {text}")
+
+                try:
+                    response_data = await response.json()
+                except Exception:
+                    response_data = await response.text()
+
+                response_headers = response.headers
+                return (response_data, response_headers)
+        else:
+            async with request_method(
+                final_url,
+                headers=headers,
+                cookies=cookies,
+                ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+                allow_redirects=False,
+            ) as response:
+                if response.status >= 400:
+                    text = await response.text()
+                    raise Exception(f"HTTP error {response.status}: {text}")
+
+                try:
+                    response_data = await response.json()
+                except Exception:
+                    response_data = await response.text()
+
+                response_headers = response.headers
+                return (response_data, response_headers)
 
     except Exception as err:
         error = str(err)
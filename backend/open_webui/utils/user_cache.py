@@ -0,0 +1,152 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from open_webui.env import (
+    AUTH_USER_CACHE_MAX_SIZE,
+    AUTH_USER_CACHE_TTL,
+    ENABLE_AUTH_USER_CACHE_REDIS,
+    REDIS_CLUSTER,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+
+
+def get_api_key_hash(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+class UserCache:
+    """
+    Short-lived cache of authenticated users for get_current_user.
+
+    Users are cached by ID and API keys map (by hash) to a user ID, in a
+    bounded in-process LRU and, with ENABLE_AUTH_USER_CACHE_REDIS, in Redis
+    as a second level shared between replicas. Writes through UsersTable
+    invalidate both levels; other replicas' in-process entries expire after
+    AUTH_USER_CACHE_TTL seconds.
+
+    Entries are stored as plain dicts so callers always get a fresh model.
+    """
+
+    def __init__(self, ttl: float = 10.0, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+
+        if ttl > 0 and ENABLE_AUTH_USER_CACHE_REDIS and REDIS_URL:
+            try:
+                self._redis = get_redis_connection(
+                    redis_url=REDIS_URL,
+                    redis_sentinels=get_sentinels_from_env(
+                        REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+                    ),
+                    redis_cluster=REDIS_CLUSTER,
+                    decode_responses=True,
+                )
+            except Exception as e:
+                log.warning(f"User cache will not use Redis: {e}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _get_redis_key(self, key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:auth:user_cache:{key}"
+
+    def _get(self, key: str):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+
+        if self._redis is not None:
+            try:
+                value = self._redis.get(self._get_redis_key(key))
+                if value is not None:
+                    value = json.loads(value)
+                    self._set_local(key, value)
+                    return value
+            except Exception as e:
+                log.debug(f"User cache Redis read failed: {e}")
+
+        return None
+
+    def _set_local(self, key: str, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _set(self, key: str, value) -> None:
+        self._set_local(key, value)
+
+        if self._redis is not None:
+            try:
+                self._redis.set(
+                    self._get_redis_key(key),
+                    json.dumps(value),
+                    ex=max(int(self.ttl), 1),
+                )
+            except Exception as e:
+                log.debug(f"User cache Redis write failed: {e}")
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+        if self._redis is not None:
+            try:
+                self._redis.delete(self._get_redis_key(key))
+            except Exception as e:
+                log.debug(f"User cache Redis delete failed: {e}")
+
+    def get_user(self, user_id: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        return self._get(f"user:{user_id}")
+
+    def set_user(self, user: dict) -> None:
+        if self.enabled:
+            self._set(f"user:{user['id']}", user)
+
+    def get_user_id_by_api_key(self, api_key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        return self._get(f"api_key:{get_api_key_hash(api_key)}")
+
+    def set_api_key(self, api_key: str, user_id: str) -> None:
+        if self.enabled:
+            self._set(f"api_key:{get_api_key_hash(api_key)}", user_id)
+
+    def invalidate_user(self, user_id: str) -> None:
+        if self.enabled:
+            self._delete(f"user:{user_id}")
+
+    def invalidate_api_key(self, api_key: Optional[str]) -> None:
+        if self.enabled and api_key:
+            self._delete(f"api_key:{get_api_key_hash(api_key)}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(ttl=AUTH_USER_CACHE_TTL, max_size=AUTH_USER_CACHE_MAX_SIZE)
@@ -90,7 +90,11 @@ export class SocketIOCollaborationProvider {
 			document_id: this.documentId,
 			user_id: this.user?.id,
 			user_name: this.user?.name,
-			user_color: userColor
+			user_color: userColor,
+			// When rejoining, only ask for what we are missing
+			...(this.doc.store.clients.size > 0
+				? { state_vector: Array.from(Y.encodeStateVector(this.doc)) }
+				: {})
 		});
 
 		// Set user awareness info
@@ -120,7 +124,24 @@ export class SocketIOCollaborationProvider {
 		this.socket.on('ydoc:document:state', async (data) => {
 			if (data.document_id === this.documentId) {
 				try {
-					if (data.state) {
+					if (data.state && data.diff) {
+						// Only the updates missing from our state vector
+						Y.applyUpdate(this.doc, new Uint8Array(data.state), 'server');
+
+						// Send back what the server is missing, e.g. edits made while offline
+						const missing = Y.encodeStateAsUpdate(
+							this.doc,
+							new Uint8Array(data.state_vector ?? [])
+						);
+						if (missing.length > 2) {
+							this.socket.emit('ydoc:document:update', {
+								document_id: this.documentId,
+								user_id: this.user?.id,
+								socket_id: this.socket.id,
+								update: Array.from(missing)
+							});
+						}
+					} else if (data.state) {
 						const state = new Uint8Array(data.state);
 
 						if (state.length === 2 && state[0] === 0 && state[1] === 0) {